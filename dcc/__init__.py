@@ -27,10 +27,17 @@ A decoder for DCC-Signals (operate model railways digitally):
 -- decoder address
 -- CV
 -- single byte ('and' linked if address or CV filled)
+- Pre-filter of pulses shorter than a minimum width, option 'Min_pulse_width'
 - 'ignore pulse <= 4 µs':
    Short pulses are ignored
    (what would the signal look like without the short pulse?)
-- No decoding of packet sequences (e.g. programming mode)
+- Lookahead resynchronization: glitches and phase errors repaired within
+  the packet, option 'Resync'
+- Profiling of the decoder stages, option 'Profile'
+- Programming operations (service mode, POM) combined from the packet
+  sequence, option 'Sequences'
+- Up to 8 data lines (D0..D7) in one pass, with their time skew
+- RailCom answers (channel 1 and 2) from an optional detector channel
 - No evaluation of the preamble length for packet detection
 - Rudimentary decoding of register and page mode packets
 - RailComPlus® system commands not decoded (as not documented)
@@ -43,7 +50,21 @@ https://www.nmra.org
 
 RailCom®(Lenz Elektronik GmbH,Gießen)
 RailComPlus®(Lenz Elektronik GmbH,Gießen, ESU electronic solutions,Ulm)
+
+Without sigrok/PulseView:
+  python -m dcc [-O option=value] [-C data=D0] capture.sr [capture.sr ...]
+decodes session files with a minimal built-in runtime (see standalone.py).
+Analog channels (track voltage) are thresholded with hysteresis while the
+file is read ('-C data=A0 --threshold -1,1').
 '''
 
+try:
+    import sigrokdecode
+except ImportError:
+    #not loaded by libsigrokdecode: use the built-in runtime
+    import sys
+    from . import standalone
+    sys.modules['sigrokdecode'] = standalone
+
 from .pd import Decoder
 
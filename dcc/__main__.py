@@ -0,0 +1,180 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Headless decoding of sigrok session files:
+
+  python -m dcc [-O option=value ...] [-C data=D0] [-A ann,row ...] [-j jobs] [--report FILE]
+               [--threshold LOW,HIGH] capture.sr ...
+
+Prints the annotations like 'sigrok-cli -P dcc -A dcc --protocol-decoder-samplenum'.
+All files are decoded in one process, with -j a long capture is split into
+segments that are decoded in several processes (see parallel.py).
+An analog channel (-C data=A0) is turned into the data line with the
+hysteresis thresholds of --threshold while it is read (see srfile.py).
+'''
+
+import argparse
+import json
+import sys
+
+from . import Decoder
+from . import standalone
+from .parallel import MIN_SEGMENT, decode_parallel, segment_count
+from .srfile import DEFAULT_THRESHOLDS, SrFile, SrFileError, parse_thresholds
+from .timing import get_profile, pulse_width
+
+def parse_pairs(pairs, what):
+    result = {}
+    for pair in pairs or []:
+        if '=' not in pair:
+            raise SystemExit('Invalid ' + what + ' (expected key=value): ' + pair)
+        key, value = pair.split('=', 1)
+        result[key] = value
+    return result
+
+def annotation_filter(names):
+    #Annotation classes selected by annotation or row ids, None = all
+    if not names:
+        return None
+    selected = set()
+    annIds   = [a[0] for a in Decoder.annotations]
+    for name in ','.join(names).split(','):
+        if name in annIds:
+            selected.add(annIds.index(name))
+            continue
+        for row in Decoder.annotation_rows:
+            if row[0] == name:
+                selected.update(row[2])
+                break
+        else:
+            raise SystemExit('Unknown annotation or row: ' + name)
+    return selected
+
+def channel_masks(capture, assignment):
+    masks = []
+    for channel in standalone.channel_list(Decoder):
+        probe = assignment.pop(channel['id'], None)
+        if probe is None and channel in Decoder.channels:
+            probe = channel['name']
+        if probe is None or (probe not in capture.probes and probe not in capture.analog and channel not in Decoder.channels):
+            masks.append(None)
+        else:
+            masks.append(1 << capture.probe_index(probe))
+    if assignment:
+        raise SystemExit('Unknown channel: ' + ', '.join(assignment))
+    return masks
+
+def decode_capture(path, options, assignment, sink, jobs=1, thresholds=DEFAULT_THRESHOLDS, minSegment=MIN_SEGMENT):
+    #Decode a capture, sink(startsample, endsample, output_type, data) receives everything the decoder puts.
+    #jobs > 1: segmented decode (parallel.py), sequential if the capture is too short for two segments of minSegment s
+    with SrFile(path, thresholds) as capture:
+        masks = channel_masks(capture, dict(assignment))
+        mask  = 0
+        for m in masks:
+            mask |= m or 0
+        if jobs <= 1 or segment_count(capture, jobs, minSegment) < 2:
+            standalone.run(Decoder(), capture.iter_transitions(mask), capture.samplerate, masks, capture.total, sink, options)
+            return
+    for start, end, outputType, data in decode_parallel(path, options, masks, jobs, thresholds, minSegment):
+        sink(start, end, outputType, data)
+
+def decode_file(path, options, assignment, selected, out, jobs=1, reports=None, thresholds=DEFAULT_THRESHOLDS):
+    annIds = [a[0] for a in Decoder.annotations]
+
+    def sink(start, end, outputType, data):
+        if outputType == standalone.OUTPUT_PYTHON and reports is not None:
+            if data[0] == 'STATISTICS':
+                reports.setdefault(path, {}).update(data[1])
+            elif data[0] == 'BIT_TIMING':
+                reports.setdefault(path, {})['bit_timing'] = data[1]
+            elif data[0] == 'PROFILE':
+                reports.setdefault(path, {})['profile'] = data[1]
+        if outputType != standalone.OUTPUT_ANN:
+            return
+        if selected is not None and data[0] not in selected:
+            return
+        out.write('%d-%d dcc-1: %s: %s\n' % (start, end, annIds[data[0]], ' '.join('"' + s + '"' for s in data[1])))
+
+    decode_capture(path, options, assignment, sink, jobs, thresholds)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dcc', description='Decode DCC signals in sigrok session files (*.sr).')
+    parser.add_argument('files', nargs='+', metavar='FILE', help='sigrok session file')
+    parser.add_argument('-O', '--option', action='append', metavar='ID=VALUE', help='decoder option, e.g. -O Ignore_short_pulse=yes')
+    parser.add_argument('-C', '--channel', action='append', metavar='ID=PROBE', help='channel assignment, default data=D0')
+    parser.add_argument('-A', '--annotations', action='append', metavar='IDS', help='only show these annotation classes or rows (comma separated)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='decode each file in N processes')
+    parser.add_argument('--report', metavar='FILE', help='write the traffic statistics of every file as JSON (- for stdout)')
+    parser.add_argument('--threshold', default='%g,%g' % DEFAULT_THRESHOLDS, metavar='LOW,HIGH',
+                        help='hysteresis of analog channels [V], default %(default)s')
+    args = parser.parse_args(argv)
+
+    options    = parse_pairs(args.option, 'option')
+    assignment = parse_pairs(args.channel, 'channel')
+    reports    = None
+    if args.report is not None:
+        if args.jobs > 1:
+            raise SystemExit('--report needs a decode in one process (-j 1)')
+        options['Statistics'] = 'yes'
+        reports = {}
+    if options.get('Statistics') == 'yes' and args.jobs > 1:
+        raise SystemExit('Statistics=yes needs a decode in one process (-j 1)')
+    if options.get('Bit_timing') == 'yes' and args.jobs > 1:
+        raise SystemExit('Bit_timing=yes needs a decode in one process (-j 1)')
+    if options.get('Sequences') == 'yes' and args.jobs > 1:
+        raise SystemExit('Sequences=yes needs a decode in one process (-j 1)')
+    if options.get('Resync') == 'lookahead' and args.jobs > 1:
+        raise SystemExit('Resync=lookahead needs a decode in one process (-j 1)')
+    if options.get('Profile', 'no') != 'no' and args.jobs > 1:
+        raise SystemExit('Profile needs a decode in one process (-j 1)')
+    if any(key != 'data' and key.startswith('data') for key in assignment) and args.jobs > 1:
+        raise SystemExit('Several data lines need a decode in one process (-j 1)')
+    selected   = annotation_filter(args.annotations)
+    try:
+        values = standalone.option_values(Decoder, options)
+        get_profile(values['Timing'], values['Timing_user'])
+        pulse_width(values['Min_pulse_width'], 1000000)
+        thresholds = parse_thresholds(args.threshold)
+    except (KeyError, ValueError, SrFileError) as e:
+        raise SystemExit(str(e))
+
+    status = 0
+    out = sys.stdout
+    for path in args.files:
+        if len(args.files) > 1:
+            out.write('# ' + path + '\n')
+        try:
+            decode_file(path, options, assignment, selected, out, args.jobs, reports, thresholds)
+        except (OSError, SrFileError) as e:
+            sys.stderr.write(str(e) + '\n')
+            status = 1
+    if reports is not None:
+        if args.report == '-':
+            json.dump(reports, out, indent=2)
+            out.write('\n')
+        else:
+            with open(args.report, 'w') as f:
+                json.dump(reports, f, indent=2)
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Packet log: compact archive of the decoded packets for long recordings.
+
+  python -m dcc.archive write [-O option=value ...] [-C data=D0] capture.sr [capture.sr ...] -o log.dcclog
+  python -m dcc.archive read log.dcclog [--from 10] [--to 20.5] [--dec-addr 3] [--acc-addr 1-8]
+
+File layout (integers little endian):
+  header  'DCCLOG' 0x00 VERSION, samplerate (uint64), start time (double, unix time or 0)
+  blocks  'DCCB', first/last start sample (uint64), packets, payload length, data length (uint32),
+          payload (zlib compressed records)
+  index   zlib compressed: per block offset, first, last (varints) and the addresses in it
+  trailer index offset (uint64), index length (uint32), 'DCCLIDX' 0x00
+
+Record of a packet: start sample as varint delta to the previous packet of
+the block (to the first sample of the block for the first packet), length
+in samples (varint), flags (bit 0: checksum ok, bits 1-4: address type),
+address + 1 (varint, 0: no address), number of bytes (varint) and the raw
+bytes. Version 1 logs store the number of bytes in one byte; they can
+still be read.
+The blocks are written as soon as they are full, so a log of an aborted
+recording can still be read (without trailer the block headers are
+scanned). A time range or address query only decompresses the blocks
+whose range and address list match.
+'''
+
+import argparse
+import math
+import struct
+import sys
+import zlib
+
+from .__main__ import decode_capture, parse_pairs
+from .index import matches, parse_values
+from .srfile import DEFAULT_THRESHOLDS, SrFile, SrFileError, parse_thresholds
+from . import standalone
+
+VERSION       = 2
+MAGIC         = b'DCCLOG\x00'
+HEADER        = struct.Struct('<7sBQd')
+BLOCK         = struct.Struct('<4sQQIII')
+BLOCK_MAGIC   = b'DCCB'
+TRAILER       = struct.Struct('<QI8s')
+TRAILER_MAGIC = b'DCCLIDX\x00'
+ADDR_TYPES    = (None, 'broadcast', 'short', 'long', 'accessory', 'extended accessory', 'service', 'idle', 'reserved')
+DEC_TYPES     = (1, 2, 3)
+ACC_TYPES     = (4, 5)
+
+class PacketLogError(Exception):
+    pass
+
+def put_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def get_varint(data, pos):
+    #-> (value, next position)
+    value = shift = 0
+    while True:
+        byte   = data[pos]
+        pos   += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class BlockInfo:
+    __slots__ = ('offset', 'first', 'last', 'decoders', 'accessories')
+
+    def __init__(self, offset, first, last, decoders=None, accessories=None):
+        self.offset      = offset
+        self.first       = first        #start sample of the first/last packet
+        self.last        = last
+        self.decoders    = decoders     #addresses in the block, None: unknown (no index)
+        self.accessories = accessories
+
+class PacketLogWriter:
+    def __init__(self, path, samplerate, startTime=None, blockPackets=4096):
+        self.file         = open(path, 'wb')
+        self.samplerate   = int(samplerate)
+        self.blockPackets = blockPackets
+        self.blocks       = []
+        self.data         = bytearray()  #records of the current block
+        self.count        = 0
+        self.first        = None
+        self.previous     = 0
+        self.decoders     = set()
+        self.accessories  = set()
+        self.packets      = 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, int(samplerate), startTime or 0.0))
+
+    def add(self, start, end, raw, checksumOk, addrType=None, address=None):
+        if self.first is None:
+            self.first = self.previous = start
+        typeCode = ADDR_TYPES.index(addrType)
+        put_varint(self.data, start - self.previous)
+        put_varint(self.data, end - start)
+        self.data.append((1 if checksumOk else 0) | (typeCode << 1))
+        put_varint(self.data, address + 1 if address is not None else 0)
+        put_varint(self.data, len(raw))
+        self.data += raw
+        if address is not None:
+            if typeCode in DEC_TYPES:
+                self.decoders.add(address)
+            elif typeCode in ACC_TYPES:
+                self.accessories.add(address)
+        self.previous = start
+        self.count   += 1
+        self.packets += 1
+        if self.count >= self.blockPackets:
+            self.flush()
+
+    def sink(self, start, end, outputType, data):
+        #sink for standalone.run() / decode_capture()
+        if outputType == standalone.OUTPUT_PYTHON and data[0] == 'PACKET':
+            record = data[1]
+            self.add(start, end, record['bytes'], record['checksum'], record['addr_type'], record['address'])
+
+    def flush(self):
+        if self.count == 0:
+            return
+        payload = zlib.compress(bytes(self.data), 6)
+        self.blocks.append(BlockInfo(self.file.tell(), self.first, self.previous, self.decoders, self.accessories))
+        self.file.write(BLOCK.pack(BLOCK_MAGIC, self.first, self.previous, self.count, len(payload), len(self.data)))
+        self.file.write(payload)
+        self.file.flush()
+        self.data        = bytearray()
+        self.count       = 0
+        self.first       = None
+        self.decoders    = set()
+        self.accessories = set()
+
+    def close(self):
+        self.flush()
+        index = bytearray()
+        put_varint(index, len(self.blocks))
+        for block in self.blocks:
+            for value in (block.offset, block.first, block.last, len(block.decoders), len(block.accessories)):
+                put_varint(index, value)
+            for address in sorted(block.decoders) + sorted(block.accessories):
+                put_varint(index, address)
+        index  = zlib.compress(bytes(index), 6)
+        offset = self.file.tell()
+        self.file.write(index)
+        self.file.write(TRAILER.pack(offset, len(index), TRAILER_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class PacketLog:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            magic, version, self.samplerate, startTime = HEADER.unpack(self.file.read(HEADER.size))
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version not in (1, VERSION):
+            self.file.close()
+            raise PacketLogError(path + ': not a packet log')
+        self.startTime = startTime or None
+        self.version   = version
+        self.blocks    = self.readIndex() or self.scanBlocks()
+
+    def readIndex(self):
+        self.file.seek(0, 2)
+        size = self.file.tell()
+        if size < HEADER.size + TRAILER.size:
+            return None
+        self.file.seek(size - TRAILER.size)
+        offset, length, magic = TRAILER.unpack(self.file.read(TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            return None
+        self.file.seek(offset)
+        index  = zlib.decompress(self.file.read(length))
+        count, pos = get_varint(index, 0)
+        blocks = []
+        for _ in range(count):
+            values = []
+            for _ in range(5):
+                value, pos = get_varint(index, pos)
+                values.append(value)
+            offset, first, last, decoders, accessories = values
+            addresses = []
+            for _ in range(decoders + accessories):
+                value, pos = get_varint(index, pos)
+                addresses.append(value)
+            blocks.append(BlockInfo(offset, first, last, frozenset(addresses[:decoders]), frozenset(addresses[decoders:])))
+        return blocks
+
+    def scanBlocks(self):
+        #Log without index (recording aborted): read the block headers
+        blocks = []
+        offset = HEADER.size
+        while True:
+            self.file.seek(offset)
+            header = self.file.read(BLOCK.size)
+            if len(header) < BLOCK.size:
+                break
+            magic, first, last, count, length, dataLength = BLOCK.unpack(header)
+            if magic != BLOCK_MAGIC:
+                break
+            blocks.append(BlockInfo(offset, first, last))
+            offset += BLOCK.size + length
+        return blocks
+
+    def readBlock(self, block):
+        self.file.seek(block.offset)
+        magic, first, last, count, length, dataLength = BLOCK.unpack(self.file.read(BLOCK.size))
+        payload = self.file.read(length)
+        if magic != BLOCK_MAGIC or len(payload) < length:
+            raise PacketLogError(self.path + ': damaged block at ' + str(block.offset))
+        return first, count, zlib.decompress(payload)
+
+    def samples(self, seconds):
+        return int(math.ceil(seconds * self.samplerate))
+
+    def packets(self, start=None, end=None, dec_addr=None, acc_addr=None):
+        '''
+        Yields (startsample, endsample, bytes, checksum ok, address type,
+        address) of the packets starting in [start, end) (samples, None: no
+        limit) with the given decoder/accessory address (single value or
+        collection) in sample order.
+        '''
+        for block in self.blocks:
+            if (start is not None and block.last < start) or (end is not None and block.first >= end):
+                continue
+            if dec_addr is not None and block.decoders is not None and not any(matches(a, dec_addr) for a in block.decoders):
+                continue
+            if acc_addr is not None and block.accessories is not None and not any(matches(a, acc_addr) for a in block.accessories):
+                continue
+            samplenum, count, data = self.readBlock(block)
+            pos = 0
+            for _ in range(count):
+                delta, pos   = get_varint(data, pos)
+                length, pos  = get_varint(data, pos)
+                flags        = data[pos]
+                address, pos = get_varint(data, pos + 1)
+                if self.version == 1:
+                    size     = data[pos]
+                    pos     += 1
+                else:
+                    size, pos = get_varint(data, pos)
+                raw          = data[pos:pos+size]
+                pos         += size
+                samplenum   += delta
+                if start is not None and samplenum < start:
+                    continue
+                if end is not None and samplenum >= end:
+                    return
+                typeCode = flags >> 1
+                address  = address - 1 if address else None
+                if dec_addr is not None and (typeCode not in DEC_TYPES or not matches(address, dec_addr)):
+                    continue
+                if acc_addr is not None and (typeCode not in ACC_TYPES or not matches(address, acc_addr)):
+                    continue
+                yield samplenum, samplenum + length, raw, bool(flags & 1), ADDR_TYPES[typeCode], address
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def write_log(paths, output, options=None, assignment=None, jobs=1, thresholds=DEFAULT_THRESHOLDS):
+    #Decode the captures one after the other into one packet log, returns the number of packets
+    writer = None
+    offset = 0  #samples of the captures in front
+    try:
+        for path in paths:
+            with SrFile(path) as capture:
+                samplerate, total = capture.samplerate, capture.total
+            if writer is None:
+                writer = PacketLogWriter(output, samplerate)
+            elif int(samplerate) != writer.samplerate:
+                raise PacketLogError(path + ': samplerate differs from the first capture')
+
+            def sink(start, end, outputType, data):
+                writer.sink(start + offset, end + offset, outputType, data)
+            decode_capture(path, options or {}, assignment or {}, sink, jobs, thresholds)
+            offset += total
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer.packets
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dcc.archive', description='Compact packet logs of DCC captures.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    write = commands.add_parser('write', help='decode captures and write their packets to a log')
+    read  = commands.add_parser('read', help='print the packets of a log')
+    write.add_argument('files', nargs='+', metavar='FILE', help='sigrok session file (one after the other)')
+    write.add_argument('-o', '--output', required=True, help='packet log file')
+    write.add_argument('-O', '--option', action='append', metavar='ID=VALUE', help='decoder option')
+    write.add_argument('-C', '--channel', action='append', metavar='ID=PROBE', help='channel assignment, default data=D0')
+    write.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='decode in N processes')
+    write.add_argument('--threshold', default='%g,%g' % DEFAULT_THRESHOLDS, metavar='LOW,HIGH', help='hysteresis of analog channels [V]')
+    read.add_argument('file', metavar='FILE', help='packet log file')
+    read.add_argument('--from', dest='start', type=float, help='first second')
+    read.add_argument('--to', dest='end', type=float, help='end [s]')
+    read.add_argument('--dec-addr', type=parse_values, help='decoder addresses, e.g. 3,17,100-120')
+    read.add_argument('--acc-addr', type=parse_values, help='accessory addresses')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'write':
+            packets = write_log(args.files, args.output, parse_pairs(args.option, 'option'),
+                                parse_pairs(args.channel, 'channel'), args.jobs, parse_thresholds(args.threshold))
+            sys.stdout.write('%d packets\n' % packets)
+            return 0
+
+        with PacketLog(args.file) as log:
+            start = log.samples(args.start) if args.start is not None else None
+            end   = log.samples(args.end) if args.end is not None else None
+            for s, e, raw, ok, addrType, address in log.packets(start, end, args.dec_addr, args.acc_addr):
+                sys.stdout.write('%.6f %d-%d %s %s %s%s\n' % (s / log.samplerate, s, e, raw.hex(), addrType, address,
+                                                             '' if ok else ' checksum error'))
+    except (OSError, SrFileError, PacketLogError, zlib.error) as e:
+        sys.stderr.write(str(e) + '\n')
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Throughput benchmark of the decoder on synthetic signals (see synth.py):
+
+  python -m dcc.benchmark [-n packets] [-r 25k,1M,100M] [--preamble 17] [--stretch 0.05]
+                          [--cutout] [--glitches 0.001] [-O option=value ...] [--seed 0] [--repeat 3]
+
+For every samplerate Decoder.decode() runs over the generated signal, then
+handleDecodedBytes() over the same packets without the bit decoding. Times are the best of --repeat runs, the peak
+memory is measured with tracemalloc in a separate run. The signal and the
+packets only depend on the arguments, so the numbers are reproducible.
+'''
+
+import argparse
+import time
+import tracemalloc
+
+from . import Decoder
+from . import standalone
+from . import synth
+from .__main__ import parse_pairs
+from .pd import Packet
+from .srfile import parse_samplerate
+
+class Counter:
+    #sink of standalone.run() counting the packets
+    def __init__(self):
+        self.packets = 0
+
+    def __call__(self, start, end, outputType, data):
+        if outputType == standalone.OUTPUT_PYTHON:
+            self.packets += 1
+
+def measure(function, repeat):
+    #(best time in s, peak memory in bytes, result of the last call)
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = function()
+        t = time.perf_counter() - t
+        if best is None or t < best:
+            best = t
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+def bench_decode(transitions, total, samplerate, options, repeat):
+    def run():
+        counter = Counter()
+        standalone.run(Decoder(), transitions, samplerate, [1], total, counter, options)
+        return counter.packets
+    return measure(run, repeat)
+
+def make_packets(packets):
+    #Packet objects as collected by the decoder, bits 100 samples apart
+    result = []
+    samplenum = 0
+    for data in packets:
+        packet = Packet()
+        for byte in list(data) + [synth.checksum(data)]:
+            for bit in range(9):
+                packet.setBit(bit, samplenum + 100*bit)
+            packet.data.append(byte)
+            samplenum += 1000
+        result.append(packet)
+    return result
+
+def bench_packets(packets, samplerate, options, repeat):
+    decoder = standalone.run(Decoder(), [], samplerate, [1], 0, lambda *args: None, options)
+
+    def run():
+        for packet in packets:
+            decoder.handleDecodedBytes(packet)
+        return len(packets)
+    return measure(run, repeat)
+
+def rate_text(samplerate):
+    if samplerate >= 1000000:
+        return '{:g} MHz'.format(samplerate / 1000000)
+    return '{:g} kHz'.format(samplerate / 1000)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dcc.benchmark', description='Decoder throughput on synthetic DCC signals.')
+    parser.add_argument('-n', '--packets', type=int, default=2000, help='number of packets (default 2000)')
+    parser.add_argument('-r', '--rates', default='25k,50k,1M,100M', help='samplerates, comma separated (default 25k,50k,1M,100M)')
+    parser.add_argument('--preamble', type=int, default=17, help="'1' bits of the preamble (default 17)")
+    parser.add_argument('--stretch', type=float, default=0.0, help="share of stretched '0' bits")
+    parser.add_argument('--cutout', action='store_true', help='RailCom cutout after every packet')
+    parser.add_argument('--glitches', type=float, default=0.0, help='share of half bits with a 2 µs glitch')
+    parser.add_argument('-O', '--option', action='append', metavar='ID=VALUE', help='decoder option')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the traffic and signal generator')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, the best is shown')
+    args = parser.parse_args(argv)
+
+    options = parse_pairs(args.option, 'option')
+    packets = synth.traffic(args.packets, args.seed)
+    rates   = [parse_samplerate(r + 'hz' if r[-1:].isalpha() else r) for r in args.rates.split(',')]
+
+    print('%-28s %10s %8s %8s %12s %12s %9s' % ('run', 'edges', 'packets', 's', 'edges/s', 'packets/s', 'peak MiB'))
+    for samplerate in rates:
+        transitions, total = synth.synthesize(packets, samplerate, args.preamble, args.stretch, cutout=args.cutout,
+                                              glitches=args.glitches, seed=args.seed)
+        edges = len(transitions) - 1
+        t, peak, decoded = bench_decode(transitions, total, samplerate, options, args.repeat)
+        print('%-28s %10d %8d %8.3f %12.0f %12.0f %9.1f' % ('decode() ' + rate_text(samplerate), edges, decoded, t,
+                                                            edges / t, decoded / t, peak / 1048576))
+        del transitions
+
+    objects = make_packets(packets)
+    t, peak, count = bench_packets(objects, rates[0], options, args.repeat)
+    print('%-28s %10s %8d %8.3f %12s %12.0f %9.1f' % ('handleDecodedBytes()', '-', count, t, '-', count / t, peak / 1048576))
+
+if __name__ == '__main__':
+    main()
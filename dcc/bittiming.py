@@ -0,0 +1,120 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Bit timing histograms of a capture (signal quality of the booster).
+
+Per '1' and '0' bit the durations of both half bits (part 1: from the
+edge of the detected direction, part 2: the rest of the bit) are counted
+in 1 µs bins, their difference (asymmetry) in a second histogram. Half
+bits of HALF_BINS µs or longer (stretched zeros) go to the last bin and
+are not part of mean and deviation. The arrays are allocated once, so the
+cost per bit does not depend on the length of the capture.
+The DC offset is (sum part 1 - sum part 2) / (sum of all bits) of the
+'0' and '1' bits.
+'''
+
+from array import array
+from math import sqrt
+
+HALF_BINS     = 256  #half bit 0 - 255 µs
+ASYM_BINS     = 65   #part 1 - part 2: -32 - +32 µs (clipped)
+PREAMBLE_BINS = 64   #'1' bits of the preamble
+
+def histogram(bins):
+    return array('L', bytes(array('L').itemsize * bins))
+
+def distribution(counts, offset=0):
+    #Report of a histogram: count, mean, standard deviation, min, max, nonzero bins
+    n = s = ss = 0
+    low = high = None
+    bins = {}
+    for i, c in enumerate(counts):
+        if c:
+            value = i + offset
+            bins[value] = c
+            n  += c
+            s  += c * value
+            ss += c * value * value
+            if low is None:
+                low = value
+            high = value
+    mean = s / n if n else None
+    return {'count': n, 'mean': mean, 'stddev': sqrt(max(ss / n - mean * mean, 0.0)) if n else None,
+            'min': low, 'max': high, 'histogram': bins}
+
+class BitTiming:
+    def __init__(self, samplerate):
+        self.usPerSample = 1000000 / samplerate
+        self.halves      = {'1': (histogram(HALF_BINS), histogram(HALF_BINS)),
+                            '0': (histogram(HALF_BINS), histogram(HALF_BINS))}
+        self.asymmetry   = {'1': histogram(ASYM_BINS), '0': histogram(ASYM_BINS)}
+        self.preambles   = histogram(PREAMBLE_BINS)
+        self.sum1        = 0  #samples of all part 1 / part 2
+        self.sum2        = 0
+
+    def bit(self, value, part1, part2):
+        #value '0' or '1', part1/part2 in samples
+        self.sum1 += part1
+        self.sum2 += part2
+        us1 = int(part1*self.usPerSample + 0.5)
+        us2 = int(part2*self.usPerSample + 0.5)
+        first, second = self.halves[value]
+        first[us1 if us1 < HALF_BINS else HALF_BINS-1]  += 1
+        second[us2 if us2 < HALF_BINS else HALF_BINS-1] += 1
+        diff = us1 - us2 + ASYM_BINS//2
+        self.asymmetry[value][0 if diff < 0 else diff if diff < ASYM_BINS else ASYM_BINS-1] += 1
+
+    def preamble(self, bits):
+        self.preambles[bits if bits < PREAMBLE_BINS else PREAMBLE_BINS-1] += 1
+
+    def report(self):
+        #Machine readable report (times in µs)
+        result = {}
+        for value, name in (('1', 'one'), ('0', 'zero')):
+            first, second = self.halves[value]
+            result[name] = {'part1': distribution(first[:HALF_BINS-1]),
+                            'part2': distribution(second[:HALF_BINS-1]),
+                            'part1_long': first[HALF_BINS-1],
+                            'part2_long': second[HALF_BINS-1],
+                            'asymmetry': distribution(self.asymmetry[value], -(ASYM_BINS//2))}
+        result['preamble'] = distribution(self.preambles)
+        total = self.sum1 + self.sum2
+        result['dc_offset'] = (self.sum1 - self.sum2) / total if total else 0.0
+        return result
+
+    def summary(self):
+        #Texts of the summary annotation (long, short)
+        r = self.report()
+        texts = []
+        for value, name in (('1', 'one'), ('0', 'zero')):
+            d = r[name]
+            if d['part1']['count'] == 0:
+                continue
+            texts.append("'" + value + "': " + '{:.1f}±{:.1f}'.format(d['part1']['mean'], d['part1']['stddev'])
+                         + '/' + '{:.1f}±{:.1f}'.format(d['part2']['mean'], d['part2']['stddev'])
+                         + ' µs, asym. ' + '{:.1f}'.format(d['asymmetry']['mean']) + ' µs')
+        if r['preamble']['count']:
+            texts.append('preamble: ' + str(r['preamble']['min']) + '-' + str(r['preamble']['max'])
+                         + ' bits (mean ' + '{:.1f}'.format(r['preamble']['mean']) + ')')
+        texts.append('DC offset: ' + '{:.2f}'.format(r['dc_offset']*100) + '%')
+        output_short = 'DC offset: ' + '{:.2f}'.format(r['dc_offset']*100) + '%'
+        return ', '.join(texts), output_short
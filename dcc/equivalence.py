@@ -0,0 +1,486 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+'''
+Differential test of the decode paths against the pinned reference decoder:
+
+  python -m dcc.equivalence [-n packets] [--seeds 3] [-r 50k,1M] [--corrupt 0.1]
+                            [--paths direct,edges,table,parallel] [-j 4] [--seed 0]
+                            [--reference tests/reference/pd.py] [--min-speedup 1.0]
+
+Random packet streams (every address range and instruction class of
+RCN-211/212/213/214, service mode and POM/XPOM packets, RailCom related
+instructions of RCN-217, each with random payload) are partly corrupted
+(flipped bits, missing and extra bytes) and synthesized with stretched
+zeros, glitches and a random preamble length. Every stream is decoded with
+the option sets of OPTION_SETS: the options of the pinned decoder
+(operation and service mode, 14 speed steps, search, short pulses) and
+the later ones (annotation levels, search lists, timing profile,
+statistics, programming operations, bit timing, pre-filter, lookahead
+resync, profiling, live mode, RailCom detector channel, a second data
+line). The paths:
+
+  reference  the decoder before the optimizations (tests/reference/pd.py,
+             a pinned copy in the source tree, not part of the package),
+             sequential
+  direct     the decoder, sequential (dispatch tables, Packet/PacketInfo,
+             bits of the edge batches of the runtime); its annotations
+             have to match the reference
+  edges      the decoder with the edges one by one from wait() (generator
+             edge loop, the path under libsigrokdecode)
+  table      bits of timing.classify_edges() (batch classifier of the seam
+             search) against the bit annotations of the direct path
+  parallel   segmented decode of a session file in -j processes
+
+Options that did not exist in the pinned decoder and only add rows or
+summaries are compared with the reference without these annotations.
+Options that change the decode (pre-filter, resync, annotation levels,
+search lists, timing profile) have no reference: there the direct path is
+the reference of the other paths. edges, table and parallel have to
+match the direct path record for record (start and end sample, output
+type, data); the first difference is printed, an exception of a decode
+is a difference as well. The times give the speedup of every path against
+the run it is compared with. Exit status 1 if a path differs or if the
+direct path is slower than --min-speedup times the reference (throughput
+regression).
+'''
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+
+from . import Decoder
+from . import railcom as rc
+from . import standalone
+from . import synth
+from .__main__ import decode_capture
+from .pd import Ann
+from .srfile import parse_samplerate
+from .timing import VALUE_UNKNOWN, classify_edges, get_profile
+
+PATHS     = ('direct', 'edges', 'table', 'parallel')
+REFERENCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'reference', 'pd.py')
+
+class EdgeDecoder(Decoder):
+    #The decoder as under libsigrokdecode: edges one by one from wait() instead of the runtime's edge_batches()
+    edge_batches = None
+
+def load_reference(path=REFERENCE):
+    #Decoder class of the pinned copy (a file of the source tree, not part of the package)
+    if not os.path.isfile(path):
+        raise SystemExit('Reference decoder not found: ' + path + ' (see --reference)')
+    spec   = importlib.util.spec_from_file_location('dcc_reference', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    class ReferenceDecoder(module.Decoder):
+        #Known defect of the pinned decoder: IndexError for the weekday 7 and the month 13-15 of time/date packets
+        pinned        = True
+        weekday       = Decoder.weekday
+        weekday_short = Decoder.weekday_short
+        month         = Decoder.month
+    return ReferenceDecoder
+
+class OptionSet:
+    '''
+    name, options of the decoder
+    baseline  options of the reference decoder, None: no reference (the option changes the decode)
+    rows      annotation ids (prefixes) the options add to the output of the reference
+    texts     texts (prefixes) of annotations the options add in rows of the reference
+    signal    'plain', 'railcom' (cutouts, answers on the detector channel) or 'lines' (D0 and D1)
+    parallel  the segmented decode supports the options
+    '''
+    def __init__(self, name, options, baseline=None, rows=(), texts=(), signal='plain', parallel=True):
+        self.name     = name
+        self.options  = options
+        self.baseline = baseline
+        self.rows     = rows
+        self.texts    = texts
+        self.signal   = signal
+        self.parallel = parallel
+
+OPTION_SETS = (
+    OptionSet('operation mode', {}, {}),
+    OptionSet('service mode',   {'Mode_112_127': 'service mode'}, {'Mode_112_127': 'service mode'}),
+    OptionSet('14 speed steps', {'CV_29_1': '0: 14 speed mode', 'Addr_offset': 4}, {'CV_29_1': '0: 14 speed mode', 'Addr_offset': 4}),
+    OptionSet('search',         {'Search_dec_addr': '3', 'Search_acc_addr': '10', 'Search_cv': '29', 'Search_byte': '0x3f'},
+                                {'Search_dec_addr': '3', 'Search_acc_addr': '10', 'Search_cv': '29', 'Search_byte': '0x3f'}),
+    OptionSet('short pulses',   {'Ignore_short_pulse': 'yes'}, {'Ignore_short_pulse': 'yes'}),
+    OptionSet('search lists',   {'Search_dec_addr': '3,100-120', 'Search_acc_addr': '1-50', 'Search_cv': '1,29,1024', 'Search_byte': '0x3f,0xe0-0xef'}),
+    OptionSet('bytes',          {'Annotation_level': 'bytes'}),
+    OptionSet('packets',        {'Annotation_level': 'packets', 'Ignore_short_pulse': 'yes'}),
+    OptionSet('timing profile', {'Timing': 'RCN-210 command station'}),
+    OptionSet('statistics',     {'Statistics': 'yes', 'Statistics_interval': 1}, {}, rows=('stats',), parallel=False),
+    OptionSet('operations',     {'Sequences': 'yes'}, {}, rows=('operation',), parallel=False),
+    OptionSet('service operations', {'Sequences': 'yes', 'Mode_112_127': 'service mode'}, {'Mode_112_127': 'service mode'},
+              rows=('operation',), parallel=False),
+    OptionSet('bit timing',     {'Bit_timing': 'yes'}, {}, rows=('timing',), parallel=False),
+    OptionSet('pre-filter',     {'Min_pulse_width': '4us'}),
+    OptionSet('lookahead',      {'Resync': 'lookahead'}, parallel=False),
+    OptionSet('profile',        {'Profile': 'yes'}, {}, parallel=False),
+    OptionSet('live mode',      {'Live_mode': 'yes'}, {}),
+    OptionSet('railcom',        {}, {}, rows=('railcom',), texts=('RailCom channel ignored', 'RailCom: '),
+              signal='railcom'),
+    OptionSet('two lines',      {}, {}, rows=('d1_',), signal='lines', parallel=False),
+)
+
+def address(rng):
+    #Address bytes of a random address range [RCN-211 3]
+    kind = rng.random()
+    if kind < 0.1:
+        return [0]                                                   #broadcast
+    if kind < 0.5:
+        return [rng.randint(1, 127)]                                 #short address (112-127: service mode)
+    if kind < 0.75:
+        a = rng.randint(0, 10239)
+        return [0xc0 | (a >> 8), a & 0xff]                           #long address
+    return [rng.choice((0xe8, 0xfd, 0xfe, rng.randint(0xe8, 0xfe)))] #reserved, RailComPlus
+
+def instruction(rng):
+    #Instruction bytes of a multi function decoder [RCN-212, RCN-214, RCN-217]
+    kind = rng.randrange(12)
+    if kind == 0:   #decoder control, consist control
+        return [rng.choice((0x00, 0x01, 0x02, 0x03, 0x0a, 0x0b, 0x0f, rng.randint(0, 0x1f))), rng.randint(0, 255)]
+    if kind == 1:   #128 speed steps, special operation mode, analog function
+        return [rng.choice((0x3f, 0x3e, 0x3d, 0x3c, rng.randint(0x20, 0x3f)))] + [rng.randint(0, 255) for _ in range(rng.randint(1, 3))]
+    if kind == 2:   #14/28 speed steps
+        return [rng.randint(0x40, 0x7f)]
+    if kind == 3:   #function groups one and two
+        return [rng.randint(0x80, 0xbf)]
+    if kind == 4:   #feature expansion: binary states, F13-F68, time, system time, ...
+        return [rng.choice((0xc0, 0xdd, 0xde, 0xdf, 0xd8, 0xd9, 0xda, 0xdb, 0xdc, 0xc1, 0xc2, rng.randint(0xc0, 0xdf)))] \
+               + [rng.randint(0, 255) for _ in range(rng.randint(1, 4))]
+    if kind in (5, 6):  #CV access long form (POM verify/write/bit)
+        cv = rng.choice((0, 28, rng.randint(0, 1023)))
+        return [rng.choice((0xe4, 0xec, 0xe8)) | (cv >> 8), cv & 0xff, rng.choice((rng.randint(0, 255), 0xf0 | rng.randint(0, 15), 0xe0 | rng.randint(0, 15)))]
+    if kind == 7:   #XPOM [RCN-217]
+        return [rng.randint(0xe0, 0xe3) | (rng.randint(0, 3) << 2)] + [rng.randint(0, 255) for _ in range(rng.randint(3, 7))]
+    if kind == 8:   #CV access short form
+        return [rng.randint(0xf0, 0xff)] + [rng.randint(0, 255) for _ in range(rng.randint(1, 2))]
+    return [rng.randint(0, 255) for _ in range(rng.randint(1, 4))]
+
+def accessory(rng):
+    #Accessory packets [RCN-213]: basic, extended, POM, broadcasts
+    a = rng.choice((rng.randint(0, 511), 511, 0))
+    first = 0x80 | (a & 0x3f)
+    high  = (~(a >> 6) & 0x07) << 4
+    kind  = rng.randrange(4)
+    if kind == 0:
+        return [first, 0x80 | high | rng.randint(0, 15)]                              #basic
+    if kind == 1:
+        return [first, high | 0x01 | (rng.randint(0, 3) << 1), rng.randint(0, 255)]  #extended
+    if kind == 2:
+        cv = rng.randint(0, 1023)
+        return [first, 0x80 | high | rng.randint(0, 15), rng.choice((0xe4, 0xec, 0xe8)) | (cv >> 8), cv & 0xff, rng.randint(0, 255)]
+    return [first] + [rng.randint(0, 255) for _ in range(rng.randint(1, 4))]
+
+def service(rng):
+    #Service mode packets [RCN-214]: direct CV access, register/page mode, reset
+    kind = rng.randrange(4)
+    if kind == 0:
+        cv = rng.randint(0, 1023)
+        return [rng.choice((0x74, 0x7c, 0x78)) | (cv >> 8), cv & 0xff, rng.choice((rng.randint(0, 255), 0xf0 | rng.randint(0, 15), 0xe0 | rng.randint(0, 15)))]
+    if kind == 1:
+        return [rng.randint(0x70, 0x7f), rng.randint(0, 255)]
+    if kind == 2:
+        return [0x00, 0x00]
+    return [rng.randint(0x70, 0x7f)] + [rng.randint(0, 255) for _ in range(rng.randint(0, 3))]
+
+def random_packets(count, rng):
+    #Packets without checksum, every class of packet in random order
+    packets = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.08:
+            packets.append([0xff, 0x00])                   #idle
+        elif kind < 0.3:
+            packets.append(accessory(rng))
+        elif kind < 0.45:
+            packets.append(service(rng))
+        else:
+            packets.append(address(rng) + instruction(rng))
+    return packets
+
+def corrupt(packets, share, rng):
+    #Bit signal of the packets with a share of them damaged: (packets, checksum of every packet)
+    result = []
+    for data in packets:
+        data = list(data) + [synth.checksum(data)]
+        if rng.random() < share:
+            kind = rng.randrange(3)
+            if kind == 0:
+                i = rng.randrange(len(data))
+                data[i] ^= 1 << rng.randrange(8)           #wrong checksum
+            elif kind == 1 and len(data) > 1:
+                del data[rng.randrange(len(data))]         #missing byte
+            else:
+                data.insert(rng.randrange(len(data) + 1), rng.randint(0, 255))
+        result.append(data)
+    return result
+
+
+def signal(packets, samplerate, rng):
+    #transitions, total of the packets (incl. their checksum) with a random preamble, stretched zeros and glitches
+    return synth.synthesize(packets, samplerate, rng.randint(10, 20), stretch=rng.choice((0.0, 0.01)),
+                            glitches=rng.choice((0.0, 0.0005)), glitch_us=rng.choice((2, 10)), seed=rng.randrange(1 << 30),
+                            addChecksum=False)
+
+def railcom_answers(count, rng):
+    #Per packet None or (channel 1 bytes, channel 2 bytes): datagrams, ACK, invalid codes [RCN-217 5]
+    E = rc.ENCODE
+    answers = []
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:
+            answers.append(None)
+        elif kind == 1:
+            answers.append(((E[(rng.choice((1, 2)) << 2) | rng.randint(0, 3)], E[rng.randint(0, 63)]),
+                            (E[rng.randint(0, 3)], E[rng.randint(0, 63)])))                  #ADR_HIGH/LOW, POM
+        elif kind == 2:
+            answers.append(((), (0x0f,) * rng.randint(1, 6)))                                  #ACK
+        else:
+            answers.append(tuple(tuple(rng.randint(0, 255) for _ in range(rng.randint(0, 3))) for _ in range(2)))
+    return answers
+
+def railcom_signal(packets, samplerate, rng):
+    #signal() with RailCom cutouts, answers on bit 1
+    return synth.synthesize(packets, samplerate, rng.randint(10, 20), stretch=rng.choice((0.0, 0.01)), cutout=True,
+                            seed=rng.randrange(1 << 30), railcom=railcom_answers(len(packets), rng), addChecksum=False)
+
+def second_line(transitions, delay):
+    #Transitions of bit 0 copied to bit 1, delay samples later (a second booster output)
+    changes = [(samplenum, 0, value & 1) for samplenum, value in transitions[1:]]
+    changes.extend((samplenum + delay, 1, value & 1) for samplenum, value in transitions[1:])
+    changes.sort(key=lambda c: c[0])
+    state = (transitions[0][1] & 1) * 0b11
+    result = [(0, state)]
+    for samplenum, bit, level in changes:
+        state = (state & ~(1 << bit)) | (level << bit)
+        if result[-1][0] == samplenum:
+            result[-1] = (samplenum, state)
+        else:
+            result.append((samplenum, state))
+    return result
+
+SIGNALS = {'plain':   ((1,), {}),                   #masks of the decoder channels, channel assignment of -j
+           'railcom': ((1, 2), {'railcom': 'D1'}),
+           'lines':   ((1, None, 2), {'data1': 'D1'})}
+
+class Recorder:
+    #sink of standalone.run() keeping everything but what depends on the run time (OUTPUT_META, profile)
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, start, end, outputType, data):
+        if outputType == standalone.OUTPUT_META:
+            return
+        if outputType == standalone.OUTPUT_PYTHON and data[0] == 'PROFILE':
+            return
+        if outputType == standalone.OUTPUT_ANN and data[0] == Ann.FRAME_OTHER and data[1][-1].startswith('Profile: '):
+            return
+        self.records.append((start, end, outputType, data))
+
+def timed(function, *args):
+    t = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t
+
+def run(decoder, transitions, total, samplerate, masks, options):
+    #Everything the decoder puts, an exception ends the records with ('exception', text)
+    recorder = Recorder()
+    try:
+        standalone.run(decoder, transitions, samplerate, masks, total, recorder, options)
+    except Exception as e:
+        recorder.records.append((None, None, 'exception', repr(e)))
+    return recorder.records
+
+def decode_reference(reference, transitions, total, samplerate, options):
+    return run(reference(), transitions, total, samplerate, (1,), options)
+
+def decode_direct(transitions, total, samplerate, masks, options):
+    return run(Decoder(), transitions, total, samplerate, masks, options)
+
+def decode_edges(transitions, total, samplerate, masks, options):
+    return run(EdgeDecoder(), transitions, total, samplerate, masks, options)
+
+def decode_parallel(path, options, assignment, jobs):
+    recorder = Recorder()
+    try:
+        decode_capture(path, options, assignment, recorder, jobs, minSegment=0)  #segmented even for short streams
+    except Exception as e:
+        recorder.records.append((None, None, 'exception', repr(e)))
+    return recorder.records
+
+def annotations(records, decoderClass, optionSet=None):
+    #Annotations as (start, end, annotation id, texts) without the rows and texts the options add
+    annIds = [a[0] for a in decoderClass.annotations]
+    result = []
+    for start, end, outputType, data in records:
+        if outputType == 'exception':
+            result.append((start, end, outputType, data))
+            continue
+        if outputType != standalone.OUTPUT_ANN:
+            continue
+        annId = annIds[data[0]]
+        texts = tuple(data[1])
+        if getattr(decoderClass, 'pinned', False) and annId.startswith('search') and texts[0].endswith(':-2'):
+            continue  #known defect of the pinned decoder: search hit of a disabled search (-2)
+        if optionSet is not None and (annId.startswith(optionSet.rows) or texts[0].startswith(optionSet.texts)):
+            continue
+        result.append((start, end, annId, texts))
+    return result
+
+def bit_value(texts):
+    #Value of a bit annotation: '1', '0', stretched '0 - (...)' or unknown timing
+    text = texts[-1]
+    if text in ('0', '1'):
+        return int(text)
+    if text.startswith('0 - '):
+        return 0
+    return VALUE_UNKNOWN
+
+def annotated_bits(records):
+    return [(start, end, bit_value(data[1])) for start, end, outputType, data in records
+            if outputType == standalone.OUTPUT_ANN and data[0] in (Ann.BITS, Ann.BITS_OTHER)]
+
+def classified_bits(transitions, samplerate, options):
+    values = standalone.option_values(Decoder, options)
+    edges  = [(samplenum, value & 1) for (samplenum, value), (_, previous) in zip(transitions[1:], transitions) if (value ^ previous) & 1]
+    bits   = classify_edges([samplenum for samplenum, level in edges], samplerate, edges[0][1] == 1,
+                            get_profile(values['Timing'], values['Timing_user']))
+    return [(int(bits.start[i]), int(bits.end[i]), int(bits.value[i])) for i in range(len(bits)) if not bits.phase[i]]
+
+def plain_bits(optionSet):
+    #the bit annotations are the bits of the edges on D0 (compared with classify_edges())
+    values = standalone.option_values(Decoder, optionSet.options)
+    return (values['Annotation_level'] == 'bits' and values['Ignore_short_pulse'] == 'no'
+            and values['Min_pulse_width'] == '' and values['Resync'] == 'preamble' and optionSet.signal != 'lines')
+
+def first_difference(reference, records):
+    #None or (index, reference record, record) of the first difference
+    for i, (a, b) in enumerate(zip(reference, records)):
+        if a != b:
+            return i, a, b
+    if len(reference) != len(records):
+        i = min(len(reference), len(records))
+        return i, reference[i] if i < len(reference) else None, records[i] if i < len(records) else None
+    return None
+
+def rate_text(samplerate):
+    if samplerate >= 1000000:
+        return '{:g} MHz'.format(samplerate / 1000000)
+    return '{:g} kHz'.format(samplerate / 1000)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dcc.equivalence', description='Compare the decode paths with the pinned reference decoder.')
+    parser.add_argument('-n', '--packets', type=int, default=2000, help='packets per stream (default 2000)')
+    parser.add_argument('--seeds', type=int, default=3, help='number of random streams (default 3)')
+    parser.add_argument('--seed', type=int, default=0, help='first seed')
+    parser.add_argument('-r', '--rates', default='50k,1M', help='samplerates, comma separated (default 50k,1M)')
+    parser.add_argument('--corrupt', type=float, default=0.1, help='share of damaged packets (default 0.1)')
+    parser.add_argument('--paths', default=','.join(PATHS), help='paths compared with the reference (default %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=4, metavar='N', help='processes of the parallel path (default 4)')
+    parser.add_argument('--reference', default=REFERENCE, metavar='PD', help='pinned decoder (default tests/reference/pd.py of the source tree)')
+    parser.add_argument('--min-speedup', type=float, default=1.0, metavar='X',
+                        help='exit status 1 if the direct path is slower than X times the reference (default 1.0, 0: no check)')
+    args = parser.parse_args(argv)
+
+    paths = args.paths.split(',')
+    for path in paths:
+        if path not in PATHS:
+            raise SystemExit('Unknown path: ' + path)
+    pinned = load_reference(args.reference) if 'direct' in paths else None
+    rates = [parse_samplerate(r + 'hz' if r[-1:].isalpha() else r) for r in args.rates.split(',')]
+    times = dict.fromkeys(paths, 0.0)  #time of the path
+    bases = dict.fromkeys(paths, 0.0)  #time of the runs it is compared with
+    runs  = dict.fromkeys(paths, 0)
+    fails = dict.fromkeys(paths, 0)
+    reference = {'direct': 'reference', 'edges': 'direct', 'table': 'direct', 'parallel': 'direct'}
+
+    with tempfile.TemporaryDirectory(prefix='dcc-') as tmp:
+        for seed in range(args.seed, args.seed + args.seeds):
+            rng     = random.Random(seed)
+            packets = corrupt(random_packets(args.packets, rng), args.corrupt, rng)
+            for samplerate in rates:
+                plain    = signal(packets, samplerate, rng)
+                signals  = {'plain':   plain,
+                            'railcom': railcom_signal(packets, samplerate, rng),
+                            'lines':   (second_line(plain[0], rng.randint(1, 3)), plain[1] + 3)}
+                sessions = {}
+                for optionSet in OPTION_SETS:
+                    transitions, total = signals[optionSet.signal]
+                    masks, assignment  = SIGNALS[optionSet.signal]
+                    direct, tDirect    = timed(decode_direct, transitions, total, samplerate, masks, optionSet.options)
+                    results = []
+
+                    def compare(path, expected, records, t, tBase):
+                        times[path] += t
+                        bases[path] += tBase
+                        runs[path]  += 1
+                        diff = first_difference(expected, records)
+                        if diff is None:
+                            results.append(path + ' ok')
+                        else:
+                            fails[path] += 1
+                            results.append(path + ' MISMATCH at record %d: %s %r, %s %r' % (diff[0], reference[path], diff[1], path, diff[2]))
+
+                    for path in paths:
+                        if path == 'direct':
+                            if optionSet.baseline is None:
+                                continue
+                            expected, t = timed(decode_reference, pinned, transitions, total, samplerate, optionSet.baseline)
+                            compare(path, annotations(expected, pinned), annotations(direct, Decoder, optionSet), tDirect, t)
+                        elif path == 'edges':
+                            records, t = timed(decode_edges, transitions, total, samplerate, masks, optionSet.options)
+                            compare(path, direct, records, t, tDirect)
+                        elif path == 'table':
+                            if not plain_bits(optionSet):
+                                continue
+                            records, t = timed(classified_bits, transitions, samplerate, optionSet.options)
+                            compare(path, annotated_bits(direct), records, t, tDirect)
+                        elif optionSet.parallel:
+                            if optionSet.signal not in sessions:
+                                sessions[optionSet.signal] = os.path.join(tmp, optionSet.signal + '.sr')
+                                synth.write_session(sessions[optionSet.signal], transitions, total, samplerate)
+                            records, t = timed(decode_parallel, sessions[optionSet.signal], optionSet.options, assignment, args.jobs)
+                            compare(path, direct, records, t, tDirect)
+                    print('seed %d, %s, %s (%d records): %s' % (seed, rate_text(samplerate), optionSet.name, len(direct), ', '.join(results) or 'no path compared'))
+                    sys.stdout.flush()
+
+    print('%-10s %-10s %6s %10s %9s %9s' % ('path', 'against', 'runs', 'mismatches', 's', 'speedup'))
+    speedups = {}
+    for path in paths:
+        if runs[path] == 0:
+            continue
+        speedups[path] = bases[path] / times[path] if times[path] > 0 else 0.0
+        print('%-10s %-10s %6d %10d %9.3f %9.2f' % (path, reference[path], runs[path], fails[path], times[path], speedups[path]))
+    slow = 'direct' in speedups and speedups['direct'] < args.min_speedup
+    if slow:
+        print('THROUGHPUT REGRESSION: direct %.2fx of the reference (minimum %.2fx)' % (speedups['direct'], args.min_speedup))
+    return 1 if any(fails.values()) or slow else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
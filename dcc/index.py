@@ -0,0 +1,205 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Index of all packets of a capture, built from the OUTPUT_PYTHON records
+of the decoder, and queries combining several criteria:
+
+  python -m dcc.index build [-O option=value ...] [-C data=D0] [-j jobs] capture.sr -o capture.dccidx
+  python -m dcc.index query capture.dccidx [--dec-addr 3] [--acc-addr 1-8] [--cv 1,29]
+                            [--instruction pom_write,xpom_write] [--checksum bad] [--byte 0xff]
+
+Instead of an index file a capture (*.sr) can be queried directly.
+A capture repeats the same packets over and over, so the index keeps every
+different packet (bytes and decoded fields) once, together with the list
+of packet numbers where it occurs. A query tests the criteria on the
+different packets only and merges their lists in sample order.
+'''
+
+import argparse
+import heapq
+import pickle
+import sys
+from array import array
+from itertools import repeat
+
+from .__main__ import decode_capture, parse_pairs
+from .srfile import SrFileError
+from . import standalone
+
+FIELDS     = ('bytes', 'addr_type', 'address', 'instruction', 'cv', 'value', 'checksum')
+DEC_TYPES  = ('broadcast', 'short', 'long')
+ACC_TYPES  = ('accessory', 'extended accessory')
+VERSION    = 1
+
+def parse_values(text):
+    #'3,17,100-120' -> set of int (dec/0b/0x)
+    values = set()
+    for part in text.split(','):
+        part = part.strip()
+        if '-' in part[1:]:
+            low, high = part.split('-', 1)
+            values.update(range(int(low, 0), int(high, 0) + 1))
+        elif part:
+            values.add(int(part, 0))
+    return values
+
+def matches(value, wanted):
+    #wanted: None (any), a single value or a collection of values
+    if wanted is None:
+        return True
+    if isinstance(wanted, (set, frozenset, range, list, tuple)):
+        return value in wanted
+    return value == wanted
+
+class PacketIndex:
+    def __init__(self):
+        self.starts   = array('q')  #per packet
+        self.ends     = array('q')
+        self.kinds    = []          #different packets as tuples of FIELDS
+        self.kindIds  = {}
+        self.postings = []          #per kind: numbers of the packets
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end, record):
+        key  = tuple(record[f] for f in FIELDS)
+        kind = self.kindIds.get(key)
+        if kind is None:
+            kind = len(self.kinds)
+            self.kindIds[key] = kind
+            self.kinds.append(key)
+            self.postings.append(array('l'))
+        self.postings[kind].append(len(self.starts))
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def sink(self, start, end, outputType, data):
+        #sink for standalone.run() / decode_capture()
+        if outputType == standalone.OUTPUT_PYTHON and data[0] == 'PACKET':
+            self.add(start, end, data[1])
+
+    def matchingKinds(self, dec_addr=None, acc_addr=None, cv=None, instruction=None, checksum=None, byte=None):
+        result = []
+        for kind, (raw, addrType, address, inst, cvAddr, value, ok) in enumerate(self.kinds):
+            if dec_addr is not None and (addrType not in DEC_TYPES or not matches(address, dec_addr)):
+                continue
+            if acc_addr is not None and (addrType not in ACC_TYPES or not matches(address, acc_addr)):
+                continue
+            if cv is not None and (cvAddr is None or not matches(cvAddr, cv)):
+                continue
+            if not matches(inst, instruction) or not matches(ok, checksum):
+                continue
+            if byte is not None and not any(matches(b, byte) for b in raw):
+                continue
+            result.append(kind)
+        return result
+
+    def query(self, **criteria):
+        '''
+        Yields (startsample, endsample, record) of the packets matching all
+        given criteria in sample order. Criteria: dec_addr, acc_addr, cv,
+        instruction, checksum (True/False) and byte (any packet byte), each a
+        single value or a collection (set, range, list).
+        '''
+        kinds = self.matchingKinds(**criteria)
+        for number, kind in heapq.merge(*(zip(self.postings[k], repeat(k)) for k in kinds)):
+            yield self.starts[number], self.ends[number], dict(zip(FIELDS, self.kinds[kind]))
+
+    def count(self, **criteria):
+        return sum(len(self.postings[k]) for k in self.matchingKinds(**criteria))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump({'version': VERSION, 'starts': self.starts, 'ends': self.ends,
+                         'kinds': self.kinds, 'postings': self.postings}, f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if not isinstance(state, dict) or state.get('version') != VERSION:
+            raise SrFileError(path + ': not a packet index')
+        index = cls()
+        index.starts   = state['starts']
+        index.ends     = state['ends']
+        index.kinds    = state['kinds']
+        index.postings = state['postings']
+        index.kindIds  = {kind: i for i, kind in enumerate(index.kinds)}
+        return index
+
+def index_capture(path, options=None, assignment=None, jobs=1):
+    index = PacketIndex()
+    decode_capture(path, options or {}, assignment or {}, index.sink, jobs)
+    return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dcc.index', description='Packet index of DCC captures.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    build = commands.add_parser('build', help='decode a capture and save its packet index')
+    query = commands.add_parser('query', help='query a packet index or a capture')
+    for p in (build, query):
+        p.add_argument('-O', '--option', action='append', metavar='ID=VALUE', help='decoder option')
+        p.add_argument('-C', '--channel', action='append', metavar='ID=PROBE', help='channel assignment, default data=D0')
+        p.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='decode in N processes')
+    build.add_argument('file', metavar='FILE', help='sigrok session file')
+    build.add_argument('-o', '--output', required=True, help='index file')
+    query.add_argument('file', metavar='FILE', help='index file or sigrok session file')
+    query.add_argument('--dec-addr', type=parse_values, help='decoder addresses, e.g. 3,17,100-120')
+    query.add_argument('--acc-addr', type=parse_values, help='accessory addresses')
+    query.add_argument('--cv', type=parse_values, help='CV numbers')
+    query.add_argument('--byte', type=parse_values, help='any packet byte [dec/0b/0x]')
+    query.add_argument('--instruction', type=lambda s: set(s.split(',')), help='instructions, e.g. pom_write,xpom_write')
+    query.add_argument('--checksum', choices=('ok', 'bad'), help='checksum state')
+    query.add_argument('--count', action='store_true', help='only print the number of packets')
+    args = parser.parse_args(argv)
+
+    options    = parse_pairs(args.option, 'option')
+    assignment = parse_pairs(args.channel, 'channel')
+    try:
+        if args.command == 'build':
+            index = index_capture(args.file, options, assignment, args.jobs)
+            index.save(args.output)
+            sys.stdout.write('%d packets, %d different\n' % (len(index), len(index.kinds)))
+            return 0
+        if args.file.endswith('.sr'):
+            index = index_capture(args.file, options, assignment, args.jobs)
+        else:
+            index = PacketIndex.load(args.file)
+    except (OSError, SrFileError, pickle.UnpicklingError) as e:
+        sys.stderr.write(str(e) + '\n')
+        return 1
+
+    criteria = {'dec_addr': args.dec_addr, 'acc_addr': args.acc_addr, 'cv': args.cv, 'byte': args.byte,
+                'instruction': args.instruction, 'checksum': None if args.checksum is None else args.checksum == 'ok'}
+    if args.count:
+        sys.stdout.write('%d\n' % index.count(**criteria))
+        return 0
+    for start, end, record in index.query(**criteria):
+        sys.stdout.write('%d-%d %s %s %s %s cv=%s value=%s%s\n' % (start, end, record['bytes'].hex(), record['addr_type'],
+                         record['address'], record['instruction'], record['cv'], record['value'],
+                         '' if record['checksum'] else ' checksum error'))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
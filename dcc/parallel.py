@@ -0,0 +1,319 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Segmented decoding of long captures in several worker processes.
+
+The capture is split at preambles: a seam is the packet start bit ('0')
+after a run of at least 10 '1' bits. After a valid preamble the decoder
+is always in the same state (ADDRESSDATABYTE, no bits collected, signal
+in sync), so everything after the start bit only depends on the edges
+that follow.
+Every worker starts with a fresh Decoder at the first '1' of the run in
+front of its seam and keeps the annotations after the start bit. It then
+decodes past the end of its segment until it reaches a later seam in
+that state and stops there. The parent checks that the phase state
+(firstChangeCond) matches at each seam and concatenates the outputs, which
+gives the annotations of a sequential decode in the same order. If a
+worker did not reach the state at its own seam, the previous worker is
+run again and decodes through that seam.
+A segment is at least MIN_SEGMENT seconds of signal long, shorter
+captures get fewer segments; with less than two decode_capture() decodes
+sequentially.
+'''
+
+import multiprocessing
+import os
+import pickle
+import tempfile
+from bisect import bisect_left
+
+from . import Decoder
+from . import standalone
+from .srfile import DEFAULT_THRESHOLDS, SrFile
+from .timing import classify_edges, deglitch_edges, get_profile, pulse_width
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_PREAMBLE = 10     #'1' bits in front of a seam
+SEGMENTS_PER_JOB = 4  #more segments than jobs for load balancing
+BATCH = 10000         #annotations per pickle record
+CHUNK = 1 << 18       #edges per classification pass of find_seams
+MIN_SEGMENT = 10.0    #s of signal per segment at least (process start and the pickled output cost more than short segments save)
+
+class SegmentEnd(Exception):
+    pass
+
+class SegmentDecoder(Decoder):
+    #Decoder of one segment, see module description
+    def __init__(self, task, sink):
+        super().__init__()
+        self.task      = task
+        self.keep      = task['seam'] is None
+        self.seams     = task['later']
+        self.nextSeam  = 0
+        self.segSink   = sink
+        self.result    = {'validStart': task['seam'] is None, 'firstChange': None, 'stop': None, 'stopFirstChange': None}
+
+    def start(self):
+        super().start()
+        self.cond1, self.cond2 = ('r', 'f') if self.task['rising'] else ('f', 'r')
+        self.firstChangeCond   = self.task['firstChange']
+        self.removedPulses     = self.task['removed']  #pre-filter count of the whole capture in the summary
+
+    def inSync(self):
+        return (    self.dccStatus     == 'ADDRESSDATABYTE'
+                and self.dccBitCounter == 0
+                and self.syncSignal    == False)
+
+    def collectDataBytes(self, start, stop, data):
+        super().collectDataBytes(start, stop, data)
+        if start == self.task['seam']:
+            self.keep = self.inSync()
+            self.result['validStart']  = self.keep
+            self.result['firstChange'] = self.firstChangeCond
+            if not self.keep:
+                raise SegmentEnd()
+            return
+        while self.nextSeam < len(self.seams) and self.seams[self.nextSeam] < start:
+            self.nextSeam += 1
+        if self.nextSeam < len(self.seams) and self.seams[self.nextSeam] == start and self.keep and self.inSync():
+            self.result['stop']            = start
+            self.result['stopFirstChange'] = self.firstChangeCond
+            raise SegmentEnd()
+
+def decode_segment(task):
+    buffer = []
+    with open(task['output'], 'wb') as f:
+        def sink(start, end, outputType, data):
+            if decoder.keep:
+                buffer.append((start, end, outputType, data))
+                if len(buffer) >= BATCH:
+                    pickle.dump(buffer, f, pickle.HIGHEST_PROTOCOL)
+                    buffer.clear()
+        decoder = SegmentDecoder(task, sink)
+        with SrFile(task['path'], task['thresholds']) as capture:
+            try:
+                standalone.run(decoder, capture.iter_transitions(task['mask'], task['start']), capture.samplerate,
+                               task['masks'], capture.total, sink, task['options'])
+            except SegmentEnd:
+                pass
+        pickle.dump(buffer, f, pickle.HIGHEST_PROTOCOL)
+    return decoder.result
+
+def read_segment(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+def find_seams(capture, dataMask, count, profile=None, minWidth=0, chunk=CHUNK):
+    '''
+    Returns (start, rising, seam, firstChange, removed) for up to count-1
+    seams spread evenly over the capture: start is the sample in front of
+    the first edge of the run, seam the start sample of the packet start bit.
+    minWidth: pre-filter of the option Min_pulse_width in samples, removed
+    the pulses it removes in front of start.
+    The edge arrays of the capture (SrFile.iter_edges()) go through the
+    pre-filter (deglitch_edges()) and are classified in passes of about chunk
+    edges (classify_edges()), the preambles are found by preambles(). Only
+    the edges of the bit that is not complete yet are kept for the next pass.
+    '''
+    seams   = []
+    edges   = _empty()  #edges of the pass
+    held    = _empty()  #pre-filter: last edge, removed if the next one is closer than minWidth
+    pulses  = []        #pre-filter: end of the removed pulses from edges[0] on
+    removed = 0         #pre-filter: pulses removed in front of edges[0]
+    offset  = 0         #number of the first edge of the pass
+    rising  = None      #polarity of the first edge, the walk starts at a rising edge, later at edges[0]
+    firstRising = None
+    ones    = 0         #'1' bits at the end of the last pass
+    run     = None      #(start, rising, removed) of that run of '1' bits
+    phase   = False     #phase change so far
+    target  = 1
+
+    def runInfo(bits, i):
+        #(start, rising, removed) of the run of '1' bits starting with bit i
+        start = int(bits.start[i])
+        pos   = bisect_left(edges, start)
+        return start, ((offset + pos) & 1 == 0) == firstRising, removed + bisect_left(pulses, start)
+
+    def classify():
+        nonlocal edges, pulses, removed, offset, rising, ones, run, phase, target
+        bits = classify_edges(edges, capture.samplerate, rising, profile)
+        starts, runs, phases, ones, runStart, phase = preambles(bits.value, bits.phase, ones, phase)
+        for i, first, phased in zip(starts, runs, phases):
+            seam = int(bits.start[i])
+            if seam < target * capture.total // count:
+                continue
+            start, runRising, runRemoved = runInfo(bits, first) if first >= 0 else run
+            seams.append((start - 1, runRising, seam, not phased, runRemoved))
+            target = seam * count // capture.total + 1
+            if target >= count:
+                return False
+        if runStart >= 0:
+            run = runInfo(bits, runStart)
+        #keep the edges from the start of the next bit of the walk
+        if len(bits):
+            last = bisect_left(edges, int(bits.start[-1]))
+            nxt  = last + (3 if bits.phase[-1] else 2)
+        else:
+            nxt  = 0 if rising else 1
+        edges   = edges[nxt:]
+        offset += nxt
+        rising  = True
+        if len(edges):
+            k        = bisect_left(pulses, int(edges[0]))
+            removed += k
+            pulses   = pulses[k:]
+        return True
+
+    for level, batch in capture.iter_edges(dataMask):
+        if not len(batch):
+            continue
+        if firstRising is None:
+            firstRising = rising = level == 0
+        for i in range(0, len(batch), chunk):
+            new = batch[i:i+chunk]
+            if minWidth > 0:
+                raw = _join(held, new)
+                new, cut = deglitch_edges(raw, minWidth, pulses=True)
+                held = new[-1:] if len(new) and new[-1] == raw[-1] else _empty()
+                new  = new[:len(new) - len(held)]
+                pulses.extend(end for _, end in cut)
+            edges = _join(edges, new)
+            if len(edges) >= chunk and not classify():
+                return seams
+    edges = _join(edges, held)
+    if firstRising is not None:
+        classify()
+    return seams
+
+def preambles(value, phase, ones=0, phased=False):
+    '''
+    Packet start bits in the bits of a classify_edges() walk (value, phase):
+    a '0' after at least MIN_PREAMBLE '1' bits. ones and phased carry the
+    '1' bits at the end of the previous walk and whether it had a phase
+    change. Returns (starts, runs, phases, ones, runStart, phased): per
+    start bit its index, the index of the first '1' of its run (negative if
+    the run began in the previous walk) and whether a phase change came
+    before it; then the '1' bits at the end of this walk, the index of the
+    first of them (-1 if none or the run began before) and the phase flag
+    for the next walk.
+    '''
+    n = len(value)
+    if np is not None:
+        v      = np.asarray(value)
+        pos    = np.arange(n)
+        other  = np.maximum.accumulate(np.where(v == 1, -1, pos))  #last bit that is no '1'
+        run    = np.where(other < 0, pos + 1 + ones, pos - other)  #'1' bits up to and including each bit
+        before = np.concatenate(([ones], run[:-1]))
+        starts = np.flatnonzero((v == 0) & (before >= MIN_PREAMBLE))
+        seen   = np.logical_or.accumulate(np.asarray(phase, dtype=bool)) if n else np.zeros(0, dtype=bool)
+        seen   = np.concatenate(([phased], seen[:-1] | phased))
+        phases = seen[starts].tolist()
+        runs   = (starts - before[starts]).tolist()
+        starts = starts.tolist()
+        ones   = int(run[-1]) if n else ones
+        phased = bool(seen[-1] or phase[-1]) if n else phased
+    else:
+        starts, runs, phases = [], [], []
+        for i in range(n):
+            if value[i] == 1:
+                ones += 1
+                continue
+            if value[i] == 0 and ones >= MIN_PREAMBLE:
+                starts.append(i)
+                runs.append(i - ones)
+                phases.append(phased)
+            ones = 0
+            phased = phased or bool(phase[i])
+    runStart = n - ones if 0 < ones <= n else -1
+    return starts, runs, phases, ones, runStart, phased
+
+def _empty():
+    return np.zeros(0, dtype=np.int64) if np is not None else []
+
+def _join(a, b):
+    return np.concatenate((a, b)) if np is not None else list(a) + list(b)
+
+def segment_count(capture, jobs, minSegment=MIN_SEGMENT):
+    #Segments of a capture for jobs processes, at most one per minSegment seconds of signal (< 2: decode sequentially)
+    count = jobs * SEGMENTS_PER_JOB
+    if minSegment > 0:
+        count = min(count, int(capture.total / capture.samplerate / minSegment))
+    return count
+
+def decode_parallel(path, options, masks, jobs, thresholds=DEFAULT_THRESHOLDS, minSegment=MIN_SEGMENT):
+    '''
+    Decode a capture with jobs worker processes, yields everything the
+    decoder puts as (startsample, endsample, output_type, data) in the
+    order of a sequential decode. Segments are at least minSegment seconds
+    long (see segment_count(), 0: no limit).
+    '''
+    dataMask = masks[0]
+    mask = 0
+    for m in masks:
+        mask |= m or 0
+    values = standalone.option_values(Decoder, options)
+    with SrFile(path, thresholds) as capture:
+        seams = find_seams(capture, dataMask, max(1, segment_count(capture, jobs, minSegment)), get_profile(values['Timing'], values['Timing_user']),
+                           pulse_width(values['Min_pulse_width'], capture.samplerate))
+
+    with tempfile.TemporaryDirectory(prefix='dcc-') as tmp:
+        def task(i, excluded=()):
+            later = [s[2] for s in seams[i:] if s[2] not in excluded]
+            if i == 0:
+                start, rising, seam, firstChange, removed = 0, True, None, True, 0
+            else:
+                start, rising, seam, firstChange, removed = seams[i-1]
+            return {'path': path, 'options': options, 'masks': masks, 'mask': mask, 'start': start,
+                    'rising': rising, 'seam': seam, 'firstChange': firstChange, 'removed': removed, 'later': later,
+                    'thresholds': thresholds,
+                    'output': os.path.join(tmp, '%d-%d.seg' % (i, len(excluded)))}
+
+        tasks = [task(i) for i in range(len(seams) + 1)]
+        bySeam = {s[2]: i+1 for i, s in enumerate(seams)}
+        with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+            results = pool.map(decode_segment, tasks, chunksize=1)
+
+        i = 0
+        excluded = set()
+        while True:
+            stop = results[i]['stop']
+            if stop is not None:
+                j = bySeam[stop]
+                if not results[j]['validStart'] or results[j]['firstChange'] != results[i]['stopFirstChange']:
+                    #worker j cannot continue the decode of worker i: decode through this seam
+                    excluded.add(stop)
+                    tasks[i] = task(i, excluded)
+                    results[i] = decode_segment(tasks[i])
+                    continue
+            yield from read_segment(tasks[i]['output'])
+            if stop is None:
+                break
+            i = j
@@ -20,6 +20,99 @@
 ##
 
 '''
+OUTPUT_PYTHON format (one record per packet, startsample/endsample of the packet bytes):
+['PACKET', {'bytes': raw packet bytes incl. checksum (bytes),
+            'addr_type': 'broadcast', 'short', 'long', 'accessory', 'extended accessory',
+                         'service', 'idle', 'reserved' or None (packet too short),
+            'address': decoder/accessory address or None,
+            'instruction': instruction kind (e.g. 'speed_128', 'pom_write', 'idle') or None,
+            'cv': CV number or None,
+            'value': value of a CV instruction or None,
+            'checksum': True if the checksum is correct}]
+
+With option 'Sequences' every completed programming operation (see
+sequence.py) is put as annotation and as OUTPUT_PYTHON record:
+['OPERATION', {'mode': 'service' or 'pom',
+               'operation': 'write', 'verify', 'read', 'bit_write', 'bit_unknown'
+                            (reserved form of a bit instruction), 'page_preset',
+                            'register_write' or 'register_verify',
+               'addr_type', 'address': decoder (POM) or None (service mode),
+               'cv', 'register', 'value': None if not part of the operation,
+               'verified': write/read confirmed by verify packets,
+               'packets', 'verify_packets', 'resets': number of packets}]
+
+With the optional channel 'railcom' (RailCom detector output, samplerate
+>= 1 MHz) the answers in every cutout are decoded (see railcom.py) and put
+per channel, together with the address of the packet in front of the cutout:
+['RAILCOM', {'channel': 1 or 2, 'bytes': received bytes (4-of-8 coded),
+             'addr_type', 'address': of the packet in front of the cutout,
+             'datagrams': list of (name, ID, data), e.g. ('POM', 0, 6) or ('ACK', None, None)}]
+
+With option 'Bit_timing' the half bit durations of all '0' and '1' bits, the
+preamble lengths and the DC offset are collected (see bittiming.py) and put
+at the end of the capture as summary annotation and OUTPUT_PYTHON record
+['BIT_TIMING', {'one': ..., 'zero': ..., 'preamble': ..., 'dc_offset': ...}].
+
+The optional data lines D1..D7 (channels 'data1'..'data7', e.g. the outputs
+of several boosters) are decoded in the same edge scan, each by its own
+ChannelDecoder at annotation level 'packets' into the rows D1..D7. Their
+PACKET records have the additional key 'line' (1-7). The time skew of
+every line against the same packets of D0 is put at the end of the capture
+(row D<n>, and ['CHANNEL_SKEW', {line: {'packets', 'mean', 'min', 'max'}}]
+in s, positive: later than D0).
+
+Option 'Min_pulse_width' (e.g. '4us' or '10' samples) is a pre-filter in
+front of the bit decoding: pulses shorter than this are removed from the
+edges of every data line (annotation 'Short pulse removed'), the count is
+put at the end of the capture (['DEGLITCH', {'min_width': samples,
+'removed': {line: pulses}}]). In the headless runtime a single data line
+is filtered batch by batch with timing.deglitch_edges() (same rule). Unlike
+'Ignore_short_pulse' it does not depend on the bit timing.
+
+With option 'Resync' = 'lookahead' a disturbed bit does not always end the
+packet: after a phase error in the preamble the decoder continues in the
+right phase with the preamble read so far, and for an unknown timing the
+next edges are read in advance to find a glitch (a pulse < half a '1' bit)
+whose removal gives this and the next bit a valid timing. The checksum
+decides whether the repaired packet is valid. The number of repairs and of
+recovered packets (repaired, valid checksum) is put at the end of the
+capture (['RESYNC', {line: {'repairs', 'recovered'}}]).
+
+Option 'Profile' (or the environment variable DCC_PROFILE=yes/memory)
+counts and times the stages of the decoder: wait() for edges, bit
+classification ('bits'), collectDataBytes(), handleDecodedBytes(), the
+search and put() per annotation class (see profiler.py). The result is put
+at the end of the capture as summary annotation and ['PROFILE', {...}],
+and written as JSON to 'Profile_file' (or DCC_PROFILE_FILE) if set.
+
+In the headless runtime (standalone.py, 'python -m dcc') a single data line
+without RailCom channel, short pulse filter, lookahead resync,
+profiling and live mode is decoded from the edge lists of the runtime
+(edge_batches()): the bits of each list are classified at once by
+timing.classify_edges(), the output is the same as with wait() per edge.
+
+OUTPUT_BINARY format ('packets'), one record per packet:
+start sample (uint64 LE), end sample (uint64 LE), number of bytes (uint8;
+255: followed by the number of bytes as uint32 LE), packet bytes
+
+Live mode (continuous acquisition): packets longer than maxPacketBytes are
+dropped (the decoder waits for the next preamble), the last
+recentPacketCount packets are kept in recentPackets as (startsample,
+endsample, bytes), at most maxRailcomEdges edges of the RailCom channel are
+kept while the data line is idle, and every packet puts its decode latency
+on OUTPUT_META ('Latency', seconds): the time between the end of the packet in the signal
+and its output, relative to the packet that was output fastest.
+
+End of the capture: the last statistics summary and the report
+(STATISTICS), the bit timing histograms (BIT_TIMING), the channel skew
+(CHANNEL_SKEW), the pre-filter count (DEGLITCH), the lookahead resync count
+(RESYNC), the profile (PROFILE) and an unfinished programming operation are
+put when wait() raises EOFError at the end of the input. The headless
+runtime (standalone.py, python -m dcc) does this. libsigrokdecode 0.5.3
+(sigrok-cli, PulseView) ends the decoder without raising EOFError, so there
+these outputs are missing; only the statistics summaries of
+'Statistics_interval' > 0 are put during the decode.
+
 Used norms:
 RCN-210 (01.12.2019)
 RCN-211 (02.12.2018) 
@@ -30,16 +123,98 @@ RCN-216 (17.12.2017)
 RCN-217 (01.12.2019)
 '''
 
+import os
 import sigrokdecode as srd
+import struct
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from . import railcom
+from .bittiming import BitTiming
+from .profiler import Profiler
+from .sequence import SequenceDecoder
+from .stats import ChannelSkew, TrafficStatistics
+from .timing import PROFILES, VALUE_UNKNOWN, classify_edges, deglitch_edges, get_profile, pulse_width
+
+BIT_VALUES = {1: '1', 0: '0', VALUE_UNKNOWN: None}  #classify_edges() value -> putBit() value
 
 class SamplerateError(Exception):
     pass
 
+class ByteMissing(Exception):
+    #Packet ends before the instruction is complete (error already annotated)
+    pass
+
+class Packet:
+    #Bytes of a packet and the sample numbers of their bits (9 per byte: start of bit 7..0, end of bit 0)
+    __slots__ = ('data', 'bitPos')
+
+    def __init__(self, size=16):
+        self.data   = bytearray()
+        self.bitPos = array('q', bytes(8*9*size))
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        del self.data[:]
+
+    def setBit(self, bit, samplenum):
+        #sample number of bit boundary 0..8 of the byte being collected
+        index = len(self.data)*9 + bit
+        if index >= len(self.bitPos):
+            self.bitPos.extend(bytes(8*9*max(1, len(self.data))))
+        self.bitPos[index] = samplenum
+
+class PacketInfo:
+    #Results of the packet handlers
+    __slots__ = ('valid', 'dec_addr', 'acc_addr', 'cv_addr', 'addrType', 'instruction', 'value')
+
+    def __init__(self):
+        self.valid       = False  #valid packet found
+        self.dec_addr    = -1     #found decoder address
+        self.acc_addr    = -1     #found accessory address
+        self.cv_addr     = -1     #found CV
+        self.addrType    = None   #see OUTPUT_PYTHON
+        self.instruction = None
+        self.value       = None   #value of CV instructions
+
+class SearchValues:
+    #Values of a search option: a set of single values and sorted, disjoint ranges (low, high inclusive)
+    __slots__ = ('values', 'low', 'high')
+
+    def __init__(self, values=(), ranges=()):
+        self.values = frozenset(values)
+        merged = []
+        for low, high in sorted(ranges):
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], high)
+            else:
+                merged.append([low, high])
+        self.low  = [r[0] for r in merged]
+        self.high = [r[1] for r in merged]
+
+    def __contains__(self, value):
+        if value in self.values:
+            return True
+        i = bisect_right(self.low, value) - 1
+        return i >= 0 and value <= self.high[i]
+
+    def __bool__(self):
+        return bool(self.values) or bool(self.low)
+
 class Ann:
-    BITS, BITS_OTHER, FRAME, FRAME_OTHER, DATA, DATA_ACC, DATA_DEC, DATA_CV, COMMAND, ERROR, SEARCH_ACC, SEARCH_DEC, SEARCH_CV, SEARCH_BYTE = range(14)
+    BITS, BITS_OTHER, FRAME, FRAME_OTHER, DATA, DATA_ACC, DATA_DEC, DATA_CV, COMMAND, ERROR, SEARCH_ACC, SEARCH_DEC, SEARCH_CV, SEARCH_BYTE, STATISTICS, OPERATION, RAILCOM_CH1, RAILCOM_CH2, RAILCOM_BYTE, BIT_TIMING = range(20)
+    CHANNELS = 20  #data lines D1..D7: packet, error, skew per line
 
 class Decoder(srd.Decoder):
-    maxInterferingPulseWidth = 4 #µs (ignoreInterferingPulse)
+    maxInterferingPulseWidth = 4    #µs (ignoreInterferingPulse)
+    maxPacketBytes           = 32   #live mode: longer packets are dropped
+    lookaheadEdges           = 8    #Resync 'lookahead': edges from the start of a disturbed bit
+    recentPacketCount        = 256  #live mode: number of packets in recentPackets
+    maxRailcomEdges          = 4096 #live mode: RailCom edges kept while no data bit ends
+    maxChannelSkew           = 2000 #µs, packets of D1..D7 compared with the same packet of D0 within this time
 
     api_version = 3
     id          = 'dcc'
@@ -48,11 +223,15 @@ class Decoder(srd.Decoder):
     desc        = 'DCC protocol (operate model railways digitally)'
     license     = 'gplv2+'
     inputs      = ['logic']
-    outputs     = []
+    outputs     = ['dcc']
     tags        = ['Encoding']
     channels    = (
         {'id': 'data', 'name': 'D0', 'desc': 'Data line'},
     )
+    optional_channels = (
+        {'id': 'railcom', 'name': 'RC', 'desc': 'RailCom detector (UART, idle high)'},
+    ) + tuple({'id': 'data' + str(n), 'name': 'D' + str(n), 'desc': 'Data line ' + str(n) + ' (booster, track section)'}
+              for n in range(1, 8))
     annotations = (
         ('bits1',   'Bits'),
         ('bits2',   'Other'),
@@ -68,6 +247,17 @@ class Decoder(srd.Decoder):
         ('search2', 'Decoder address'),
         ('search3', 'CV'),
         ('search4', 'Byte'),
+        ('stats',   'Statistics'),
+        ('operation', 'Operation'),
+        ('railcom1', 'RailCom channel 1'),
+        ('railcom2', 'RailCom channel 2'),
+        ('railcom3', 'RailCom byte'),
+        ('timing',  'Bit timing'),
+    ) + tuple(annotation for n in range(1, 8) for annotation in (('d' + str(n) + '_packet', 'D' + str(n) + ' packet'),
+                                                                ('d' + str(n) + '_error',  'D' + str(n) + ' error'),
+                                                                ('d' + str(n) + '_skew',   'D' + str(n) + ' skew')))
+    binary = (
+        ('packets', 'Packets (start, end sample, length, bytes)'),
     )
     annotation_rows = (
         ('bits_',    'Bits',    (Ann.BITS, Ann.BITS_OTHER,)),
@@ -76,16 +266,34 @@ class Decoder(srd.Decoder):
         ('command_', 'Command', (Ann.COMMAND,)),
         ('error_',   'Error',   (Ann.ERROR,)),
         ('search_',  'Search',  (Ann.SEARCH_ACC, Ann.SEARCH_DEC, Ann.SEARCH_CV, Ann.SEARCH_BYTE,)),
-    )
+        ('stats_',   'Statistics', (Ann.STATISTICS,)),
+        ('operations_', 'Operations', (Ann.OPERATION,)),
+        ('railcom_', 'RailCom', (Ann.RAILCOM_CH1, Ann.RAILCOM_CH2,)),
+        ('railcom_bytes_', 'RailCom bytes', (Ann.RAILCOM_BYTE,)),
+        ('timing_',  'Bit timing', (Ann.BIT_TIMING,)),
+    ) + tuple(('d' + str(n) + '_', 'D' + str(n), (Ann.CHANNELS + 3*n - 3, Ann.CHANNELS + 3*n - 2, Ann.CHANNELS + 3*n - 1))
+              for n in range(1, 8))
     options = (
         {'id': 'CV_29_1',            'desc': 'CV29 Bit 1',              'default': '1: 28/128 speed mode', 'values': ('1: 28/128 speed mode', '0: 14 speed mode') },
         {'id': 'Mode_112_127',       'desc': 'addr. 112-127',           'default': 'operation mode', 'values': ('operation mode', 'service mode') },
         {'id': 'Addr_offset',        'desc': 'accessory addr. offset',  'default': 0 },
-        {'id': 'Search_acc_addr',    'desc': 'search acc. addr. [dec]', 'default': '' },
-        {'id': 'Search_dec_addr',    'desc': 'search dec. addr. [dec]', 'default': '' },
-        {'id': 'Search_cv',          'desc': 'search CV [dec]',         'default': '' },
-        {'id': 'Search_byte',        'desc': 'search byte [dec/0b/0x]', 'default': '' },
+        {'id': 'Search_acc_addr',    'desc': 'search acc. addr. [dec, e.g. 1,5-8]', 'default': '' },
+        {'id': 'Search_dec_addr',    'desc': 'search dec. addr. [dec, e.g. 3,100-120]', 'default': '' },
+        {'id': 'Search_cv',          'desc': 'search CV [dec, e.g. 1,29]', 'default': '' },
+        {'id': 'Search_byte',        'desc': 'search byte [dec/0b/0x, e.g. 0x3f,0xe0-0xef]', 'default': '' },
         {'id': 'Ignore_short_pulse', 'desc': 'ignore pulse <= '+str(maxInterferingPulseWidth)+' µs', 'default': 'no', 'values': ('no', 'yes') },
+        {'id': 'Min_pulse_width',    'desc': 'remove pulses < [e.g. 4us or 10 (samples)]', 'default': '' },
+        {'id': 'Resync',             'desc': 'resynchronization',       'default': 'preamble', 'values': ('preamble', 'lookahead') },
+        {'id': 'Annotation_level',   'desc': 'annotations',             'default': 'bits', 'values': ('bits', 'bytes', 'packets') },
+        {'id': 'Timing',             'desc': 'timing profile',          'default': 'RCN-210 decoder', 'values': tuple(PROFILES) + ('user',) },
+        {'id': 'Timing_user',        'desc': 'user timing [µs]: 1 half, 1 diff, 0 half, 0 max, total max', 'default': PROFILES['RCN-210 decoder'].text() },
+        {'id': 'Statistics',         'desc': 'traffic statistics (report at end of capture, not with libsigrokdecode 0.5.3)', 'default': 'no', 'values': ('no', 'yes') },
+        {'id': 'Statistics_interval', 'desc': 'statistics every [s] (0: only at end of capture, not with libsigrokdecode 0.5.3)', 'default': 10 },
+        {'id': 'Bit_timing',         'desc': 'bit timing histograms (at end of capture, not with libsigrokdecode 0.5.3)', 'default': 'no', 'values': ('no', 'yes') },
+        {'id': 'Sequences',          'desc': 'programming operations',  'default': 'no', 'values': ('no', 'yes') },
+        {'id': 'Profile',            'desc': 'profile the decoder stages', 'default': 'no', 'values': ('no', 'yes', 'memory') },
+        {'id': 'Profile_file',       'desc': 'profile: JSON file',      'default': '' },
+        {'id': 'Live_mode',          'desc': 'live mode (bounded, latency)', 'default': 'no', 'values': ('no', 'yes') },
     )
 
     weekday = ['Monday',    #0
@@ -94,7 +302,8 @@ class Decoder(srd.Decoder):
                'Thursday',  #3
                'Friday',    #4
                'Saturday',  #5
-               'Sunday'     #6
+               'Sunday',    #6
+               '?'          #7 (no weekday)
               ]
     weekday_short = ['Mo', #0
                      'Tu', #1
@@ -102,7 +311,8 @@ class Decoder(srd.Decoder):
                      'Th', #3
                      'Fr', #4
                      'Sa', #5
-                     'Su'  #6
+                     'Su', #6
+                     '?'   #7
                     ]
     month = ['?',     #0
              'Jan. ', #1
@@ -116,8 +326,19 @@ class Decoder(srd.Decoder):
              'Sep. ', #9
              'Oct. ', #10
              'Nov. ', #11
-             'Dec. '  #12
+             'Dec. ', #12
+             '?',     #13 - 15 invalid
+             '?',
+             '?'
             ]
+    functionExpansion = {0b11110: 13, #[RCN-212 2.3.4] first function of the feature expansion instructions F13 - F68
+                         0b11111: 21,
+                         0b11000: 29,
+                         0b11001: 37,
+                         0b11010: 45,
+                         0b11011: 53,
+                         0b11100: 61
+                        }
     
     def putx(self, start, end, data):
         self.put(start, end, self.out_ann, data)
@@ -126,10 +347,16 @@ class Decoder(srd.Decoder):
         self.put(self.edge_1, self.edge_3, self.out_ann, data)
         
     def put_packetbyte(self, packetByte, pos, data):
-        self.put(packetByte[pos][1][0], packetByte[pos][1][8], self.out_ann, data)
+        if self.byteAnn == True:
+            self.put(packetByte.bitPos[pos*9], packetByte.bitPos[pos*9+8], self.out_ann, data)
+        if self.recordedAnn is not None:
+            self.recordedAnn.append((pos, pos, data))
         
     def put_packetbytes(self, packetByte, start, end, data):
-        self.put(packetByte[start][1][0], packetByte[end][1][8], self.out_ann, data)
+        if self.byteAnn == True:
+            self.put(packetByte.bitPos[start*9], packetByte.bitPos[end*9+8], self.out_ann, data)
+        if self.recordedAnn is not None:
+            self.recordedAnn.append((start, end, data))
     
     def __init__(self):
         self.reset()
@@ -139,990 +366,1157 @@ class Decoder(srd.Decoder):
         self.dccStart               = 0
         self.dccLast                = 0
         self.dccBitCounter          = 0
-        self.dccBitPos              = []
         self.dccValue               = 0
-        self.decodedBytes           = []
+        self.decodedBytes           = Packet()  #reused for all packets
         self.dccStatus              = 'WAITINGFORPREAMBLE'
         self.syncSignal             = True
         self.cond1                  = 'r'  #raising-edge
         self.cond2                  = 'f'  #falling-edge
-        self.dec_addr_search        = -2
-        self.acc_addr_search        = -2
-        self.cv_addr_search         = -2
-        self.byte_search            = -2
+        self.firstChangeCond        = True #first change of the edge detection is no error
+        self.dec_addr_search        = SearchValues()
+        self.acc_addr_search        = SearchValues()
+        self.cv_addr_search         = SearchValues()
+        self.byte_search            = SearchValues()
+        self.searchActive           = False
         self.speed14                = False
         self.serviceMode            = False
         self.addrOffset             = 0
         self.ignoreInterferingPulse = 'no'
+        self.timing                 = PROFILES['RCN-210 decoder']
+        self.bitAnn                 = True  #annotations of every bit (bits, start/stop bits)
+        self.byteAnn                = True  #annotations of every packet byte, else one per packet
+        self.addressTable           = self.buildAddressTable(self.serviceMode)
+        self.instructionTable       = self.buildInstructionTable()
+        self.recordedAnn            = None  #level 'packets': annotations of the packet (byte positions)
+        self.liveMode               = False
+        self.recentPackets          = deque(maxlen=self.recentPacketCount)
+        self.latencyOffset          = None  #smallest (output time - signal time) so far
+        self.latencyMax             = 0.0
+        self.resyncCount            = 0     #synchronisation lost
+        self.statisticsOn           = False
+        self.stats                  = None  #TrafficStatistics, created in decode()
+        self.statsStart             = 0     #start of the current statistics interval
+        self.sequencesOn            = False
+        self.bitTimingOn            = False
+        self.bitTiming              = None  #BitTiming, created in decode()
+        self.sequences              = None  #SequenceDecoder, created in decode()
+        self.railcomEdges           = deque()  #(samplenum, level) of the RailCom channel, from the current bit on
+        self.railcomLevel           = 1     #level in front of the first entry of railcomEdges
+        self.lastAddress            = (None, None)  #address type, address of the last packet
+        self.railcomOn              = False
+        self.railcomConds           = None  #conditions of waitRailcom()
+        self.line                   = 0     #number of the data line (D0 - D7)
+        self.dataChannel            = 0     #channel index of the data line
+        self.channelDecoders        = []    #ChannelDecoder of the data lines D1..D7, created in decode()
+        self.skew                   = None  #ChannelSkew, created in decode()
+        self.minPulseWidth          = ''    #option Min_pulse_width
+        self.minPulse               = 0     #samples, pre-filter off: 0
+        self.removedPulses          = 0     #pulses removed by the pre-filter
+        self.resyncLookahead        = False #option Resync = 'lookahead'
+        self.repairs                = 0     #phase errors and glitches repaired by the lookahead
+        self.repairedPacket         = False #current packet contains a repair
+        self.recoveredPackets       = 0     #packets with a repair and a valid checksum
+        self.profileMode            = 'no'  #option Profile or environment variable DCC_PROFILE
+        self.profiler               = None  #Profiler, created in decode()
 
     def start(self):
         #This function is called before the beginning of the decoding. This is the place to register() the output types, check the user-supplied PD options for validity, and so on.
-        self.out_ann = self.register(srd.OUTPUT_ANN)
+        self.out_ann    = self.register(srd.OUTPUT_ANN)
+        self.out_python = self.register(srd.OUTPUT_PYTHON)
+        self.out_binary = self.register(srd.OUTPUT_BINARY)
+        self.liveMode   = self.options['Live_mode'] == 'yes'
+        if self.liveMode == True:
+            self.out_meta = self.register(srd.OUTPUT_META, meta=(float, 'Latency', 'Time from the end of a packet to its output [s]'))
+            self.railcomEdges = deque(maxlen=self.maxRailcomEdges)
 
         ##############
         #read and verify options
         self.AddrOffset             = self.options['Addr_offset']
         self.ignoreInterferingPulse = self.options['Ignore_short_pulse']
+        self.minPulseWidth          = self.options['Min_pulse_width']
+        self.resyncLookahead        = self.options['Resync'] == 'lookahead'
+        self.profileMode            = self.options['Profile']
+        if self.profileMode == 'no' and os.environ.get('DCC_PROFILE', 'no') not in ('', '0', 'no'):
+            self.profileMode = 'memory' if os.environ['DCC_PROFILE'] == 'memory' else 'yes'
+        pulse_width(self.minPulseWidth, 1000000)  #raises ValueError if invalid
+        self.timing                 = get_profile(self.options['Timing'], self.options['Timing_user'])
+        self.statisticsOn           = self.options['Statistics'] == 'yes'
+        self.sequencesOn            = self.options['Sequences'] == 'yes'
+        self.bitTimingOn            = self.options['Bit_timing'] == 'yes'
+        self.bitAnn                 = self.options['Annotation_level'] == 'bits'
+        self.byteAnn                = self.options['Annotation_level'] != 'packets'
 
         if self.options['CV_29_1']      == '0: 14 speed mode':
             self.speed14     = True;
 
         if self.options['Mode_112_127'] == 'service mode':
             self.serviceMode = True;
+        self.addressTable = self.buildAddressTable(self.serviceMode)
         
-        try:
-            self.acc_addr_search = int(self.options['Search_acc_addr'])
-        except:
-            self.acc_addr_search = -2
-        if self.acc_addr_search < 1 or self.acc_addr_search > 2047:
-            self.acc_addr_search = -2
-        
-        try:
-            self.dec_addr_search = int(self.options['Search_dec_addr'])
-        except:
-            self.dec_addr_search = -2
-        if self.dec_addr_search < 0 or self.dec_addr_search > 10239:
-            self.dec_addr_search = -2
-        
-        try:
-            self.cv_addr_search  = int(self.options['Search_cv'])
-        except:
-            self.cv_addr_search  = -2
-        if self.cv_addr_search < 1 or self.cv_addr_search > 16777216:
-            self.cv_addr_search = -2
+        self.acc_addr_search = self.searchValues(self.options['Search_acc_addr'], 1, 2047)
+        self.dec_addr_search = self.searchValues(self.options['Search_dec_addr'], 0, 10239)
+        self.cv_addr_search  = self.searchValues(self.options['Search_cv'],       1, 16777216)
+        self.byte_search     = self.searchValues(self.options['Search_byte'],     0, 255, (10, 2, 16))
+        self.searchActive    = bool(self.acc_addr_search or self.dec_addr_search or self.cv_addr_search or self.byte_search)
 
-        try:
-            self.byte_search = int(self.options['Search_byte'], base=10)
-        except:
-            try:
-                self.byte_search = int(self.options['Search_byte'], base=2)
-            except:
-                try:
-                    self.byte_search = int(self.options['Search_byte'], base=16)
-                except:
-                    self.byte_search = -2
-        if self.byte_search < 0 or self.byte_search > 255:
-            self.byte_search = -2
+    def searchValues(self, text, minimum, maximum, bases=(10,)):
+        #Search option '3,17,100-120' -> SearchValues, invalid (e.g. '-5', '3-') or out of range entries are ignored
+        values = set()
+        ranges = []
+        for part in str(text).split(','):
+            numbers = part.split('-')
+            if not part.strip() or len(numbers) > 2:
+                continue
+            bounds = []
+            for number in numbers:
+                for base in bases:
+                    try:
+                        bounds.append(int(number, base=base))
+                        break
+                    except ValueError:
+                        pass
+            if len(bounds) != len(numbers):
+                continue
+            low  = max(bounds[0], minimum)
+            high = min(bounds[-1], maximum)
+            if low == high:
+                values.add(low)
+            elif low < high:
+                ranges.append((low, high))
+        return SearchValues(values, ranges)
         
     def metadata(self, key, value):
         if key == srd.SRD_CONF_SAMPLERATE:
             self.samplerate = value;
 
-    def incPos(self, pos, packetByte):
-        #Support function: Returns next position of packet if position exists
+    def nextPos(self, pos, packetByte):
+        #Support function: Returns next position of packet, ends the packet handling if position does not exist
         if pos+1 < len(packetByte):
-            return pos+1, False
+            return pos+1
+        self.put_packetbyte(packetByte, pos, [Ann.ERROR, ['Byte missing at next position: ' + str(pos+2)]])
+        raise ByteMissing()
+
+    ##############
+    ## Lookup tables
+    def buildAddressTable(self, serviceMode):
+        #Handler for every value of the first byte
+        table = []
+        for idPacket in range(256):
+            if serviceMode == True and 112 <= idPacket <= 127:
+                table.append(self.handleServiceMode)
+            elif idPacket == 0:
+                table.append(self.handleBroadcastAddress)
+            elif 1 <= idPacket <= 127:
+                table.append(self.handleShortAddress)
+            elif 128 <= idPacket <= 191:
+                table.append(self.handleAccessory)
+            elif 192 <= idPacket <= 231:
+                table.append(self.handleLongAddress)
+            elif 232 <= idPacket <= 254:
+                table.append(self.handleReservedAddress)
+            else:
+                table.append(self.handleIdle)
+        return table
+
+    def buildInstructionTable(self):
+        #Handler for every value of the instruction byte of multi function decoder packets
+        table = []
+        for instruction in range(256):
+            cmd    = (instruction & 0b11100000) >> 5
+            subcmd = (instruction & 0b00011111)
+            if cmd == 0b000:
+                ##[RCN-212 2.1] Decoder Control
+                if   subcmd == 0b00000:          handler = self.handleDecoderReset
+                elif subcmd == 0b00001:          handler = self.handleHardReset
+                elif subcmd & 0b11110 == 0b00010: handler = self.handleFactoryTest
+                elif subcmd & 0b11110 == 0b01010: handler = self.handleAdvancedAddressing
+                elif subcmd == 0b01111:          handler = self.handleAckRequest
+                elif subcmd & 0b10000 == 0b10000: handler = self.handleConsistControl
+                else:                            handler = self.handleReservedInstruction
+            elif cmd == 0b001:
+                ##[RCN-212 2.1] Advanced Operations Instruction
+                if   subcmd == 0b11111:          handler = self.handleSpeed128
+                elif subcmd == 0b11110:          handler = self.handleSpecialOperationMode
+                elif subcmd == 0b11101:          handler = self.handleAnalogFunction
+                elif subcmd == 0b11100:          handler = self.handleSpeedDirectionFunction
+                else:                            handler = self.handleReservedInstruction
+            elif cmd in [0b010, 0b011]:          handler = self.handleSpeed14And28
+            elif cmd == 0b100:                   handler = self.handleFunctionGroupOne
+            elif cmd == 0b101:                   handler = self.handleFunctionGroupTwo
+            elif cmd == 0b110:                   handler = self.handleFeatureExpansion
+            elif subcmd & 0b10000 == 0b10000:    handler = self.handleCvAccessShort
+            else:                                handler = self.handleCvAccessLong
+            table.append(handler)
+        return table
+
+    ##############
+    ## Text support functions
+    def speed128Text(self, value, dec_addr):
+        if dec_addr == 0:
+            output_long  = 'Broadcast'
+            output_short = 'B'
         else:
-            self.put_packetbyte(packetByte, pos, [Ann.ERROR, ['Byte missing at next position: ' + str(pos+2)]])
-            return pos, True  #avoid access violation
-            
-    def handleDecodedBytes(self, packetByte):
-        validPacketFound = False
-        acc_addr         = -1  #found accessory address
-        dec_addr         = -1  #found decoder address
-        cv_addr          = -1  #found CV
+            if value >> 7 == 1:
+                output_long  = 'Forward'
+                output_short = 'F'
+            else:
+                output_long  = 'Reverse'
+                output_short = 'R'
+        if value & 0b01111111 == 0b00000000:
+            output_long  = 'STOP (' + output_long  + ')'
+            output_short = 'STOP (' + output_short + ')'
+        elif value & 0b01111111 == 0b00000001:
+            output_long  = 'EMERGENCY STOP (HALT) (' + output_long  + ')'
+            output_short = 'ESTOP ('                 + output_short + ')'
+        else:
+            speed = str((value & 0b01111111)-1)
+            output_long  += ' Speed: ' + speed + ' / 126'
+            output_short += ':'        + speed
+        return output_long, output_short
 
-        if len(packetByte) < 3:
-            self.put_packetbytes(packetByte, 0, len(packetByte)-1, [Ann.ERROR, ['Paket too short: ' + str(len(packetByte)) + ' Byte only']])
-            return
+    def functionText(self, value, f, count):
+        #'F5:1, F6:0, ...' and '1,0,...'
+        output_long  = ''
+        output_short = ''
+        for i in range(0, count):
+            output_long  += 'F' + str(f + i) + ':' + str(value & 1)
+            output_short += str(value & 1)
+            if (i<count-1):
+                output_long  += ', '
+                output_short += ','
+            value = value >> 1
+        return output_long, output_short
 
-        pos      = 0  #position within packet
-        idPacket = packetByte[pos][0] 
+    def bitManipulationText(self, value):
+        if value & 0b00010000 == 0b00010000:
+            output_long  = 'Write, '
+            output_short = 'w,'
+        else:
+            output_long  = 'Verify, '
+            output_short = 'v,'
+        output_long  += str(value & 0b00000111)
+        output_short += str(value & 0b00000111)
+        if value & 0b00001000 == 0b00001000:
+            output_long  += ', 1'
+            output_short += ',1'
+        else:
+            output_long  += ', 0'
+            output_short += ',0'
+        return output_long, output_short
 
-        ##############
-        ## Servicemode
-        if self.serviceMode == True:
-            if 112 <= idPacket <= 127:
-                if packetByte[pos][0] >> 4 == 0b0111 and len(packetByte) == 3:
-                    ##[RCN-214 5] Register/Page Mode packet
-                    if (packetByte[pos][0] >> 3) & 1 == 0:
-                        output_long  = 'Verify, Register:'
-                        output_short = 'v, R:'
+    def accessoryText(self, acc_addr, decoder, port):
+        return [str(acc_addr) + ' (decoder:' + str(decoder) + ', port:' + str(port) + ')',
+                str(acc_addr) + ' (' + str(decoder) + ',' + str(port) + ')', str(acc_addr)]
+
+    ##############
+    ## Servicemode
+    def handleServiceMode(self, packetByte, pos, info):
+        info.addrType = 'service'
+        if packetByte.data[pos] >> 4 == 0b0111 and len(packetByte) == 3:
+            ##[RCN-214 5] Register/Page Mode packet
+            if (packetByte.data[pos] >> 3) & 1 == 0:
+                output_long  = 'Verify, Register:'
+                output_short = 'v, R:'
+            else:
+                output_long  = 'Write, Register:'
+                output_short = 'w, R:'
+            output_long  += str((packetByte.data[pos] & 0b111) + 1)
+            output_short += str((packetByte.data[pos] & 0b111) + 1)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
+            pos = self.nextPos(pos, packetByte)
+            if packetByte.data[pos-1] == 0b01111101 and packetByte.data[pos] == 1:
+                ##[RCN-216 4.2]
+                self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Register/Page Mode (outdated): Page Preset']])
+            else:
+                self.put_packetbyte(packetByte, pos, [Ann.DATA, [str(packetByte.data[pos])]])
+            self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Register/Page Mode (outdated)']])
+            info.instruction = 'register_mode'
+            info.value       = packetByte.data[pos]
+            info.valid       = True
+
+        elif packetByte.data[pos] >> 4 == 0b0111 and len(packetByte) == 4:
+            ##[RCN-214 2]
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Service Mode', 'Service']])
+            if (packetByte.data[pos] >> 2) & 0b11 == 0b01:
+                info.instruction = 'service_verify'
+                self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Verify byte', 'v']])
+                pos = self.nextPos(pos, packetByte)
+                info.cv_addr = (packetByte.data[pos-1] & 0b00000011)*256 + packetByte.data[pos] + 1
+                self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(info.cv_addr)]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
+                info.value = packetByte.data[pos]
+
+            elif (packetByte.data[pos] >> 2) & 0b11 == 0b11:
+                info.instruction = 'service_write'
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Write byte', 'w']])
+                pos = self.nextPos(pos, packetByte)
+                info.cv_addr = (packetByte.data[pos-1] & 0b00000011)*256 + packetByte.data[pos] + 1
+                self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(info.cv_addr)]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+                info.value = packetByte.data[pos]
+
+            elif (packetByte.data[pos] >> 2) & 0b11 == 0b10:
+                info.instruction = 'service_bit'
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Bit manipulation', 'bit']])
+                pos = self.nextPos(pos, packetByte)
+                info.cv_addr = (packetByte.data[pos-1] & 0b00000011)*256 + packetByte.data[pos] + 1
+                self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(info.cv_addr)]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    list(self.bitManipulationText(packetByte.data[pos]))])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Operation, Position, Value', 'Op.,Pos,Value', 'O,P,V']])
+                info.value = packetByte.data[pos]
+
+            else:
+                info.instruction = 'reserved'
+                self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Reserved for future use', 'Res.']])
+
+            info.valid = True
+        return pos
+
+    ##############
+    ##[RCN-211 3] Multi-Function Decoder
+    def handleBroadcastAddress(self, packetByte, pos, info):
+        info.dec_addr = 0
+        info.addrType = 'broadcast'
+        self.put_packetbyte(packetByte, pos, [Ann.DATA_DEC, ['Broadcast']])
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND,  ['Broadcast']])
+        return self.handleInstruction(packetByte, pos, info)
+
+    def handleShortAddress(self, packetByte, pos, info):
+        info.dec_addr = packetByte.data[pos] & 0b01111111
+        info.addrType = 'short'
+        self.put_packetbyte(packetByte, pos, [Ann.DATA_DEC, [str(info.dec_addr)]])
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND,  ['Multi Function Decoder with 7 bit address', 'Decoder with 7 bit address', '7 bit addr.']])
+        return self.handleInstruction(packetByte, pos, info)
+
+    def handleLongAddress(self, packetByte, pos, info):
+        pos = self.nextPos(pos, packetByte)
+        info.dec_addr = ((packetByte.data[pos-1] & 0b00111111)*256) + packetByte.data[pos]
+        info.addrType = 'long'
+        self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA_DEC, [str(info.dec_addr)]])
+        self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND,  ['Multi Function Decoder with 14 bit address', 'Decoder with 14 bit address', '14 bit addr.']])
+        return self.handleInstruction(packetByte, pos, info)
+
+    def handleInstruction(self, packetByte, pos, info):
+        pos = self.nextPos(pos, packetByte)
+        return self.instructionTable[packetByte.data[pos]](packetByte, pos, info)
+
+    def handleReservedInstruction(self, packetByte, pos, info):
+        info.instruction = 'reserved'
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
+        return pos
+
+    def handleDecoderReset(self, packetByte, pos, info):
+        info.instruction = 'reset'
+        if info.dec_addr == 0:
+            ##[RCN-211 4.1]
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Reset packet', 'Dec. Reset', 'Reset']])
+        else:
+            ##[RCN-212 2.5.1]
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Reset', 'Dec. Reset', 'Reset']])
+        return pos
+
+    def handleHardReset(self, packetByte, pos, info):
+        info.instruction = 'hard_reset'
+        ##[RCN-212 2.5.2]
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Hard Reset', 'Hard Reset', 'Reset']])
+        return pos
+
+    def handleFactoryTest(self, packetByte, pos, info):
+        info.instruction = 'factory_test'
+        ##[RCN-212 2.5.3]
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Factory Test Instruction', 'Fac. Test', 'Test']])
+        info.valid = True
+        return pos
+
+    def handleAdvancedAddressing(self, packetByte, pos, info):
+        info.instruction = 'advanced_addressing'
+        ##[RCN-212 2.5.4]
+        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos] & 0b00000001)]])
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Set Advanced Addressing (CV #29 Bit 5)', 'Set advanced addressing', 'Set adv. addr.']])
+        return pos
+
+    def handleAckRequest(self, packetByte, pos, info):
+        info.instruction = 'ack_request'
+        ##[RCN-212 2.5.5]
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Acknowledgment Request', 'Dec. Ack Req.', 'Ack Req.']])
+        return pos
+
+    def handleConsistControl(self, packetByte, pos, info):
+        info.instruction = 'consist'
+        ##[RCN-212 2.4.1]
+        subcmd = packetByte.data[pos] & 0b00011111
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Consist Control']])
+        pos = self.nextPos(pos, packetByte)
+        if subcmd & 0b11110 == 0b10010:
+            if packetByte.data[pos-1] & 1 == 0:
+                value = 'normal'
+            else:
+                value = 'reverse'
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos] & 0b01111111) + ', dir:' + str(value)]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Set consist address', 'Set']])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
+        return pos
+
+    def handleSpeed128(self, packetByte, pos, info):
+        info.instruction = 'speed_128'
+        ##[RCN-212 2.2.2]
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['128 Speed Step Control - Instruction']])
+        pos = self.nextPos(pos, packetByte)
+        self.put_packetbyte(packetByte, pos, [Ann.DATA, list(self.speed128Text(packetByte.data[pos], info.dec_addr))])
+        return pos
+
+    def handleSpecialOperationMode(self, packetByte, pos, info):
+        info.instruction = 'special_operation'
+        ##[RCN-212 2.2.3]
+        pos = self.nextPos(pos, packetByte)
+        self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Special operation mode (unless received via consist address in CV#19)', 'Special operation mode']])
+        output_1 = ''
+        if (packetByte.data[pos] >> 2) & 0b11 == 0b00:
+            output_1 += 'Not part of a multiple traction'
+        elif (packetByte.data[pos] >> 2) & 0b11 == 0b10:
+            output_1 += 'Leading loco of multiple traction'
+        elif (packetByte.data[pos] >> 2) & 0b11 == 0b01:
+            output_1 += 'Middle loco in a multiple traction'
+        elif (packetByte.data[pos] >> 2) & 0b11 == 0b11:
+            output_1 += 'Final loco of a multiple traction'
+        output_1 += ', shunting key:' + str((packetByte.data[pos] >> 4) & 1)
+        output_1 += ', west-bit:'     + str((packetByte.data[pos] >> 5) & 1)
+        output_1 += ', east-bit:'     + str((packetByte.data[pos] >> 6) & 1)
+        output_1 += ', MAN-bit:'      + str((packetByte.data[pos] >> 7) & 1)
+        self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA,    [output_1]])
+        return pos
+
+    def handleAnalogFunction(self, packetByte, pos, info):
+        info.instruction = 'analog_function'
+        ##[RCN-212 2.3.8]
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Analog Function Group']])
+        pos = self.nextPos(pos, packetByte)
+        if packetByte.data[pos] == 0b00000001:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Volume control']])
+        elif 0b00010000 <= packetByte.data[pos] <= 0b00011111:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos] & 0b00001111)]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Position control']])
+        elif 0b10000000 <= packetByte.data[pos] <= 0b11111111:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos] & 0b01111111)]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Any control']])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
+        pos = self.nextPos(pos, packetByte)
+        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data']])
+        return pos
+
+    def handleSpeedDirectionFunction(self, packetByte, pos, info):
+        info.instruction = 'speed_direction_function'
+        ##[RCN-212 2.3.7]
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Speed, Direction, Function']])
+        pos = self.nextPos(pos, packetByte)
+        self.put_packetbyte(packetByte, pos, [Ann.DATA, list(self.speed128Text(packetByte.data[pos], info.dec_addr))])
+        for f in [0, 8, 16, 24]:
+            if len(packetByte) > pos+2:  #more data + checksum
+                pos = self.nextPos(pos, packetByte)
+                output_long, output_short = self.functionText(packetByte.data[pos], f, 8)
+                self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, 'F' + str(f) + ':' + output_short]])
+            else:
+                break
+        return pos
+
+    def handleSpeed14And28(self, packetByte, pos, info):
+        ##[RCN-212 2.2.1]
+        cmd    = (packetByte.data[pos] & 0b11100000) >> 5
+        subcmd = (packetByte.data[pos] & 0b00011111)
+        info.instruction = 'speed_14' if self.speed14 == True else 'speed_28'
+        if self.speed14 == True:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Basis Speed and Direction Instruction 14 speed step mode (CV#29=0)', 'Speed + Dir. 14 step', 'Speed 14']])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Basis Speed and Direction Instruction 28 speed step mode (CV#29=1)', 'Speed + Dir. 28 step', 'Speed 28']])
+        bit5 = (subcmd & 0b10000) >> 4
+        if info.dec_addr == 0:
+            output_long  = 'Broadcast'
+            output_short = 'B'
+        else:
+            if cmd & 0b001 == 0b001:
+                output_long  = 'Forward'
+                output_short = 'F'
+            else:
+                output_long  = 'Reverse'
+                output_short = 'R'
+        if subcmd & 0b01111 == 0b00000:
+            output_long  = 'STOP (' + output_long  + ')'
+            output_short = 'STOP (' + output_short + ')'
+        elif subcmd & 0b01111 == 0b00001:
+            output_long  = 'EMERGENCY STOP (HALT) (' + output_long  + ')'
+            output_short = 'ESTOP ('                 + output_short + ')'
+        elif self.speed14 == True:
+            output_long  += ' Speed: ' + str((subcmd & 0b1111)-1) + ' / 14'
+            output_short += ':'       + str((subcmd & 0b1111)-1)
+        else:
+            output_long  += ' Speed: ' + str((((((subcmd & 0b01111)-1)*2)-1) + bit5)) + ' / 28'
+            output_short += ':'       + str((((((subcmd & 0b01111)-1)*2)-1) + bit5))
+        if self.speed14 == True and info.dec_addr > 0:
+            output_long  += ', F0=' + str(bit5)
+            output_short += ', F0=' + str(bit5)
+        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
+        return pos
+
+    def handleFunctionGroupOne(self, packetByte, pos, info):
+        info.instruction = 'function_group_1'
+        ##[RCN-212 2.3.1]
+        subcmd = (packetByte.data[pos] & 0b00011111)
+        if self.speed14 == True:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Function Group One Instruction 14 speed step mode (CV#29=0)',     'FG1 14 step',     'FG1']])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Function Group One Instruction 28/128 speed step mode (CV#29=1)', 'FG1 28/128 step', 'FG1']])
+        output_long, output_short = self.functionText(subcmd, 1, 4)
+        if self.speed14 == True:
+            output_short = 'F1:' + output_short
+        else:
+            output_long  = 'F0:' + str(subcmd >> 4) + ', ' + output_long
+            output_short = 'F0:' + str(subcmd >> 4) + ','  + output_short
+        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
+        return pos
+
+    def handleFunctionGroupTwo(self, packetByte, pos, info):
+        info.instruction = 'function_group_2'
+        subcmd = (packetByte.data[pos] & 0b00011111)
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Function Group Two Instruction', 'FG2']])
+        if subcmd & 0b10000 == 0b10000:
+            ##[RCN-212 2.3.2]
+            f = 5
+        else:
+            ##[RCN-212 2.3.3]
+            f = 9
+        output_long, output_short = self.functionText(subcmd, f, 4)
+        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, 'F' + str(f) + ':' + output_short]])
+        return pos
+
+    def handleFeatureExpansion(self, packetByte, pos, info):
+        info.instruction = 'reserved'
+        ##[RCN-212 2.3.4]
+        subcmd = (packetByte.data[pos] & 0b00011111)
+        pos = self.nextPos(pos, packetByte)
+        self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Future Expansion Instruction']])
+        if subcmd in self.functionExpansion: #F13 - F68
+            f = self.functionExpansion[subcmd]
+            info.instruction = 'functions'
+            output_long, output_short = self.functionText(packetByte.data[pos], f, 8)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, 'F' + str(f) + ':' + output_short]])
+
+        elif subcmd == 0b11101:
+            ##[RCN-212 2.3.5]
+            ##[RCN-217 4.3.1]
+            address = packetByte.data[pos] & 0b01111111
+            info.instruction = 'binary_state_short'
+            self.put_packetbyte(packetByte, pos-1, [Ann.DATA, ['Binary State Control Instruction short form', 'Binarystate short']])
+            if address == 0:
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos] >> 7)]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Broadcast F29-F127']])
+            elif 1 <= address <= 15:
+                ##[RCN-217 4.3.1]
+                if address == 1:
+                    ##[RCN-217 5.3.1]
+                    if packetByte.data[pos] >> 7 == 0:
+                        output_long  = 'XF=1 (Requesting the location information)'
                     else:
-                        output_long  = 'Write, Register:'
-                        output_short = 'w, R:'
-                    output_long  += str((packetByte[pos][0] & 0b111) + 1)
-                    output_short += str((packetByte[pos][0] & 0b111) + 1)
-                    self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                    pos, error = self.incPos(pos, packetByte)
-                    if error == True: return
-                    if packetByte[pos-1][0] == 0b01111101 and packetByte[pos][0] == 1:
-                        ##[RCN-216 4.2]
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Register/Page Mode (outdated): Page Preset']])
+                        output_long  = 'XF=1'
+                    output_short = 'XF=1'
+                elif address == 2:
+                    ##[RCN-217 5.2.2]
+                    if packetByte.data[pos] >> 7 == 0:
+                        output_long  = 'XF=2 (Rerail search)'
                     else:
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [str(packetByte[pos][0])]])
-                    self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Register/Page Mode (outdated)']])
-                    
-                    validPacketFound = True
-                
-                elif packetByte[pos][0] >> 4 == 0b0111 and len(packetByte) == 4:
-                    ##[RCN-214 2]
-                    self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Service Mode', 'Service']])
-                    if (packetByte[pos][0] >> 2) & 0b11 == 0b01:
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Verify byte', 'v']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        cv_addr = (packetByte[pos-1][0] & 0b00000011)*256 + packetByte[pos][0] + 1
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(cv_addr)]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
-                    
-                    elif (packetByte[pos][0] >> 2) & 0b11 == 0b11:
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Write byte', 'w']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        cv_addr = (packetByte[pos-1][0] & 0b00000011)*256 + packetByte[pos][0] + 1
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(cv_addr)]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                    
-                    elif (packetByte[pos][0] >> 2) & 0b11 == 0b10:
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Bit manipulation', 'bit']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        cv_addr = (packetByte[pos-1][0] & 0b00000011)*256 + packetByte[pos][0] + 1
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(cv_addr)]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if ((packetByte[pos][0] & 0b00010000) == 0b00010000):
-                            output_long = 'Write, '
-                            output_short = 'w,'
-                        else:
-                            output_long = 'Verify, '
-                            output_short = 'v,'
-                        output_long  += str(packetByte[pos][0] & 0b00000111)
-                        output_short += str(packetByte[pos][0] & 0b00000111)
-                        if ((packetByte[pos][0] & 0b00001000) == 0b00001000):
+                        output_long  = 'XF=2'
+                    output_short = 'XF=2'
+                else:
+                    output_long  = 'XF=' + str(address) + ' (Reserved)'
+                    output_short = 'XF=' + str(address) + ' (Res.)'
+                if packetByte.data[pos] >> 7 == 0:
+                    output_long  += ':off'
+                    output_short += ':off'
+                else:
+                    output_long  += ':on'
+                    output_short += ':on'
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [output_long, output_short]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['RailCom']])
+            elif 16 <= address <= 28:
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [hex(packetByte.data[pos]) + '/' + str(packetByte.data[pos])]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Special uses']])
+            else:
+                if packetByte.data[pos-1] >> 7 == 0:
+                    output_1 = 'off'
+                else:
+                    output_1 = 'on'
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['F' + str(address) + ':' + output_1]])
+
+        elif subcmd == 0b00000:
+            ##[RCN-212 2.3.6]
+            info.instruction = 'binary_state_long'
+            self.put_packetbyte(packetByte, pos-1, [Ann.DATA, ['Binary State Control Instruction long form', 'Binarystate long']])
+            pos = self.nextPos(pos, packetByte)
+            address = (packetByte.data[pos]*128) + (packetByte.data[pos-1] & 0b01111111)
+            if packetByte.data[pos-1] >> 7 == 0:
+                output_1 = 'off'
+            else:
+                output_1 = 'on'
+            if address == 0:
+                self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA,    [output_1]])
+                self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Broadcast F29-F32767']])
+            elif packetByte.data[pos-1] & 0b01111111 == 0:
+                self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR,   ['Use binarystate short']])
+            else:
+                self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA,    ['F' + str(address) + ':' + output_1]])
+
+        elif subcmd == 0b00001:
+            ##[RCN-212 2.3.9]
+            if info.dec_addr != 0:
+                self.put_packetbytes(packetByte, 0, len(packetByte)-2, [Ann.ERROR, ['Only Broadcast allowed']])
+            value = packetByte.data[pos]
+            if (value >> 6) & 0b11 == 0b00:
+                info.instruction = 'model_time'
+                self.put_packetbyte(packetByte, pos-1, [Ann.DATA,  ['Model-Time']])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['00MMMMMM']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['WWWHHHHH']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['U0BBBBBB']])
+                output_long  = self.weekday[packetByte.data[pos-1] >> 5] + ' ' + '{:02.0f}'.format(packetByte.data[pos-1] & 0b00011111) + ':'\
+                               + '{:02.0f}'.format(packetByte.data[pos-2] & 0b00111111) + ' hrs, Update:' + str(packetByte.data[pos] >> 7) + ', Acceleration:' + str(packetByte.data[pos] & 0b00111111)
+                output_short = self.weekday_short[packetByte.data[pos-1] >> 5] + ' ' + '{:02.0f}'.format(packetByte.data[pos-1] & 0b00011111) + ':'\
+                               + '{:02.0f}'.format(packetByte.data[pos-2] & 0b00111111) + ', U:' + str(packetByte.data[pos] >> 7) + ', Acc:' + str(packetByte.data[pos] & 0b00111111)
+            elif (value >> 6) & 0b11 == 0b01:
+                info.instruction = 'model_date'
+                self.put_packetbyte(packetByte, pos-1, [Ann.DATA,  ['Model-Date']])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['010TTTTT']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['MMMMYYYY']])
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['YYYYYYYY']])
+                output_long  = str(packetByte.data[pos-2] & 0b00011111) + '. ' + self.month[(packetByte.data[pos-1] >> 4)] + str(((packetByte.data[pos-1] & 0b00001111) << 8) + packetByte.data[pos])
+                output_short = str(packetByte.data[pos-2] & 0b00011111) + '.'  + str(packetByte.data[pos-1] >> 4) + '.'    + str(((packetByte.data[pos-1] & 0b00001111) << 8) + packetByte.data[pos])
+            else:
+                output_long  = 'Reserved'
+                output_short = 'Res.'
+                self.put_packetbyte(packetByte, pos-1, [Ann.DATA,   ['Reserved']])
+            self.put_packetbytes(packetByte, pos-2, pos, [Ann.DATA, [output_long, output_short]])
+
+        elif subcmd == 0b00010:
+            ##[RCN-212 2.3.10]
+            if info.dec_addr != 0:
+                self.put_packetbytes(packetByte, 0, len(packetByte)-2, [Ann.ERROR, ['Only Broadcast allowed']])
+            info.instruction = 'system_time'
+            self.put_packetbyte(packetByte, pos-1,       [Ann.DATA,    ['Systemtime']])
+            self.put_packetbyte(packetByte, pos,         [Ann.COMMAND, ['MMMMMMMM']])
+            value = packetByte.data[pos]
+            for i in range(3):
+                pos = self.nextPos(pos, packetByte)
+                self.put_packetbyte(packetByte, pos,     [Ann.COMMAND, ['MMMMMMMM']])
+                value = value * 256 + packetByte.data[pos]
+            self.put_packetbytes(packetByte, pos-3, pos, [Ann.DATA, [str(value) + ' ms since systemstart (' + '{:.0f}'.format(value/60000) + ' minutes = ' + '{:.1f}'.format(value/3600000) + ' hours)',\
+                                                                     str(value) + ' ms since systemstart', str(value)]])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
+        return pos
+
+    def handleCvAccessShort(self, packetByte, pos, info):
+        info.instruction = 'cv_short'
+        ##[RCN-214 3]
+        ##[RCN-217 4.3.2]
+        subcmd = (packetByte.data[pos] & 0b00011111)
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND,     ['Configuration Variable Access Instruction - Short Form', 'CV Access Instruction short', 'CV short']])
+        if subcmd & 0b1111 == 0b0000:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Not available for use', 'Not av.']])
+        elif subcmd & 0b1111 == 0b0010:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Acceleration Value (CV#23)', 'CV#23']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data']])
+        elif subcmd & 0b1111 == 0b0011:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Deceleration Value (CV#24)', 'CV#24']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data']])
+        elif subcmd & 0b1111 == 0b0100:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Write CV#17 + CV#18', 'w CV#17+18']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV17']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV18']])
+        elif subcmd & 0b1111 == 0b0101:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Write CV#31 + CV#32', 'w CV#31+32']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV31']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV32']])
+        elif subcmd & 0b1111 == 0b1001:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Reserved (outdated: Service Mode Decoder Lock Instruction)', 'Res. (old: Dec. Lock)', 'Res.']])
+            pos = self.nextPos(pos, packetByte)
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str((packetByte.data[pos] & 0b01111111))]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Short address', 'Addr.']])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Reserved (maybe service mode packet)', 'Reserved', 'Res.']])
+        return pos
+
+    def handleCvAccessLong(self, packetByte, pos, info):
+        if    (pos == 1 and len(packetByte) == 5)\
+           or (pos == 2 and len(packetByte) == 6):
+            ##[RCN-214 2]
+            ##[RCN-217 5.1]
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Configuration Variable Access Instruction - Long Form (POM)', 'CV Access Instruction long (POM)', 'CV long (POM)']])
+            pos = self.handlePom(packetByte, pos, info)
+
+        elif    (pos == 1 and len(packetByte) >= 6)\
+             or (pos == 2 and len(packetByte) >= 7):
+            ##[RCN-214 4]
+            ##[RCN-217 5.5]
+            subcmd = (packetByte.data[pos] & 0b00011111)
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['XPOM']])
+            info.instruction = 'xpom_reserved'
+            if (subcmd >> 2) & 0b11 in [0b01, 0b11, 0b10]:
+                if (subcmd >> 2) & 0b11 == 0b01:
+                    output_long  = 'Read bytes'
+                    output_short = 'r'
+                    info.instruction = 'xpom_read'
+                elif (subcmd >> 2) & 0b11 == 0b11:
+                    output_long  = 'Write byte(s)'
+                    output_short = 'w'
+                    info.instruction = 'xpom_write'
+                else:
+                    output_long  = 'Bit write'
+                    output_short = 'bit'
+                    info.instruction = 'xpom_bit'
+                output_long  += ', SS:' + str(packetByte.data[pos] & 0b11)
+                output_short += ',SS:'  + str(packetByte.data[pos] & 0b11)
+                self.put_packetbyte(packetByte, pos,         [Ann.DATA,    [output_long, output_short]])
+                pos = self.nextPos(pos, packetByte)
+                pos = self.nextPos(pos, packetByte)
+                pos = self.nextPos(pos, packetByte)
+                info.cv_addr = (packetByte.data[pos-2]*256 + packetByte.data[pos-1])*256 + packetByte.data[pos] + 1
+                self.put_packetbytes(packetByte, pos-2, pos, [Ann.DATA_CV, [str(info.cv_addr)]])
+                self.put_packetbytes(packetByte, pos-2, pos, [Ann.COMMAND, ['CV']])
+                if (subcmd >> 2) & 0b11 == 0b01:  ##read command end
+                    pass
+                else:
+                    ##[RCN-217 6.7]
+                    pos = self.nextPos(pos, packetByte)
+                    if      (subcmd >> 2) & 0b11    == 0b10\
+                        and packetByte.data[pos] >> 4 == 0b1111:  ##Bit write
+                        output_long  = str(packetByte.data[pos] & 0b00000111)
+                        output_short = str(packetByte.data[pos] & 0b00000111)
+                        if packetByte.data[pos] & 0b1000 == 0b1000:
                             output_long  += ', 1'
                             output_short += ',1'
                         else:
                             output_long  += ', 0'
                             output_short += ',0'
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [output_long, output_short]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Operation, Position, Value', 'Op.,Pos,Value', 'O,P,V']])
-                    
-                    else:
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Reserved for future use', 'Res.']])
-                    
-                    validPacketFound = True
-
-        #############################
-        ## Normal = (Not Servicemode)
-        if     (self.serviceMode == False)\
-            or (self.serviceMode == True and not (112 <= idPacket <= 127)):
-            pos = 0  #position within packet
-            if     (0   <= idPacket <= 127)\
-                or (192 <= idPacket <= 231):
-                ##[RCN-211 3] Multi-Function Decoder
-            
-                if idPacket == 0:
-                    dec_addr = 0
-                    self.put_packetbyte(packetByte, pos, [Ann.DATA_DEC, ['Broadcast']])
-                    self.put_packetbyte(packetByte, pos, [Ann.COMMAND,  ['Broadcast']])
-                
-                elif 1 <= idPacket <= 127:
-                    dec_addr = packetByte[pos][0] & 0b01111111
-                    self.put_packetbyte(packetByte, pos, [Ann.DATA_DEC, [str(dec_addr)]])
-                    self.put_packetbyte(packetByte, pos, [Ann.COMMAND,  ['Multi Function Decoder with 7 bit address', 'Decoder with 7 bit address', '7 bit addr.']])
-                
-                elif 192 <= idPacket <= 231:
-                    pos, error = self.incPos(pos, packetByte)
-                    if error == True: return
-                    dec_addr = ((packetByte[pos-1][0] & 0b00111111)*256) + packetByte[pos][0]
-                    self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA_DEC, [str(dec_addr)]])
-                    self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND,  ['Multi Function Decoder with 14 bit address', 'Decoder with 14 bit address', '14 bit addr.']])
-            
-                pos, error = self.incPos(pos, packetByte)
-                if error == True: return
-                cmd    = (packetByte[pos][0] & 0b11100000) >> 5
-                subcmd = (packetByte[pos][0] & 0b00011111)
-                if cmd == 0b000:  
-                    ##[RCN-212 2.1] Decoder Control
-                    if   subcmd == 0b00000:
-                        if dec_addr == 0:
-                            ##[RCN-211 4.1]
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Reset packet', 'Dec. Reset', 'Reset']])
-                        else:
-                            ##[RCN-212 2.5.1]
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Reset', 'Dec. Reset', 'Reset']])
-                    
-                    elif subcmd == 0b00001:
-                        ##[RCN-212 2.5.2]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Hard Reset', 'Hard Reset', 'Reset']])
-                    
-                    elif subcmd & 0b11110 == 0b00010:
-                        ##[RCN-212 2.5.3]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Factory Test Instruction', 'Fac. Test', 'Test']])
-                        validPacketFound = True
-                    
-                    elif subcmd & 0b11110 == 0b01010:
-                        ##[RCN-212 2.5.4]
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0] & 0b00000001)]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Set Advanced Addressing (CV #29 Bit 5)', 'Set advanced addressing', 'Set adv. addr.']])
-                    
-                    elif subcmd == 0b01111:
-                        ##[RCN-212 2.5.5]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Decoder Acknowledgment Request', 'Dec. Ack Req.', 'Ack Req.']])
-                    
-                    elif subcmd & 0b10000 == 0b10000:
-                        ##[RCN-212 2.4.1]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Consist Control']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if subcmd & 0b11110 == 0b10010:
-                            if packetByte[pos-1][0] & 1 == 0:
-                                value = 'normal'
-                            else:
-                                value = 'reverse'
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0] & 0b01111111) + ', dir:' + str(value)]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Set consist address', 'Set']])
-                        else:
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
-                    
-                    else:
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
-                
-                elif cmd == 0b001:  
-                    ##[RCN-212 2.1] Advanced Operations Instruction
-                    if subcmd == 0b11111:
-                        ##[RCN-212 2.2.2]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['128 Speed Step Control - Instruction']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if dec_addr == 0:
-                            output_long  = 'Broadcast'
-                            output_short = 'B'
-                        else:
-                            if packetByte[pos][0] >> 7 == 1:
-                                output_long  = 'Forward'
-                                output_short = 'F'
-                            else:
-                                output_long  = 'Reverse'
-                                output_short = 'R'
-                        if packetByte[pos][0] & 0b01111111 == 0b00000000:
-                            output_long  = 'STOP (' + output_long  + ')'
-                            output_short = 'STOP (' + output_short + ')'
-                        elif packetByte[pos][0] & 0b01111111 == 0b00000001:
-                            output_long  = 'EMERGENCY STOP (HALT) (' + output_long  + ')'
-                            output_short = 'ESTOP ('                 + output_short + ')'
-                        else:
-                            speed = str(((packetByte[pos][0]) & 0b01111111)-1)
-                            output_long  += ' Speed: ' + speed + ' / 126'
-                            output_short += ':'        + speed
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                    
-                    elif subcmd == 0b11110:
-                        ##[RCN-212 2.2.3]
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Special operation mode (unless received via consist address in CV#19)', 'Special operation mode']])
-                        output_1 = ''
-                        if (packetByte[pos][0] >> 2) & 0b11 == 0b00:
-                            output_1 += 'Not part of a multiple traction'
-                        elif (packetByte[pos][0] >> 2) & 0b11 == 0b10:
-                            output_1 += 'Leading loco of multiple traction'
-                        elif (packetByte[pos][0] >> 2) & 0b11 == 0b01:
-                            output_1 += 'Middle loco in a multiple traction'
-                        elif (packetByte[pos][0] >> 2) & 0b11 == 0b11:
-                            output_1 += 'Final loco of a multiple traction'
-                        output_1 += ', shunting key:' + str((packetByte[pos][0] >> 4) & 1)
-                        output_1 += ', west-bit:'     + str((packetByte[pos][0] >> 5) & 1)
-                        output_1 += ', east-bit:'     + str((packetByte[pos][0] >> 6) & 1)
-                        output_1 += ', MAN-bit:'      + str((packetByte[pos][0] >> 7) & 1)
-                        self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA,    [output_1]])
-                            
-                    elif subcmd == 0b11101:
-                        ##[RCN-212 2.3.8]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Analog Function Group']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if packetByte[pos][0] == 0b00000001:
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Volume control']])
-                        elif 0b00010000 <= packetByte[pos][0] <= 0b00011111:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0] & 0b00001111)]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Position control']])
-                        elif 0b10000000 <= packetByte[pos][0] <= 0b11111111:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0] & 0b01111111)]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Any control']])
-                        else:
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data']])
-                    
-                    elif subcmd == 0b11100:
-                        ##[RCN-212 2.3.7]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Speed, Direction, Function']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if dec_addr == 0:
-                            output_long  = 'Broadcast'
-                            output_short = 'B'
-                        else:
-                            if packetByte[pos][0] >> 7 == 1:
-                                output_long  = 'Forward'
-                                output_short = 'F'
-                            else:
-                                output_long  = 'Reverse'
-                                output_short = 'R'
-                        if packetByte[pos][0] & 0b01111111 == 0b00000000:
-                            output_long  = 'STOP (' + output_long  + ')'
-                            output_short = 'STOP (' + output_short + ')'
-                        elif packetByte[pos][0] & 0b01111111 == 0b00000001:
-                            output_long  = 'EMERGENCY STOP (HALT) (' + output_long  + ')'
-                            output_short = 'ESTOP ('                 + output_short + ')'
-                        else:
-                            speed = str(((packetByte[pos][0]) & 0b01111111)-1)    
-                            output_long  += ' Speed: ' + speed + ' / 126'
-                            output_short += ':'        + speed
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                        numbers = [0, 8, 16, 24]
-                        for f in numbers:
-                            if len(packetByte) > pos+2:  #more data + checksum
-                                pos, error = self.incPos(pos, packetByte)
-                                if error == True: return
-                                value = packetByte[pos][0]
-                                output_long  = ''
-                                output_short = 'F' + str(f) + ':'
-                                for i in range(0, 8):
-                                    output_long  += 'F' + str(f + i) + ':' + str(value & 1)
-                                    output_short += str(value & 1)
-                                    if (i<7):
-                                        output_long  += ', '
-                                        output_short += ','
-                                    value = value >> 1
-                                self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                            else:
-                                break
-                                                    
-                    else:
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
-                
-                elif cmd in [0b010, 0b011]:  
-                    ##[RCN-212 2.2.1]
-                    if self.speed14 == True:
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Basis Speed and Direction Instruction 14 speed step mode (CV#29=0)', 'Speed + Dir. 14 step', 'Speed 14']])
-                    else:
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Basis Speed and Direction Instruction 28 speed step mode (CV#29=1)', 'Speed + Dir. 28 step', 'Speed 28']])
-                    output_long14  = ''
-                    output_short14 = ''
-                    output_long28  = ''
-                    output_short28 = ''
-                    bit5           = (subcmd & 0b10000) >> 4
-                    if dec_addr == 0:
-                        output_long14  = 'Broadcast'
-                        output_short14 = 'B'
-                    else:
-                        if cmd & 0b001 == 0b001:
-                            output_long14  = 'Forward'
-                            output_short14 = 'F'
-                        else:
-                            output_long14  = 'Reverse'
-                            output_short14 = 'R'
-                    output_long28  = output_long14
-                    output_short28 = output_short14
-                    if subcmd & 0b01111 == 0b00000:
-                        output_long14  = 'STOP (' + output_long14  + ')'
-                        output_short14 = 'STOP (' + output_short14 + ')'
-                        output_long28  = 'STOP (' + output_long28  + ')'
-                        output_short28 = 'STOP (' + output_short28 + ')'
-                    elif subcmd & 0b01111 == 0b00001:
-                        output_long14  = 'EMERGENCY STOP (HALT) (' + output_long14  + ')'
-                        output_short14 = 'ESTOP ('                 + output_short14 + ')'
-                        output_long28  = 'EMERGENCY STOP (HALT) (' + output_long28  + ')'
-                        output_short28 = 'ESTOP ('                 + output_short28 + ')'
-                    else:
-                        output_long14  += ' Speed: ' + str((subcmd & 0b1111)-1) + ' / 14'
-                        output_short14 += ':'       + str((subcmd & 0b1111)-1)
-                        output_long28  += ' Speed: ' + str((((((subcmd & 0b01111)-1)*2)-1) + bit5)) + ' / 28'
-                        output_short28 += ':'       + str((((((subcmd & 0b01111)-1)*2)-1) + bit5))
-                    if dec_addr > 0:
-                        output_long14  += ', F0=' + str(bit5)
-                        output_short14 += ', F0=' + str(bit5)
-                    if self.speed14 == True:
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long14, output_short14]])
-                    else:    
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long28, output_short28]])
-                
-                elif cmd == 0b100:
-                    ##[RCN-212 2.3.1]
-                    if self.speed14 == True:
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Function Group One Instruction 14 speed step mode (CV#29=0)',     'FG1 14 step',     'FG1']])
-                    else:    
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Function Group One Instruction 28/128 speed step mode (CV#29=1)', 'FG1 28/128 step', 'FG1']])
-
-                    f = 1
-                    output_long  = ''
-                    output_short = ''
-                    value = subcmd
-                    for i in range(0, 4):
-                        output_long  = output_long  + 'F' + str(f) + ':' + str(value & 1)
-                        output_short = output_short + str(value & 1)
-                        if (i<3):
-                            output_long  = output_long  + ', '
-                            output_short = output_short + ','
-                        value = value >> 1
-                        f += 1
-                        
-                    if self.speed14 == True:
-                        output_short = 'F1:' + output_short
-                    else:
-                        output_long  = 'F0:' + str(subcmd >> 4) + ', ' + output_long
-                        output_short = 'F0:' + str(subcmd >> 4) + ','  + output_short
-                    self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                
-                elif cmd == 0b101:
-                    self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Function Group Two Instruction', 'FG2']])
-                    if subcmd & 0b10000 == 0b10000:
-                        ##[RCN-212 2.3.2]
-                        f = 5
-                    else:
-                        ##[RCN-212 2.3.3]
-                        f = 9
-                    output_long  = ''
-                    output_short = 'F' + str(f) + ':'
-                    value = subcmd
-                    for i in range(0, 4):
-                        output_long  = output_long  + 'F' + str(f) + ':' + str(value & 1)
-                        output_short = output_short + str(value & 1)
-                        if (i<3):
-                            output_long  = output_long  + ', '
-                            output_short = output_short + ','
-                        value = value >> 1
-                        f += 1
-                    self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                
-                elif cmd == 0b110:
-                    ##[RCN-212 2.3.4]
-                    pos, error = self.incPos(pos, packetByte)
-                    if error == True: return
-                    self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Future Expansion Instruction']])
-                    if subcmd in [0b11111, 0b11110, 0b11100, 0b11011, 0b11010, 0b11001, 0b11000]: #F13 - F68
-                        value = packetByte[pos][0]
-                        f = 0
-                        if subcmd == 0b11110:
-                            f = 13
-                        if subcmd == 0b11111:
-                            f = 21
-                        if subcmd == 0b11000:
-                            f = 29
-                        if subcmd == 0b11001:
-                            f = 37
-                        if subcmd == 0b11010:
-                            f = 45
-                        if subcmd == 0b11011:
-                            f = 53
-                        if subcmd == 0b11100:
-                            f = 61
-                        output_long  = ''
-                        output_short = 'F' + str(f) + ':'
-                        for i in range(0, 8):
-                            output_long  = output_long  + 'F' + str(f + i) + ':' + str(value & 1)
-                            output_short = output_short + str(value & 1)
-                            if (i<7):
-                                output_long  = output_long  + ', '
-                                output_short = output_short + ','
-                            value = value >> 1
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                        
-                    elif subcmd == 0b11101:
-                        ##[RCN-212 2.3.5]
-                        ##[RCN-217 4.3.1]
-                        address = packetByte[pos][0] & 0b01111111
-                        self.put_packetbyte(packetByte, pos-1, [Ann.DATA, ['Binary State Control Instruction short form', 'Binarystate short']])
-                        if address == 0:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0] >> 7)]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Broadcast F29-F127']])
-                        elif 1 <= address <= 15:
-                            ##[RCN-217 4.3.1]
-                            if address == 1:
-                                ##[RCN-217 5.3.1]
-                                if packetByte[pos][0] >> 7 == 0:
-                                    output_long  = 'XF=1 (Requesting the location information)'
-                                else:
-                                    output_long  = 'XF=1'
-                                output_short = 'XF=1'
-                            elif address == 2:
-                                ##[RCN-217 5.2.2]
-                                if packetByte[pos][0] >> 7 == 0:
-                                    output_long  = 'XF=2 (Rerail search)'
-                                else:
-                                    output_long  = 'XF=2'
-                                output_short = 'XF=2'
-                            else:
-                                output_long  = 'XF=' + str(address) + ' (Reserved)'
-                                output_short = 'XF=' + str(address) + ' (Res.)'
-                            if packetByte[pos][0] >> 7 == 0:
-                                output_long  += ':off'
-                                output_short += ':off'
-                            else:
-                                output_long  += ':on'
-                                output_short += ':on'
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [output_long, output_short]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['RailCom']])
-                        elif 16 <= address <= 28:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [hex(packetByte[pos][0]) + '/' + str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Special uses']])
-                        else:
-                            if packetByte[pos-1][0] >> 7 == 0:
-                                output_1 = 'off'
-                            else:
-                                output_1 = 'on'
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['F' + str(address) + ':' + output_1]])
-                            
-                    elif subcmd == 0b00000:
-                        ##[RCN-212 2.3.6]
-                        self.put_packetbyte(packetByte, pos-1, [Ann.DATA, ['Binary State Control Instruction long form', 'Binarystate long']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        address = (packetByte[pos][0]*128) + (packetByte[pos-1][0] & 0b01111111)
-                        if packetByte[pos-1][0] >> 7 == 0:
-                            output_1 = 'off'
-                        else:
-                            output_1 = 'on'
-                        if address == 0:
-                            self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA,    [output_1]])
-                            self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Broadcast F29-F32767']])
-                        elif packetByte[pos-1][0] & 0b01111111 == 0:
-                            self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR,   ['Use binarystate short']])
-                        else:
-                            self.put_packetbytes(packetByte, pos-1, pos, [Ann.DATA,    ['F' + str(address) + ':' + output_1]])
-                            
-                    elif subcmd == 0b00001:
-                        ##[RCN-212 2.3.9]
-                        if dec_addr != 0:
-                            self.put_packetbytes(packetByte, 0, len(packetByte)-2, [Ann.ERROR, ['Only Broadcast allowed']])
-                        value = packetByte[pos][0]
-                        if (value >> 6) & 0b11 == 0b00:
-                            self.put_packetbyte(packetByte, pos-1, [Ann.DATA,  ['Model-Time']])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['00MMMMMM']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['WWWHHHHH']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['U0BBBBBB']])
-                            output_long  = self.weekday[packetByte[pos-1][0] >> 5] + ' ' + '{:02.0f}'.format(packetByte[pos-1][0] & 0b00011111) + ':'\
-                                           + '{:02.0f}'.format(packetByte[pos-2][0] & 0b00111111) + ' hrs, Update:' + str(packetByte[pos][0] >> 7) + ', Acceleration:' + str(packetByte[pos][0] & 0b00111111)
-                            output_short = self.weekday_short[packetByte[pos-1][0] >> 5] + ' ' + '{:02.0f}'.format(packetByte[pos-1][0] & 0b00011111) + ':'\
-                                           + '{:02.0f}'.format(packetByte[pos-2][0] & 0b00111111) + ', U:' + str(packetByte[pos][0] >> 7) + ', Acc:' + str(packetByte[pos][0] & 0b00111111)
-                        elif (value >> 6) & 0b11 == 0b01:
-                            self.put_packetbyte(packetByte, pos-1, [Ann.DATA,  ['Model-Date']])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['010TTTTT']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['MMMMYYYY']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['YYYYYYYY']])
-                            output_long  = str(packetByte[pos-2][0] & 0b00011111) + '. ' + self.month[(packetByte[pos-1][0] >> 4)] + str(((packetByte[pos-1][0] & 0b00001111) << 8) + packetByte[pos][0])
-                            output_short = str(packetByte[pos-2][0] & 0b00011111) + '.'  + str(packetByte[pos-1][0] >> 4) + '.'    + str(((packetByte[pos-1][0] & 0b00001111) << 8) + packetByte[pos][0])
-                        else:
-                            output_long  = 'Reserved'
-                            output_short = 'Res.'
-                            self.put_packetbyte(packetByte, pos-1, [Ann.DATA,   ['Reserved']])
-                        self.put_packetbytes(packetByte, pos-2, pos, [Ann.DATA, [output_long, output_short]])
-                            
-                    elif subcmd == 0b00010:
-                        ##[RCN-212 2.3.10]
-                        if dec_addr != 0:
-                            self.put_packetbytes(packetByte, 0, len(packetByte)-2, [Ann.ERROR, ['Only Broadcast allowed']])
-                        self.put_packetbyte(packetByte, pos-1,       [Ann.DATA,    ['Systemtime']])
-                        self.put_packetbyte(packetByte, pos,         [Ann.COMMAND, ['MMMMMMMM']])
-                        value = packetByte[pos][0]
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbyte(packetByte, pos,         [Ann.COMMAND, ['MMMMMMMM']])
-                        value = value * 256 + packetByte[pos][0]
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbyte(packetByte, pos,         [Ann.COMMAND, ['MMMMMMMM']])
-                        value = value * 256 + packetByte[pos][0]
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        self.put_packetbyte(packetByte, pos,         [Ann.COMMAND, ['MMMMMMMM']])
-                        value = value * 256 + packetByte[pos][0]
-                        self.put_packetbytes(packetByte, pos-3, pos, [Ann.DATA, [str(value) + ' ms since systemstart (' + '{:.0f}'.format(value/60000) + ' minutes = ' + '{:.1f}'.format(value/3600000) + ' hours)',\
-                                                                                 str(value) + ' ms since systemstart', str(value)]])
+                        self.put_packetbyte(packetByte, pos, [Ann.DATA,        [output_long, output_short]])
+                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND,     ['Position, Value', 'Pos, Value', 'P,V']])
+                        info.value = packetByte.data[pos]
+                    elif (subcmd >> 2) & 0b11 == 0b11:
+                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND,     ['Data-1']])
+                        info.value = packetByte.data[pos]
+                        self.put_packetbyte(packetByte, pos, [Ann.DATA,        [str(packetByte.data[pos])]])
+                        for n in range(2, 5):
+                            if len(packetByte) > pos+2: #more data + checksum
+                                pos = self.nextPos(pos, packetByte)
+                                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data-' + str(n)]])
+                                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+            else:
+                self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Reserved for future use', 'Res.']])
+        return pos
+
+    def handlePom(self, packetByte, pos, info):
+        ##[RCN-217 5.1, 6.2] POM instruction (multi function and accessory decoders)
+        subcmd = (packetByte.data[pos] & 0b00011111)
+        info.instruction = 'pom_reserved'
+        if (subcmd >> 2) & 0b11 in [0b01, 0b11, 0b10]:
+            if (subcmd >> 2) & 0b11 == 0b01:
+                output_long  = 'Read/Verify byte'
+                output_short = 'r/v'
+                info.instruction = 'pom_verify'
+            elif (subcmd >> 2) & 0b11 == 0b11:
+                output_long  = 'Write byte'
+                output_short = 'w'
+                info.instruction = 'pom_write'
+            else:
+                output_long  = 'Bit manipulation'
+                output_short = 'Bit'
+                info.instruction = 'pom_bit'
+            self.put_packetbyte(packetByte, pos, [Ann.DATA,       [output_long, output_short]])
+            pos = self.nextPos(pos, packetByte)
+            info.cv_addr = (packetByte.data[pos-1] & 0b00000011)*256 + packetByte.data[pos] + 1
+            self.put_packetbyte(packetByte, pos, [Ann.DATA_CV,    [str(info.cv_addr)]])
+            self.put_packetbyte(packetByte, pos, [Ann.COMMAND,    ['CV']])
+            pos = self.nextPos(pos, packetByte)
+            info.value = packetByte.data[pos]
+            if (subcmd >> 2) & 0b11 != 0b10:
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte.data[pos])]])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
+            else:
+                self.put_packetbyte(packetByte, pos, [Ann.DATA,    list(self.bitManipulationText(packetByte.data[pos]))])
+                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Operation, Position, Value', 'Op.,Pos,Value', 'O,P,V']])
+        else:
+            self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Reserved for future use', 'Res.']])
+        return pos
+
+    ##############
+    ##[RCN-211 3] Accessory Decoder
+    def handleAccessory(self, packetByte, pos, info):
+        pos = self.nextPos(pos, packetByte)
+
+        #10AAAAAA 1AAADAAR                             #Basic Accessory Decoder Packet Format
+        #10111111 1000DAAR                             #Broadcast Command for Basic Accessory Decoders (only NMRA, not RCN)
+        #                                              #D:activate/deactivate addressed device AA:Pair of 4 R:Pair of output
+        #10111111 10000110                             #ESTOP
+        #10AAAAAA 1AAA1AA0 1110CCVV VVVVVVVV DDDDDDDD  #Basic Accessory Decoder Packet address for operations mode programming (POM)
+        #10AAAAAA 0AAA0AA1 DDDDDDDD                    #Extended Accessory Decoder Control Packet Format
+        #10111111 00000111 DDDDDDDD                    #Broadcast Command for Extended Accessory Decoders
+        #10111111 00000111 00000000                    #ESTOP
+        #10AAAAAA 0AAA0AA1 1110CCVV VVVVVVVV DDDDDDDD  #Extended Decoder Control Packet address for operations mode programming (POM)
+        #10AAAAAA 0AAA1AAT                             #NOP
+        #  ^^^^^^  ^^^ ^^
+        #  A1      A2  A3
+
+        A1       = packetByte.data[pos-1]        & 0b00111111        #6 bits addr. high
+        A2       = ~((packetByte.data[pos] >> 4) & 0b0111) & 0b0111  #3 bits addr. low (inverted)
+        A3       = (packetByte.data[pos]         & 0b00000110) >> 1  #2 bits bits 1-2 of bit two (port address)
+        decoder  = (A2 << 6) + A1
+        port     =  A3
+        decaddr  = (A2 << 8) + (A1 << 2) + A3 - 3
+        acc_addr = decaddr + self.AddrOffset
+        info.acc_addr = acc_addr
+        info.addrType = 'accessory' if packetByte.data[pos] & 0b10000000 == 0b10000000 else 'extended accessory'
+
+        if decaddr < 1:
+            self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR, ['Address < 1 not allowed']])
+
+        pom = False
+        if packetByte.data[pos] & 0b10001000 == 0b00001000:
+            ##[RCN-213 2.5]
+            ##[RCN-217 4.3.3]
+            info.instruction = 'railcom_nop'
+            self.put_packetbyte(packetByte, pos,   [Ann.DATA, ['Railcom NOP (AccQuery)', 'RC NOP']])
+            self.put_packetbyte(packetByte, pos-1, [Ann.DATA_ACC, [str(acc_addr)]])
+            if packetByte.data[pos] & 1 == 0:
+                self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Basic Accessory Decoder', 'Basic Accessory', 'Basic Acc.']])
+            else:
+                self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Extended Accessory Decoder', 'Extended Accessory', 'Ext. Acc.']])
+
+        elif packetByte.data[pos] & 0b10000000 == 0b10000000:
+            if     len(packetByte) == 3\
+                or len(packetByte) == 4:
+                ##[RCN-213 2.1]
+                info.instruction = 'accessory'
+                self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Basic Accessory Decoder', 'Basic Accessory', 'Basic Acc.']])
+                if acc_addr+3 == 2047:
+                    ##[RCN-213 2.2]
+                    if (packetByte.data[pos] >> 3) & 1 == 0 and packetByte.data[pos] & 1 == 0:
+                        self.put_packetbyte(packetByte, pos-1, [Ann.DATA_ACC, ['Broadcast']])
+                        self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND,  ['Broadcast']])
+                        self.put_packetbyte(packetByte, pos,   [Ann.DATA,     ['ESTOP']])
+                        info.instruction = 'estop'
                     else:
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
-                
-                elif cmd == 0b111:  
-                    if subcmd & 0b10000 == 0b10000:  #Short Form
-                        ##[RCN-214 3]
-                        ##[RCN-217 4.3.2]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND,     ['Configuration Variable Access Instruction - Short Form', 'CV Access Instruction short', 'CV short']])
-                        if subcmd & 0b1111 == 0b0000:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Not available for use', 'Not av.']])
-                        elif subcmd & 0b1111 == 0b0010:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Acceleration Value (CV#23)', 'CV#23']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data']])
-                        elif subcmd & 0b1111 == 0b0011:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Deceleration Value (CV#24)', 'CV#24']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data']])
-                        elif subcmd & 0b1111 == 0b0100:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Write CV#17 + CV#18', 'w CV#17+18']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV17']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV18']])
-                        elif subcmd & 0b1111 == 0b0101:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Write CV#31 + CV#32', 'w CV#31+32']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV31']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV32']])
-                        elif subcmd & 0b1111 == 0b1001:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Reserved (outdated: Service Mode Decoder Lock Instruction)', 'Res. (old: Dec. Lock)', 'Res.']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str((packetByte[pos][0] & 0b01111111))]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Short address', 'Addr.']])
-                        else:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    ['Reserved (maybe service mode packet)', 'Reserved', 'Res.']])
-                            
-                    elif    (pos == 1 and len(packetByte) == 5)\
-                         or (pos == 2 and len(packetByte) == 6):
-                        ##[RCN-214 2]
-                        ##[RCN-217 5.1]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Configuration Variable Access Instruction - Long Form (POM)', 'CV Access Instruction long (POM)', 'CV long (POM)']])
-                        if (subcmd >> 2) & 0b11 in [0b01, 0b11, 0b10]:
-                            if (subcmd >> 2) & 0b11 == 0b01:
-                                output_long  = 'Read/Verify byte'
-                                output_short = 'r/v'
-                            elif (subcmd >> 2) & 0b11 == 0b11:
-                                output_long  = 'Write byte'
-                                output_short = 'w'
-                            else:    
-                                output_long  = 'Bit manipulation'
-                                output_short = 'Bit'
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,       [output_long, output_short]])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            cv_addr = (packetByte[pos-1][0] & 0b00000011)*256 + packetByte[pos][0] + 1
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA_CV,    [str(cv_addr)]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND,    ['CV']])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            if (subcmd >> 2) & 0b11 != 0b10:
-                                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
-                            else:    
-                                if packetByte[pos][0] & 0b10000 == 0b10000:
-                                    output_long  = 'Write, '
-                                    output_short = 'w,'
-                                else:
-                                    output_long  = 'Verify, '
-                                    output_short = 'v,'
-                                output_long  += str(packetByte[pos][0] & 0b00000111)
-                                output_short += str(packetByte[pos][0] & 0b00000111)
-                                if packetByte[pos][0] & 0b1000 == 0b1000:
-                                    output_long  = output_long  + ', 1'
-                                    output_short = output_short + ',1'
-                                else:
-                                    output_long  = output_long  + ', 0'
-                                    output_short = output_short + ',0'
-                                self.put_packetbyte(packetByte, pos, [Ann.DATA,    [output_long, output_short]])
-                                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Operation, Position, Value', 'Op.,Pos,Value', 'O,P,V']])
+                        self.put_packetbyte(packetByte, pos,   [Ann.ERROR,    ['Unknown (maybe NMRA-Broadcast)', 'Unknown']])
+                else:
+                    if len(packetByte) == 3:
+                        output_1 = str(packetByte.data[pos] & 1)
+                        if (packetByte.data[pos] >> 3) & 1 == 0:
+                            output_2 = 'off'
                         else:
-                            output_long  = 'Reserved for future use'
-                            output_short = 'Res.'
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                            
-                    elif    (pos == 1 and len(packetByte) >= 6)\
-                         or (pos == 2 and len(packetByte) >= 7):
-                        ##[RCN-214 4]
-                        ##[RCN-217 5.5]
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['XPOM']])
-                        if (subcmd >> 2) & 0b11 in [0b01, 0b11, 0b10]:
-                            if (subcmd >> 2) & 0b11 == 0b01:
-                                output_long  = 'Read bytes'
-                                output_short = 'r'
-                            elif (subcmd >> 2) & 0b11 == 0b11:
-                                output_long  = 'Write byte(s)'
-                                output_short = 'w'
-                            elif (subcmd >> 2) & 0b11 == 0b10:
-                                output_long  = 'Bit write'
-                                output_short = 'bit'
-                            output_long  += ', SS:' + str(packetByte[pos][0] & 0b11)
-                            output_short += ',SS:'  + str(packetByte[pos][0] & 0b11)
-                            self.put_packetbyte(packetByte, pos,         [Ann.DATA,    [output_long, output_short]])
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            pos, error = self.incPos(pos, packetByte)
-                            if error == True: return
-                            cv_addr = (packetByte[pos-2][0]*256 + packetByte[pos-1][0])*256 + packetByte[pos][0] + 1
-                            self.put_packetbytes(packetByte, pos-2, pos, [Ann.DATA_CV, [str(cv_addr)]])
-                            self.put_packetbytes(packetByte, pos-2, pos, [Ann.COMMAND, ['CV']])
-                            if (subcmd >> 2) & 0b11 == 0b01:  ##read command end
-                                pass
-                            else:
-                                ##[RCN-217 6.7]
-                                pos, error = self.incPos(pos, packetByte)
-                                if error == True: return
-                                if      (subcmd >> 2) & 0b11    == 0b10\
-                                    and packetByte[pos][0] >> 4 == 0b1111:  ##Bit write
-                                    output_long  = str(packetByte[pos][0] & 0b00000111)
-                                    output_short = str(packetByte[pos][0] & 0b00000111)
-                                    if packetByte[pos][0] & 0b1000 == 0b1000:
-                                        output_long  += ', 1'
-                                        output_short += ',1'
-                                    else:
-                                        output_long  += ', 0'
-                                        output_short += ',0'
-                                    self.put_packetbyte(packetByte, pos, [Ann.DATA,        [output_long, output_short]])
-                                    self.put_packetbyte(packetByte, pos, [Ann.COMMAND,     ['Position, Value', 'Pos, Value', 'P,V']])
-                                elif (subcmd >> 2) & 0b11 == 0b11:
-                                    self.put_packetbyte(packetByte, pos, [Ann.COMMAND,     ['Data-1']])
-                                    self.put_packetbyte(packetByte, pos, [Ann.DATA,        [str(packetByte[pos][0])]])
-                                    if len(packetByte) > pos+2: #more data + checksum
-                                        pos, error = self.incPos(pos, packetByte)
-                                        if error == True: return
-                                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data-2']])
-                                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                                    if len(packetByte) > pos+2: #more data + checksum
-                                        pos, error = self.incPos(pos, packetByte)
-                                        if error == True: return
-                                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data-3']])
-                                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                                    if len(packetByte) > pos+2: #more data + checksum
-                                        pos, error = self.incPos(pos, packetByte)
-                                        if error == True: return
-                                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Data-4']])
-                                        self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
+                            output_2 = 'on'
+                        self.put_packetbyte(packetByte, pos-1,       [Ann.DATA_ACC, self.accessoryText(acc_addr, decoder, port)])
+                        self.put_packetbyte(packetByte, pos,         [Ann.DATA,     [str(output_1) + ':' + str(output_2)]])
+                    elif    len(packetByte) == 4\
+                        and packetByte.data[pos] & 0b1001 == 0b0000:
+                        pos = self.nextPos(pos, packetByte)
+                        if packetByte.data[pos] == 0:
+                            self.put_packetbyte(packetByte, pos-1,       [Ann.DATA_ACC, self.accessoryText(acc_addr, decoder, port)])
+                            self.put_packetbyte(packetByte, pos,         [Ann.COMMAND,  ['Decoder reset', 'Reset']])
+                            info.instruction = 'reset'
                         else:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA, ['Reserved for future use', 'Res.']])
-                                    
-            elif 128 <= idPacket <= 191:
-                ##[RCN-211 3] Accessory Decoder
-                pos, error = self.incPos(pos, packetByte)
-                if error == True: return
-                
-                #10AAAAAA 1AAADAAR                             #Basic Accessory Decoder Packet Format
-                #10111111 1000DAAR                             #Broadcast Command for Basic Accessory Decoders (only NMRA, not RCN)
-                #                                              #D:activate/deactivate addressed device AA:Pair of 4 R:Pair of output
-                #10111111 10000110                             #ESTOP
-                #10AAAAAA 1AAA1AA0 1110CCVV VVVVVVVV DDDDDDDD  #Basic Accessory Decoder Packet address for operations mode programming (POM)
-                #10AAAAAA 0AAA0AA1 DDDDDDDD                    #Extended Accessory Decoder Control Packet Format
-                #10111111 00000111 DDDDDDDD                    #Broadcast Command for Extended Accessory Decoders 
-                #10111111 00000111 00000000                    #ESTOP
-                #10AAAAAA 0AAA0AA1 1110CCVV VVVVVVVV DDDDDDDD  #Extended Decoder Control Packet address for operations mode programming (POM)
-                #10AAAAAA 0AAA1AAT                             #NOP
-                #  ^^^^^^  ^^^ ^^
-                #  A1      A2  A3
-
-                A1       = packetByte[pos-1][0]        & 0b00111111        #6 bits addr. high
-                A2       = ~((packetByte[pos][0] >> 4) & 0b0111) & 0b0111  #3 bits addr. low (inverted)
-                A3       = (packetByte[pos][0]         & 0b00000110) >> 1  #2 bits bits 1-2 of bit two (port address)        
-                decoder  = (A2 << 6) + A1        
-                port     =  A3        
-                decaddr  = (A2 << 8) + (A1 << 2) + A3 - 3 
-                acc_addr = decaddr + self.AddrOffset
-                
-                if decaddr < 1:
-                    self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR, ['Address < 1 not allowed']])
-                
-                pom = False
-                if packetByte[pos][0] & 0b10001000 == 0b00001000:
-                    ##[RCN-213 2.5]
-                    ##[RCN-217 4.3.3]
-                    self.put_packetbyte(packetByte, pos,   [Ann.DATA, ['Railcom NOP (AccQuery)', 'RC NOP']])
-                    self.put_packetbyte(packetByte, pos-1, [Ann.DATA_ACC, [str(acc_addr)]])
-                    if packetByte[pos][0] & 1 == 0:
-                        self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Basic Accessory Decoder', 'Basic Accessory', 'Basic Acc.']])
+                            self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR, ['Unknown']])
                     else:
-                        self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Extended Accessory Decoder', 'Extended Accessory', 'Ext. Acc.']])
-                
-                elif packetByte[pos][0] & 0b10000000 == 0b10000000:
-                    if     len(packetByte) == 3\
-                        or len(packetByte) == 4:
-                        ##[RCN-213 2.1]
-                        self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Basic Accessory Decoder', 'Basic Accessory', 'Basic Acc.']])
-                        if acc_addr+3 == 2047:
-                            ##[RCN-213 2.2]
-                            if (packetByte[pos][0] >> 3) & 1 == 0 and packetByte[pos][0] & 1 == 0:
-                                self.put_packetbyte(packetByte, pos-1, [Ann.DATA_ACC, ['Broadcast']])
-                                self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND,  ['Broadcast']])
-                                self.put_packetbyte(packetByte, pos,   [Ann.DATA,     ['ESTOP']])
-                            else:
-                                self.put_packetbyte(packetByte, pos,   [Ann.ERROR,    ['Unknown (maybe NMRA-Broadcast)', 'Unknown']])
-                        else:
-                            if len(packetByte) == 3:
-                                output_1 = str(packetByte[pos][0] & 1)
-                                if (packetByte[pos][0] >> 3) & 1 == 0:
-                                    output_2 = 'off'
-                                else:
-                                    output_2 = 'on'
-                                self.put_packetbyte(packetByte, pos-1,       [Ann.DATA_ACC, [str(acc_addr) + ' (decoder:' + str(decoder) + ', port:' + str(port) + ')',\
-                                                                                             str(acc_addr) + ' (' + str(decoder) + ',' + str(port) + ')', str(acc_addr)]])
-                                self.put_packetbyte(packetByte, pos,         [Ann.DATA,     [str(output_1) + ':' + str(output_2)]])
-                            elif    len(packetByte) == 4\
-                                and packetByte[pos][0] & 0b1001 == 0b0000:
-                                pos, error = self.incPos(pos, packetByte)
-                                if error == True: return
-                                if packetByte[pos][0] == 0: 
-                                    self.put_packetbyte(packetByte, pos-1,       [Ann.DATA_ACC, [str(acc_addr) + ' (decoder:' + str(decoder) + ', port:' + str(port) + ')',\
-                                                                                                 str(acc_addr) + ' (' + str(decoder) + ',' + str(port) + ')', str(acc_addr)]])
-                                    self.put_packetbyte(packetByte, pos,         [Ann.COMMAND,  ['Decoder reset', 'Reset']])
-                                else:
-                                    self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR, ['Unknown']])
-                            else:        
-                                self.put_packetbyte(packetByte, pos, [Ann.ERROR, ['Unknown']])
-                    
-                    elif len(packetByte) == 6:
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if packetByte[pos][0] >> 4 == 0b1110:
-                            ##[RCN-217 6.2]
-                            pom = True
-                            self.put_packetbyte(packetByte, pos-2,           [Ann.COMMAND,  ['POM for Basic Accessory Decoder', 'POM Basic Accessory', 'POM Basic Acc.']])
-                            self.put_packetbyte(packetByte, pos-1,           [Ann.DATA_ACC, [str(acc_addr) + ' (decoder:' + str(decoder) + ', port:' + str(port) + ')',\
-                                                                                             str(acc_addr) + ' (' + str(decoder) + ',' + str(port) + ')', str(acc_addr)]])
-                            self.put_packetbyte(packetByte, pos-1,           [Ann.COMMAND,  ['Address', 'Addr.']])
-                        else:
-                            self.put_packetbytes(packetByte, pos-2, pos,     [Ann.ERROR, ['Unknown']])
-                
+                        self.put_packetbyte(packetByte, pos, [Ann.ERROR, ['Unknown']])
+
+            elif len(packetByte) == 6:
+                pos = self.nextPos(pos, packetByte)
+                if packetByte.data[pos] >> 4 == 0b1110:
+                    ##[RCN-217 6.2]
+                    pom = True
+                    self.put_packetbyte(packetByte, pos-2,           [Ann.COMMAND,  ['POM for Basic Accessory Decoder', 'POM Basic Accessory', 'POM Basic Acc.']])
+                    self.put_packetbyte(packetByte, pos-1,           [Ann.DATA_ACC, self.accessoryText(acc_addr, decoder, port)])
+                    self.put_packetbyte(packetByte, pos-1,           [Ann.COMMAND,  ['Address', 'Addr.']])
                 else:
-                    ##[RCN-213 2.3]
-                    if len(packetByte) == 4:
-                        self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Extended Accessory Decoder Control Packet', 'Extended Accessory', 'Ext. Acc.']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if acc_addr+3 == 2047:
-                            ##[RCN-213 2.4]
-                            if packetByte[pos][0] == 0:
-                                self.put_packetbyte(packetByte, pos-1,       [Ann.DATA_ACC, ['Broadcast']])
-                                self.put_packetbyte(packetByte, pos-1,       [Ann.COMMAND,  ['Broadcast']])
-                                self.put_packetbyte(packetByte, pos,         [Ann.DATA,     ['ESTOP']])
-                            else:                                            
-                                self.put_packetbyte(packetByte, pos-1,       [Ann.DATA,  [hex(packetByte[pos-1][0]) + '/' + str(packetByte[pos-1][0])]])
-                                self.put_packetbyte(packetByte, pos,         [Ann.DATA,  [hex(packetByte[pos][0]) + '/' + str(packetByte[pos][0])]])
-                                self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR, ['Unknown']])
-                        else:                                                
-                            self.put_packetbytes(packetByte, pos-2, pos-1,   [Ann.DATA_ACC, [str(acc_addr) + ' (decoder:' + str(decoder) + ', port:' + str(port) + ')',\
-                                                                                             str(acc_addr) + ' (' + str(decoder) + ',' + str(port) + ')', str(acc_addr)]])
-                            self.put_packetbyte(packetByte, pos,             [Ann.DATA, ['Aspect:' + hex(packetByte[pos][0]) + '/' + str(packetByte[pos][0])]])
-                            if packetByte[pos][0] & 0b01111111 == 0b01111111:
-                                output_1 = 'on'
-                            elif packetByte[pos][0] & 0b01111111 == 0b00000000:
-                                output_1 = 'off'
-                            else:
-                                output_1 = str(packetByte[pos][0] & 0b01111111)
-                            self.put_packetbyte(packetByte, pos,             [Ann.COMMAND, ['Switching time:' + output_1 + ', output:' + str((packetByte[pos][0] >> 7))]])
-                    
-                    elif len(packetByte) == 6:
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if packetByte[pos][0] >> 4 == 0b1110:
-                            ##[RCN-217 6.2]
-                            pom = True
-                            self.put_packetbyte(packetByte, pos-2,           [Ann.COMMAND,  ['POM for Extended Accessory Decoder', 'POM Extended Accessory', 'POM Extended Acc.']])
-                            self.put_packetbyte(packetByte, pos-1,           [Ann.DATA_ACC, [str(acc_addr) + ' (decoder:' + str(decoder) + ', port:' + str(port) + ')',\
-                                                                                             str(acc_addr) + ' (' + str(decoder) + ',' + str(port) + ')', str(acc_addr)]])
-                            self.put_packetbyte(packetByte, pos-1,           [Ann.COMMAND,  ['Address', 'Addr.']])
-                        else:
-                            self.put_packetbytes(packetByte, pos-2, pos,     [Ann.ERROR, ['Unknown']])
-                
-                if pom == True:
-                    subcmd = (packetByte[pos][0] & 0b00011111)
-                    if (subcmd >> 2) & 0b11 in [0b01, 0b11, 0b10]:
-                        if (subcmd >> 2) & 0b11 == 0b01:
-                            output_long  = 'Read/Verify byte'
-                            output_short = 'r/v'
-                        elif (subcmd >> 2) & 0b11 == 0b11:
-                            output_long  = 'Write byte'
-                            output_short = 'w'
-                        else:    
-                            output_long  = 'Bit manipulation'
-                            output_short = 'Bit'
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        cv_addr = (packetByte[pos-1][0] & 0b00000011)*256 + packetByte[pos][0] + 1
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA_CV, [str(cv_addr)]])
-                        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['CV']])
-                        pos, error = self.incPos(pos, packetByte)
-                        if error == True: return
-                        if (subcmd >> 2) & 0b11 != 0b10:
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [str(packetByte[pos][0])]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Value']])
-                        else:    
-                            if packetByte[pos][0] & 0b10000 == 0b10000:
-                                output_long  = 'Write, '
-                                output_short = 'w,'
-                            else:
-                                output_long  = 'Verify, '
-                                output_short = 'v,'
-                            output_long  += str(packetByte[pos][0] & 0b00000111)
-                            output_short += str(packetByte[pos][0] & 0b00000111)
-                            if packetByte[pos][0] & 0b1000 == 0b1000:
-                                output_long  = output_long  + ', 1'
-                                output_short = output_short + ',1'
-                            else:
-                                output_long  = output_long  + ', 0'
-                                output_short = output_short + ',0'
-                            self.put_packetbyte(packetByte, pos, [Ann.DATA,    [output_long, output_short]])
-                            self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Operation, Position, Value', 'Op.,Pos,Value', 'O,P,V']])
+                    self.put_packetbytes(packetByte, pos-2, pos,     [Ann.ERROR, ['Unknown']])
+
+        else:
+            ##[RCN-213 2.3]
+            if len(packetByte) == 4:
+                self.put_packetbyte(packetByte, pos-1, [Ann.COMMAND, ['Extended Accessory Decoder Control Packet', 'Extended Accessory', 'Ext. Acc.']])
+                pos = self.nextPos(pos, packetByte)
+                info.instruction = 'accessory'
+                info.value       = packetByte.data[pos]
+                if acc_addr+3 == 2047:
+                    ##[RCN-213 2.4]
+                    if packetByte.data[pos] == 0:
+                        self.put_packetbyte(packetByte, pos-1,       [Ann.DATA_ACC, ['Broadcast']])
+                        self.put_packetbyte(packetByte, pos-1,       [Ann.COMMAND,  ['Broadcast']])
+                        self.put_packetbyte(packetByte, pos,         [Ann.DATA,     ['ESTOP']])
+                        info.instruction = 'estop'
                     else:
-                        output_long  = 'Reserved for future use'
-                        output_short = 'Res.'
-                        self.put_packetbyte(packetByte, pos, [Ann.DATA, [output_long, output_short]])
-                
-                
-            elif 232 <= idPacket <= 254:
-                ##[RCN-211 3] Reserved
-                self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
-            
-            elif idPacket == 255:
-                ##[RCN-211 3] Idle
-                pos, error = self.incPos(pos, packetByte)
-                if error == True: return
-                if packetByte[pos][0] == 0:
-                      ##[RCN-211 4.2] Idle
-                    self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Idle']])
-                else: ##[RCN-211 4.3] System command
-                    validPacketFound = True
-                    self.put_packetbytes(packetByte, pos-1, pos-1, [Ann.COMMAND, ['RailComPlus®']])
-                    if len(packetByte) >= 5 and packetByte[pos+1][0] == 62 and packetByte[pos+2][0] == 7 and packetByte[pos+3][0] == 64:
-                        self.put_packetbytes(packetByte, pos, len(packetByte)-2, [Ann.COMMAND, ['System command (not documented) (IDNotify?)', 'System command']])
+                        self.put_packetbyte(packetByte, pos-1,       [Ann.DATA,  [hex(packetByte.data[pos-1]) + '/' + str(packetByte.data[pos-1])]])
+                        self.put_packetbyte(packetByte, pos,         [Ann.DATA,  [hex(packetByte.data[pos]) + '/' + str(packetByte.data[pos])]])
+                        self.put_packetbytes(packetByte, pos-1, pos, [Ann.ERROR, ['Unknown']])
+                else:
+                    self.put_packetbytes(packetByte, pos-2, pos-1,   [Ann.DATA_ACC, self.accessoryText(acc_addr, decoder, port)])
+                    self.put_packetbyte(packetByte, pos,             [Ann.DATA, ['Aspect:' + hex(packetByte.data[pos]) + '/' + str(packetByte.data[pos])]])
+                    if packetByte.data[pos] & 0b01111111 == 0b01111111:
+                        output_1 = 'on'
+                    elif packetByte.data[pos] & 0b01111111 == 0b00000000:
+                        output_1 = 'off'
                     else:
-                        self.put_packetbytes(packetByte, pos, len(packetByte)-2, [Ann.COMMAND, ['System command (not documented)', 'System command']])
-                    pos = -1
+                        output_1 = str(packetByte.data[pos] & 0b01111111)
+                    self.put_packetbyte(packetByte, pos,             [Ann.COMMAND, ['Switching time:' + output_1 + ', output:' + str((packetByte.data[pos] >> 7))]])
+
+            elif len(packetByte) == 6:
+                pos = self.nextPos(pos, packetByte)
+                if packetByte.data[pos] >> 4 == 0b1110:
+                    ##[RCN-217 6.2]
+                    pom = True
+                    self.put_packetbyte(packetByte, pos-2,           [Ann.COMMAND,  ['POM for Extended Accessory Decoder', 'POM Extended Accessory', 'POM Extended Acc.']])
+                    self.put_packetbyte(packetByte, pos-1,           [Ann.DATA_ACC, self.accessoryText(acc_addr, decoder, port)])
+                    self.put_packetbyte(packetByte, pos-1,           [Ann.COMMAND,  ['Address', 'Addr.']])
+                else:
+                    self.put_packetbytes(packetByte, pos-2, pos,     [Ann.ERROR, ['Unknown']])
+
+        if pom == True:
+            pos = self.handlePom(packetByte, pos, info)
+        return pos
+
+    def handleReservedAddress(self, packetByte, pos, info):
+        ##[RCN-211 3] Reserved
+        info.addrType = 'reserved'
+        self.put_packetbyte(packetByte, pos, [Ann.COMMAND, ['Reserved']])
+        return pos
+
+    def handleIdle(self, packetByte, pos, info):
+        ##[RCN-211 3] Idle
+        info.addrType = 'idle'
+        pos = self.nextPos(pos, packetByte)
+        if packetByte.data[pos] == 0:
+              ##[RCN-211 4.2] Idle
+            info.instruction = 'idle'
+            self.put_packetbytes(packetByte, pos-1, pos, [Ann.COMMAND, ['Idle']])
+        else: ##[RCN-211 4.3] System command
+            info.instruction = 'system_command'
+            info.valid = True
+            self.put_packetbytes(packetByte, pos-1, pos-1, [Ann.COMMAND, ['RailComPlus®']])
+            if len(packetByte) >= 5 and packetByte.data[pos+1] == 62 and packetByte.data[pos+2] == 7 and packetByte.data[pos+3] == 64:
+                self.put_packetbytes(packetByte, pos, len(packetByte)-2, [Ann.COMMAND, ['System command (not documented) (IDNotify?)', 'System command']])
+            else:
+                self.put_packetbytes(packetByte, pos, len(packetByte)-2, [Ann.COMMAND, ['System command (not documented)', 'System command']])
+            pos = -1
+        return pos
+
+    def handleDecodedBytes(self, packetByte):
+        info = PacketInfo()
+        if self.byteAnn == True:
+            self.interpretPacket(packetByte, info)
+        else:
+            self.putPacketSummary(packetByte, info)
+        self.putPacket(packetByte, info)
+
+    def putPacketSummary(self, packetByte, info):
+        #Level 'packets': interpret the packet and put its annotations as one summary
+        self.recordedAnn = []
+        try:
+            self.interpretPacket(packetByte, info)
+            annotations = self.recordedAnn
+        finally:
+            self.recordedAnn = None
+        for start, end, data in self.packetSummary(packetByte, annotations):
+            self.put(packetByte.bitPos[start*9], packetByte.bitPos[end*9+8], self.out_ann, data)
+
+    def putLatency(self, packetByte, stop):
+        #Live mode: keep the packet in recentPackets and put the decode latency
+        start = packetByte.bitPos[0]
+        self.recentPackets.append((start, stop, bytes(packetByte.data)))
+        offset = time.monotonic() - stop/self.samplerate
+        if self.latencyOffset is None or offset < self.latencyOffset:
+            self.latencyOffset = offset
+        latency = offset - self.latencyOffset
+        if latency > self.latencyMax:
+            self.latencyMax = latency
+        self.put(start, stop, self.out_meta, latency)
+
+    def packetSummary(self, packetByte, annotations):
+        #Annotation level 'packets': the texts of the packet in one annotation, errors and search results
+        texts   = [data[1] for start, end, data in annotations
+                   if data[0] in (Ann.DATA_DEC, Ann.DATA_ACC, Ann.DATA_CV, Ann.COMMAND, Ann.DATA)]
+        summary = []
+        if texts:
+            summary.append((0, len(packetByte)-1, [Ann.COMMAND, [', '.join(t[0] for t in texts), ', '.join(t[-1] for t in texts)]]))
+        for start, end, data in annotations:
+            if data[0] in (Ann.ERROR, Ann.SEARCH_ACC, Ann.SEARCH_DEC, Ann.SEARCH_CV, Ann.SEARCH_BYTE):
+                summary.append((start, end, data))
+        return summary
+
+    def putPacket(self, packetByte, info):
+        #OUTPUT_PYTHON and OUTPUT_BINARY record of a packet
+        start    = packetByte.bitPos[0]
+        end      = packetByte.bitPos[len(packetByte)*9-1]
+        raw      = bytes(packetByte.data)
+        checksum = 0
+        for value in raw:
+            checksum ^= value
+        if info.dec_addr >= 0:
+            address = info.dec_addr
+        elif info.acc_addr >= 0:
+            address = info.acc_addr
+        else:
+            address = None
+        checksumOk = len(raw) >= 2 and checksum == 0
+        self.lastAddress = (info.addrType, address)
+        if self.repairedPacket == True:
+            self.repairedPacket = False
+            if checksumOk == True:
+                self.recoveredPackets += 1
+        if self.skew is not None:
+            self.skew.packet(self.line, start, raw)
+        self.put(start, end, self.out_python, ['PACKET', {'bytes': raw,
+                                                          'addr_type': info.addrType,
+                                                          'address': address,
+                                                          'instruction': info.instruction,
+                                                          'cv': info.cv_addr if info.cv_addr >= 0 else None,
+                                                          'value': info.value,
+                                                          'checksum': checksumOk}])
+        if len(raw) < 255:
+            header = struct.pack('<QQB', start, end, len(raw))
+        else:
+            header = struct.pack('<QQBI', start, end, 255, len(raw))  #packet without end bit
+        self.put(start, end, self.out_binary, [0, header + raw])
+        if self.stats is not None:
+            self.stats.packet(start, end, info, raw, checksumOk)
+            interval = self.options['Statistics_interval']*self.samplerate
+            if interval > 0 and end - self.statsStart >= interval:
+                self.putStatistics(end)
+        if self.sequences is not None:
+            for operation in self.sequences.packet(start, end, info, raw, checksumOk):
+                self.putOperation(operation)
+
+    def putStatistics(self, end, final=False):
+        #Summary annotation of the traffic statistics so far, at the end also the report on OUTPUT_PYTHON
+        self.putx(self.statsStart, end, [Ann.STATISTICS, list(self.stats.summary(self.resyncCount))])
+        self.statsStart = end
+        if final == True:
+            self.put(0, end, self.out_python, ['STATISTICS', self.stats.report(self.resyncCount, end)])
+
+    def putOperation(self, operation):
+        #Completed programming operation (annotation and OUTPUT_PYTHON record)
+        self.putx(operation.start, operation.end, [Ann.OPERATION, list(operation.texts())])
+        self.put(operation.start, operation.end, self.out_python, ['OPERATION', operation.record()])
+
+    def putChannel(self, line, start, end, outputType, data):
+        #Output of the ChannelDecoder of data line D<line>: packet summaries, errors and the PACKET records
+        if outputType == srd.OUTPUT_ANN:
+            if data[0] == Ann.ERROR:
+                self.putx(start, end, [Ann.CHANNELS + 3*line - 2, data[1]])
+            elif data[0] in (Ann.COMMAND, Ann.SEARCH_ACC, Ann.SEARCH_DEC, Ann.SEARCH_CV, Ann.SEARCH_BYTE):
+                self.putx(start, end, [Ann.CHANNELS + 3*line - 3, data[1]])
+        elif outputType == srd.OUTPUT_PYTHON and data[0] == 'PACKET':
+            self.put(start, end, self.out_python, ['PACKET', dict(data[1], line=line)])
+
+    def waitRailcom(self, cond):
+        #wait() for an edge of the data line (cond), the edges of the RailCom channel in between are collected
+        conds = self.railcomConds
+        if conds is None or conds[0] is not cond:
+            conds = self.railcomConds = [cond, {1: 'e'}]  #same list for the same cond: wait() parses it once
+        while True:
+            pins = self.wait(conds)
+            if self.matched[1]:
+                self.addRailcomEdge(self.samplenum, pins[1])
+            if self.matched[0]:
+                return pins
+
+    def addRailcomEdge(self, samplenum, level):
+        #Live mode: railcomEdges is bounded, the oldest edge is dropped when it is full (data line idle)
+        edges = self.railcomEdges
+        if len(edges) == edges.maxlen:
+            self.railcomLevel = edges.popleft()[1]
+        edges.append((samplenum, level))
+
+    def dropRailcomEdges(self, samplenum):
+        while self.railcomEdges and self.railcomEdges[0][0] < samplenum:
+            self.railcomLevel = self.railcomEdges.popleft()[1]
+
+    def putRailcom(self, start, end):
+        ##[RCN-217 2.4] answers of the decoders in the cutout, start: end of the packet end bit
+        bit      = self.samplerate / railcom.BAUDRATE
+        ch2Start = start + railcom.CH2_START*self.samplerate/1000000
+        channels = ([], [])
+        for byteStart, byteEnd, byte, stopOk in railcom.uart_bytes(list(self.railcomEdges), self.railcomLevel, start, end, bit):
+            symbol = railcom.DECODE[byte]
+            if symbol is None:
+                self.putx(byteStart, byteEnd, [Ann.RAILCOM_BYTE, ['{:#04x}'.format(byte) + ': invalid 4/8 code', '{:#04x}'.format(byte) + ': ?']])
+                self.putx(byteStart, byteEnd, [Ann.ERROR,        ['RailCom: invalid 4/8 code', 'Invalid']])
+            else:
+                text = railcom.SYMBOL_NAMES.get(symbol, str(symbol))
+                self.putx(byteStart, byteEnd, [Ann.RAILCOM_BYTE, ['{:#04x}'.format(byte) + ': ' + text, text]])
+            if stopOk == False:
+                self.putx(byteStart, byteEnd, [Ann.ERROR, ['RailCom: stop bit missing', 'Stop bit']])
+            channels[1 if byteStart >= ch2Start else 0].append((byteStart, byteEnd, byte, symbol))
+
+        addrType, address = self.lastAddress
+        if address is not None:
+            addressText = addrType + ' ' + str(address)
+        else:
+            addressText = str(addrType)
+        for channel, data in enumerate(channels, 1):
+            if not data:
+                continue
+            messages = railcom.datagrams([d[3] for d in data])
+            texts    = ', '.join(railcom.datagram_text(*m) for m in messages)
+            self.putx(data[0][0], data[-1][1], [Ann.RAILCOM_CH1 + channel - 1,
+                      ['Channel ' + str(channel) + ' (' + addressText + '): ' + texts, 'Ch' + str(channel) + ': ' + texts]])
+            self.put(data[0][0], data[-1][1], self.out_python, ['RAILCOM', {'channel': channel,
+                                                                            'bytes': bytes(d[2] for d in data),
+                                                                            'addr_type': addrType,
+                                                                            'address': address,
+                                                                            'datagrams': messages}])
+
+    def interpretPacket(self, packetByte, info):
+        if len(packetByte) < 3:
+            self.put_packetbytes(packetByte, 0, len(packetByte)-1, [Ann.ERROR, ['Paket too short: ' + str(len(packetByte)) + ' Byte only']])
+            return
+
+        idPacket = packetByte.data[0]
+        try:
+            pos = self.addressTable[idPacket](packetByte, 0, info)
+        except ByteMissing:
+            return
 
         ## remaining bytes in packet
         if pos == -1:  #Railcomplus
             pos = 0
         elif pos == 0: #nothing valid found
             pos -= 1
-            
+
         for x in range(pos+1, len(packetByte)-1):
-            output_1  = '?:' + hex(packetByte[x][0]) + '/' + str(packetByte[x][0])
+            output_1  = '?:' + hex(packetByte.data[x]) + '/' + str(packetByte.data[x])
             self.put_packetbyte(packetByte, x,         [Ann.DATA, [output_1]])
-            if validPacketFound == False:
+            if info.valid == False:
                 self.put_packetbyte(packetByte, x,     [Ann.COMMAND, [output_1]])
                 if self.serviceMode == False and 112 <= idPacket <= 127:
                     self.put_packetbyte(packetByte, x, [Ann.ERROR, ['Unknown (maybe service mode packet)', 'Unknown']])
@@ -1131,62 +1525,73 @@ class Decoder(srd.Decoder):
                 else:
                     self.put_packetbyte(packetByte, x, [Ann.ERROR, ['Unknown']])
 
-
         ##################
         ##[RCN-211 2] Checksum
         if pos+1 < len(packetByte):
             output_1 = ''
-            checksum = packetByte[0][0]
+            checksum = packetByte.data[0]
             for x in range(1, len(packetByte)-1):
-                checksum = checksum ^ packetByte[x][0]
-            if checksum == packetByte[len(packetByte)-1][0]:
+                checksum = checksum ^ packetByte.data[x]
+            if checksum == packetByte.data[len(packetByte)-1]:
                 output_1 = 'OK'
                 self.put_packetbyte(packetByte, len(packetByte)-1,     [Ann.FRAME, ['Checksum: ' + output_1, output_1]])
             else:
-                output_1 = str(checksum) + '<>' + str(packetByte[len(packetByte)-1][0])
+                output_1 = str(checksum) + '<>' + str(packetByte.data[len(packetByte)-1])
                 self.put_packetbytes(packetByte, 0, len(packetByte)-1, [Ann.ERROR, ['Checksum']])
                 self.put_packetbyte(packetByte, len(packetByte)-1,     [Ann.FRAME_OTHER, ['Checksum: ' + output_1, output_1]])
         else:
             self.put_packetbytes(packetByte, 0, len(packetByte)-1,     [Ann.ERROR, ['Checksum missing']])
 
         
+        if self.searchActive == True:
+            self.searchPacket(packetByte, info)
+
+    def searchPacket(self, packetByte, info):
         ##################
         ## Search function
+        dec_addr = info.dec_addr
+        acc_addr = info.acc_addr
+        cv_addr  = info.cv_addr
         ## byte
         byte_found = False
-        for x in range(0, len(packetByte)):
-            if self.byte_search == packetByte[x][0]:
-                byte_found = True
-                if (  (self.dec_addr_search < 0 and self.acc_addr_search < 0 and self.cv_addr_search < 0)
-                    or dec_addr == self.dec_addr_search
-                    or acc_addr == self.acc_addr_search
-                    or cv_addr  == self.cv_addr_search
-                    ): 
-                    self.put_packetbyte(packetByte, x, [Ann.SEARCH_BYTE, ['BYTE:' + hex(self.byte_search) + '/' + str(self.byte_search)]])
+        if self.byte_search:
+            addrSearch = self.dec_addr_search or self.acc_addr_search or self.cv_addr_search
+            for x in range(0, len(packetByte)):
+                value = packetByte.data[x]
+                if value in self.byte_search:
+                    byte_found = True
+                    if (   not addrSearch
+                        or dec_addr in self.dec_addr_search
+                        or acc_addr in self.acc_addr_search
+                        or cv_addr  in self.cv_addr_search
+                        ):
+                        self.put_packetbyte(packetByte, x, [Ann.SEARCH_BYTE, ['BYTE:' + hex(value) + '/' + str(value)]])
         ## dec_addr
-        if  (   self.dec_addr_search == dec_addr
-            and (   self.byte_search < 0
-                 or byte_found       == True)
+        if  (   dec_addr in self.dec_addr_search
+            and (   not self.byte_search
+                 or byte_found == True)
             ):
-            self.put_packetbyte(packetByte, 0, [Ann.SEARCH_DEC, ['DECODER:' + str(self.dec_addr_search)]])
+            self.put_packetbyte(packetByte, 0, [Ann.SEARCH_DEC, ['DECODER:' + str(dec_addr)]])
         ## acc_addr
-        if  (   self.acc_addr_search == acc_addr
-            and (   self.byte_search < 0
-                 or byte_found       == True)
+        if  (   acc_addr in self.acc_addr_search
+            and (   not self.byte_search
+                 or byte_found == True)
             ):
-            self.put_packetbytes(packetByte, 0, len(packetByte)-2, [Ann.SEARCH_ACC, ['ACCESSORY:' + str(self.acc_addr_search)]])
+            self.put_packetbytes(packetByte, 0, len(packetByte)-2, [Ann.SEARCH_ACC, ['ACCESSORY:' + str(acc_addr)]])
         ## cv_addr
-        if  (    self.cv_addr_search == cv_addr
-            and (   self.byte_search < 0
-                 or byte_found       == True)
+        if  (   cv_addr in self.cv_addr_search
+            and (   not self.byte_search
+                 or byte_found == True)
             ):
-            self.put_packetbyte(packetByte, 1, [Ann.SEARCH_CV, ['CV:' + str(self.cv_addr_search)]])
+            self.put_packetbyte(packetByte, 1, [Ann.SEARCH_CV, ['CV:' + str(cv_addr)]])
 
         
     def setNextStatus(self, newstatus):
         self.dccStatus     = newstatus
         self.dccBitCounter = 0
-        self.decodedBytes  = []
+        self.decodedBytes.clear()
+        if newstatus == 'WAITINGFORPREAMBLE':
+            self.repairedPacket = False
 
     def collectDataBytes(self, start, stop, data):
         ##[RCN-211 2]
@@ -1211,18 +1616,23 @@ class Decoder(srd.Decoder):
                     output_long  = 'Preamble: ' + str(self.dccBitCounter+1) + ' bits'
                     output_short = 'Preamble'
                     output_3     = 'P'
-                    self.putx(start, stop,                 [Ann.FRAME, ['Start Packet', 'Start', 'S']]) #Packet Start Bit
+                    if self.bitAnn == True:
+                        self.putx(start, stop,             [Ann.FRAME, ['Start Packet', 'Start', 'S']]) #Packet Start Bit
                     if self.syncSignal == True:
                         self.syncSignal = False
                         output_long  += ' (sync in progress)'
                         output_short += ' (sync)'
                         output_3     += ' (s)'
-                    self.putx(self.dccStart, self.dccLast, [Ann.FRAME, [output_long, output_short, output_3]])
+                    if self.byteAnn == True:
+                        self.putx(self.dccStart, self.dccLast, [Ann.FRAME, [output_long, output_short, output_3]])
+                    if self.bitTiming is not None:
+                        self.bitTiming.preamble(self.dccBitCounter+1)
                     self.setNextStatus('ADDRESSDATABYTE')
                 else:                            #invalid preamble
                     self.setNextStatus('WAITINGFORPREAMBLE')
                     if self.syncSignal == False:
                         self.putx(self.dccStart, self.dccLast, [Ann.ERROR, ['Invalid preamble']])
+                        self.resyncCount += 1
                     self.syncSignal = True       #resynchronize
                     self.put_signal(                       [Ann.FRAME_OTHER, ['Resynchronize (Wait for preamble)', 'Resynchronize','Resync.','R']])
 
@@ -1231,22 +1641,28 @@ class Decoder(srd.Decoder):
             if self.dccBitCounter == 0:          #first bit of new byte
                 self.dccValue  = 0
                 self.dccStart  = start
-                self.dccBitPos = []
             if self.dccBitCounter < 8:           #build byte 
-                self.dccBitPos.append(start)
+                self.decodedBytes.setBit(self.dccBitCounter, start)
                 self.dccBitCounter += 1
                 self.dccValue      = ((self.dccValue) << 1) + int(data);
                 if self.dccBitCounter == 8:      #byte complete
-                    self.dccBitPos.append(stop)
-                    self.decodedBytes.append([self.dccValue, self.dccBitPos])
+                    self.decodedBytes.setBit(8, stop)
+                    self.decodedBytes.data.append(self.dccValue)
+                    if self.liveMode == True and len(self.decodedBytes) > self.maxPacketBytes:
+                        self.putx(self.decodedBytes.bitPos[0], stop, [Ann.ERROR, ['Packet too long (> ' + str(self.maxPacketBytes) + ' bytes), dropped', 'Too long']])
+                        self.setNextStatus('WAITINGFORPREAMBLE')
             else:
                 if data == '0':                  #separator to next byte
                     self.dccBitCounter = 0
                     self.dccValue      = 0
-                    self.putx(start, stop,                 [Ann.FRAME, ['Start Databyte', 'Start', 'S']])
+                    if self.bitAnn == True:
+                        self.putx(start, stop,             [Ann.FRAME, ['Start Databyte', 'Start', 'S']])
                 else:                            #end identifier
-                    self.putx(start, stop,                 [Ann.FRAME, ['Stop Packet', 'Stop', 'S']])
+                    if self.bitAnn == True:
+                        self.putx(start, stop,             [Ann.FRAME, ['Stop Packet', 'Stop', 'S']])
                     self.handleDecodedBytes(self.decodedBytes)
+                    if self.liveMode == True:
+                        self.putLatency(self.decodedBytes, stop)
                     self.setNextStatus('WAITINGFORPREAMBLE')
 
     def decode(self):
@@ -1254,14 +1670,193 @@ class Decoder(srd.Decoder):
             raise SamplerateError('Cannot decode without samplerate.')
         elif (self.samplerate < 25000):
             raise SamplerateError('Minimum samplerate >= 25kHz.')
-        accuracy = 1/self.samplerate*1000000  #µs (accuracy is depending on sample rate, it is about recognizing a packet, not checking the correct timing)
+        lines = [n for n in range(1, 8) if self.has_channel(n + 1)]
+        if lines:
+            self.skew            = ChannelSkew(self.samplerate, lines, int(self.maxChannelSkew*self.samplerate/1000000))
+            self.channelDecoders = [ChannelDecoder(self, n) for n in lines]
+            for line in self.channelDecoders:
+                line.start()
+        self.minPulse = pulse_width(self.minPulseWidth, self.samplerate)
+        if self.profileMode != 'no':
+            self.profiler = Profiler(memory=self.profileMode == 'memory')
+            for line in [self] + self.channelDecoders:
+                line.instrument(self.profiler)
+        if (    self.statisticsOn == False and self.sequencesOn == False and self.bitTimingOn == False and not lines
+            and self.minPulse == 0 and self.resyncLookahead == False and self.profiler is None):
+            self.decodeSignal()
+            return
+        if self.bitTimingOn == True:
+            self.bitTiming = BitTiming(self.samplerate)
+        if self.statisticsOn == True:
+            self.stats = TrafficStatistics(self.samplerate)
+        if self.sequencesOn == True:
+            self.sequences = SequenceDecoder()
+        try:
+            self.decodeSignal()
+        except EOFError:  #end of the capture
+            if self.sequences is not None:
+                for operation in self.sequences.finish():
+                    self.putOperation(operation)
+            if self.stats is not None:
+                self.putStatistics(max(self.samplenum, self.stats.last), final=True)
+            if self.bitTiming is not None:
+                self.putx(0, self.samplenum, [Ann.BIT_TIMING, list(self.bitTiming.summary())])
+                self.put(0, self.samplenum, self.out_python, ['BIT_TIMING', self.bitTiming.report()])
+            if self.skew is not None:
+                for line in lines:
+                    self.putx(0, self.samplenum, [Ann.CHANNELS + 3*line - 1, list(self.skew.summary(line))])
+                self.put(0, self.samplenum, self.out_python, ['CHANNEL_SKEW', {line: self.skew.report(line) for line in lines}])
+            if self.minPulse > 0:
+                removed  = {line.line: line.removedPulses for line in [self] + self.channelDecoders}
+                output_1 = str(sum(removed.values()))
+                self.putx(0, self.samplenum, [Ann.FRAME_OTHER, ['Pre-filter: ' + output_1 + ' pulses < ' + str(self.minPulse) + ' samples removed', 'Removed: ' + output_1]])
+                self.put(0, self.samplenum, self.out_python, ['DEGLITCH', {'min_width': self.minPulse, 'removed': removed}])
+            if self.resyncLookahead == True:
+                lines    = [self] + self.channelDecoders
+                output_1 = str(sum(line.recoveredPackets for line in lines))
+                output_2 = str(sum(line.repairs for line in lines))
+                self.putx(0, self.samplenum, [Ann.FRAME_OTHER, ['Lookahead resync: ' + output_1 + ' packets recovered (' + output_2 + ' repairs)',
+                                                                'Recovered: ' + output_1]])
+                self.put(0, self.samplenum, self.out_python, ['RESYNC', {line.line: {'repairs': line.repairs, 'recovered': line.recoveredPackets}
+                                                                         for line in lines}])
+            if self.profiler is not None:  #last, so that the other outputs are included
+                self.profiler.finish()
+                self.putx(0, self.samplenum, [Ann.FRAME_OTHER, list(self.profiler.summary())])
+                self.put(0, self.samplenum, self.out_python, ['PROFILE', self.profiler.report()])
+                path = self.options['Profile_file'] or os.environ.get('DCC_PROFILE_FILE', '')
+                if path != '':
+                    self.profiler.write(path)
+            raise
 
-        self.wait({0: self.cond1})
-        self.edge_1 = self.samplenum
-        self.wait({0: self.cond2})
-        self.edge_2 = self.samplenum
+    def instrument(self, profiler):
+        #Option Profile: the methods of the stages are replaced by timed wrappers (instance attributes)
+        self.collectDataBytes   = profiler.wrap('collectDataBytes', self.collectDataBytes)
+        self.handleDecodedBytes = profiler.wrap('handleDecodedBytes', self.handleDecodedBytes)
+        self.searchPacket       = profiler.wrap('search', self.searchPacket)
+        if self.line == 0:  #the data lines D1..D7 wait and put through the main decoder
+            annIds    = [a[0] for a in self.annotations]
+            outputs   = {self.out_python: 'python', self.out_binary: 'binary'}
+            self.wait = profiler.wrap('wait', self.wait)
+            self.put  = profiler.wrap('put', self.put,
+                                      lambda start, end, output_id, data: 'put ' + (annIds[data[0]] if output_id == self.out_ann
+                                                                                    else outputs.get(output_id, 'meta')))
 
-        #Info at the start
+    def decodeSignal(self):
+        #Edge scan of the data lines, the bits of every line are decoded by its decodeEdges()
+        self.railcomOn = self.has_channel(1) and self.samplerate >= 1000000
+        lines = [self] + self.channelDecoders
+        batches = getattr(self, 'edge_batches', None)  #headless runtime only
+        if (    batches is not None and len(lines) == 1 and self.railcomOn == False
+            and self.resyncLookahead == False and self.ignoreInterferingPulse != 'yes' and self.liveMode == False
+            and self.profiler is None):
+            self.decodeBatches(batches(self.dataChannel))
+        if len(lines) == 1 and self.minPulse == 0:
+            edges = self.decodeEdges()
+            send  = edges.send
+            if self.profiler is not None:
+                send = self.profiler.wrap('bits', send)
+            wait  = self.waitRailcom if self.railcomOn == True else self.wait
+            cond  = next(edges)
+            while True:
+                wait(cond)
+                cond = send(None)
+
+        #Several data lines or pre-filter: wait for an edge on any of them, each line gets the edges of its condition.
+        #Pre-filter (Min_pulse_width): an edge is held until the next one, both are removed if they are
+        #closer than minPulse (same rule as timing.deglitch_edges())
+        minPulse = self.minPulse
+        pending  = [None] * len(lines)  #held edge (samplenum, level) per line
+        conds = [{line.dataChannel: 'e'} for line in lines]
+        if self.railcomOn == True:
+            conds.append({1: 'e'})
+        scans  = [line.decodeEdges() for line in lines]
+        wanted = [next(scan)[line.dataChannel] for scan, line in zip(scans, lines)]
+        sends  = [scan.send for scan in scans]
+        if self.profiler is not None:
+            sends = [self.profiler.wrap('bits', send) for send in sends]
+        while True:
+            pins    = self.wait(conds)
+            matched = self.matched
+            now     = self.samplenum  #line 0 sets self.samplenum to its (held) edge
+            if self.railcomOn == True and matched[-1]:
+                self.addRailcomEdge(now, pins[1])
+            for i, line in enumerate(lines):
+                if not matched[i]:
+                    continue
+                samplenum, level = now, pins[line.dataChannel]
+                if minPulse > 0:
+                    held = pending[i]
+                    if held is not None and samplenum - held[0] < minPulse:
+                        pending[i] = None
+                        line.removedPulses += 1
+                        line.putx(held[0], samplenum, [Ann.ERROR, ['Short pulse removed', 'Removed']])
+                        continue
+                    pending[i] = (samplenum, level)
+                    if held is None:
+                        continue
+                    samplenum, level = held
+                if wanted[i] == 'e' or (wanted[i] == 'r') == (level == 1):
+                    line.samplenum = samplenum
+                    wanted[i] = sends[i](None)[line.dataChannel]
+            self.samplenum = now
+
+    def decodeBatches(self, batches):
+        #Bits of the data line from the edge lists of the headless runtime (standalone.Decoder.edge_batches()),
+        #each list goes through the pre-filter (deglitch_edges()) and classify_edges(), the bits through putBit()
+        #like in decodeEdges(). Not for RailCom, lookahead resync, short pulse filter and live mode, they need
+        #the edges one by one
+        self.windows = self.timing.windows(self.samplerate)
+        minPulse = self.minPulse
+        edges    = None     #edges from the start of the next bit on
+        rising   = None     #polarity of the first edge (the pre-filter removes edges in pairs)
+        held     = []       #pre-filter: last edge so far, removed if the next one is closer than minPulse
+        pulses   = deque()  #pre-filter: removed pulses (start, end) not annotated yet
+        started  = False
+        for level, batch in batches:
+            if rising is None and batch:
+                rising = level == 0
+            if minPulse > 0 and batch:
+                raw = held + batch
+                batch, removed = deglitch_edges(raw, minPulse, pulses=True)
+                if not isinstance(batch, list):
+                    batch = batch.tolist()
+                held = [batch.pop()] if batch and batch[-1] == raw[-1] else []
+                self.removedPulses += len(removed)
+                pulses.extend(removed)
+            if edges is None:
+                if not batch:
+                    continue
+                edges = batch[1:] if rising != (self.cond1 == 'r') else batch  #first edge of cond1
+            else:
+                edges += batch
+            if started == False and len(edges) >= 2:
+                self.edge_1, self.edge_2 = edges[0], edges[1]
+                self.putRemovedPulses(pulses, self.edge_2)
+                self.putStartInfo()
+                started = True
+            bits = classify_edges(edges, self.samplerate, True, self.timing)
+            if not len(bits):
+                continue
+            for self.edge_1, self.edge_2, self.edge_3, value, strechedZero, phase in bits.rows():
+                if pulses:  #the pulses removed in front of edge_4 (the edge that completes the bit)
+                    self.putRemovedPulses(pulses, edges[bisect_left(edges, self.edge_3) + 1])
+                if phase:
+                    self.changePhase()
+                else:
+                    self.putBit(BIT_VALUES[value], strechedZero)
+            edges = edges[bisect_left(edges, self.edge_1) + (3 if phase else 2):]
+        self.putRemovedPulses(pulses)
+        raise EOFError()
+
+    def putRemovedPulses(self, pulses, before=None):
+        #Pre-filter of decodeBatches(): annotations of the removed pulses that end in front of sample before (None: all)
+        while pulses and (before is None or pulses[0][1] < before):
+            start, end = pulses.popleft()
+            self.putx(start, end, [Ann.ERROR, ['Short pulse removed', 'Removed']])
+
+    def putStartInfo(self):
+        #Info at the start (between the first two edges of the data line)
+        accuracy      = 1/self.samplerate*1000000  #µs (accuracy is depending on sample rate, it is about recognizing a packet, not checking the correct timing)
         output_1      = 'Samplerate: '
         if self.samplerate/1000 < 1000:
             output_1 += '{:.0f}'.format(self.samplerate/1000) + ' kHz'
@@ -1273,18 +1868,146 @@ class Decoder(srd.Decoder):
         else:
             output_1 += '{:.0f}'.format(accuracy*1000) + ' ns'
         self.putx(self.edge_1, self.edge_2, [Ann.FRAME_OTHER, [output_1]])
-        
-        firstChangeCond = True
+        if self.railcomOn == False and self.has_channel(1):
+            self.putx(self.edge_1, self.edge_2, [Ann.ERROR, ['RailCom channel ignored: samplerate < 1 MHz', 'RailCom ignored']])
+
+    def changePhase(self):
+        #Half '0' + half '1' between edge_1 and edge_3 -> adjust edge detection, the next bit starts at edge_4
+        if self.cond1 == 'r':
+            self.cond1 = 'f'  #falling-edge
+            self.cond2 = 'r'  #raising-edge
+        else:
+            self.cond1 = 'r'  #falling-edge
+            self.cond2 = 'f'  #raising-edge
+        if self.firstChangeCond == True:                      #first sync is no error
+            self.firstChangeCond = False
+        else:    
+            self.put_signal([Ann.ERROR,       ['Edge-Detection changed to falling edge - should not occur - dirty signal?']])
+            self.put_signal([Ann.FRAME_OTHER, ['Resynchronize (Wait for preamble)', 'Resynchronize','Resync.','R']])
+            self.resyncCount += 1
+        self.syncSignal   = True                              #resynchronize
+        self.decodedBytes.clear()
+        self.setNextStatus('WAITINGFORPREAMBLE')              #wait for new preamble
+
+    def putBit(self, value, strechedZero):
+        #Bit between edge_1 and edge_3, value '0', '1' or None (unknown timing): bit timing, RailCom cutout,
+        #resync, bits row and byte assembly
+        w             = self.windows
+        unknownTiming = value is None
+        railcomCutout = False
+        output_1      = 'unknown timing' if unknownTiming == True else 'stretched zero?' if strechedZero == True else ''
+
+        if self.bitTiming is not None and unknownTiming == False:
+            self.bitTiming.bit(value, self.edge_2-self.edge_1, self.edge_3-self.edge_2)
+
+        if unknownTiming == True or strechedZero == True:
+            total = (self.edge_3-self.edge_1)/self.samplerate*1000000 #µs
+            part1 = (self.edge_2-self.edge_1)/self.samplerate*1000000 #µs
+            part2 = (self.edge_3-self.edge_2)/self.samplerate*1000000 #µs
+            if strechedZero == True:
+                value_2   = '0 - ({:.0f}'.format(total) + 'µs=' + '{:.0f}'.format(part1) + 'µs+' + '{:.0f}'.format(part2) + 'µs)'
+            else:
+                value     = '{:.0f}'.format(total) + 'µs=' + '{:.0f}'.format(part1) + 'µs+' + '{:.0f}'.format(part2) + 'µs'
+            value_long    = '{:.0f}'.format(total) + 'µs=' + '{:.0f}'.format(part1) + 'µs+' + '{:.0f}'.format(part2) + 'µs'
+            value_short   = '{:.0f}'.format(total) + 'µs'
+
+        ##[RCN-217 2.4]
+        if w.cutoutMin <= self.edge_3-self.edge_1 <= w.cutoutMax:     #454us - 488us (+119+6=next 1-bit)
+            if output_1 == '':
+                output_1 = 'Railcom cutout?'
+            else:
+                output_1 = 'Railcom cutout or ' + output_1
+            railcomCutout = True
+            if self.railcomOn == True:
+                self.putRailcom(self.edge_1, self.edge_3)
+            
+        if unknownTiming == True and railcomCutout == False:      #resynchronize
+            if self.syncSignal == False:
+                self.resyncCount += 1
+            self.syncSignal   = True
+            self.decodedBytes.clear()
+            self.setNextStatus('WAITINGFORPREAMBLE')              #wait for new preamble
+            self.put_signal([Ann.FRAME_OTHER, ['Resynchronize (Wait for preamble)', 'Resynchronize','Resync.','R']])
+            self.put_signal([Ann.ERROR,       [output_1 + ' - should not occur - dirty signal?']])
+        elif output_1 != '':
+            self.put_signal([Ann.FRAME_OTHER, [output_1]])
+                    
+        if self.bitAnn == True:  #Bits row
+            if self.syncSignal == True:
+                if value in ['0', '1']:
+                    if strechedZero == True:
+                        self.put_signal([Ann.BITS_OTHER, [value_2 + ' (sync in progress)', value_2 + ' (sync)', value_2]])
+                    else:
+                        self.put_signal([Ann.BITS,       [value + ' (sync in progress)', value + ' (sync)', value]])
+                else:
+                    self.put_signal(    [Ann.BITS_OTHER, [value + ' (sync in progress)', value_long + ' (sync)', value_short]])
+            else:
+                if value in ['0', '1']:
+                    if strechedZero == True:
+                        self.put_signal([Ann.BITS_OTHER, [value_2, '0 - (' + value_long + ')', '0']])
+                    else:
+                        self.put_signal([Ann.BITS,       [value]])
+                else:
+                    self.put_signal(    [Ann.BITS_OTHER, [value, value_long, value_short]])
+            
+
+        self.collectDataBytes(self.edge_1, self.edge_3, value)
+        if self.railcomOn == True:
+            self.dropRailcomEdges(self.edge_3)
+
+    def decodeEdges(self):
+        #Generator: yields the condition of the next edge of the data line, which is then in self.samplenum
+
+        #Timing windows in samples, widened by the accuracy (computed here, the samplerate may arrive after start())
+        w = self.windows = self.timing.windows(self.samplerate)
+        oneMin,  oneMax,      oneDiff      = w.oneMin,    w.oneMax,      w.oneDiff
+        zeroMin, zeroMax,     zeroLongMax  = w.zeroMin,   w.zeroMax,     w.zeroLongMax
+        phaseMin, phaseMax                 = w.phaseMin,  w.phaseMax
+        stretchedMin, stretchedMax         = w.stretchedMin, w.stretchedMax
+        cutoutMin, cutoutMax               = w.cutoutMin, w.cutoutMax
+        shortPulse                         = w.samples(self.maxInterferingPulseWidth)
+
+        #After the first edge of the expected direction (cond1) the edges alternate, so all
+        #further edges are read with the same condition object, cond1/cond2 only track the phase
+        edge = {self.dataChannel: 'e'}
+
+        #Resync 'lookahead': edges read in advance (or given back after a repair) are taken from ahead first
+        ahead     = deque()
+        lookahead = self.resyncLookahead
+        glitchMax = oneMin // 2  #longest pulse removed as glitch
+
+        def bitValue(e1, e2, e3):
+            #'0', '1' or None of the bit between e1 and e3 (lookahead only, the loop below classifies inline)
+            part1 = e2 - e1
+            part2 = e3 - e2
+            if oneMin <= part1 <= oneMax and oneMin <= part2 <= oneMax and abs(part1-part2) <= oneDiff:
+                return '1'
+            if (   (zeroMin <= part1 <= zeroLongMax and zeroMin <= part2 <= zeroMax)
+                or (zeroMin <= part2 <= zeroLongMax and zeroMin <= part1 <= zeroMax)):
+                return '0'
+            return None
+
+        yield {self.dataChannel: self.cond1}
+        self.edge_1 = self.samplenum
+        yield edge
+        self.edge_2 = self.samplenum
+
+        self.putStartInfo()
+
         while True:
-            output_1       = ''
             unknownTiming  = False
-            railcomCutout  = False
             strechedZero   = False
             
-            self.wait({0: self.cond1})
-            self.edge_3 = self.samplenum
-            self.wait({0: self.cond2})
-            self.edge_4 = self.samplenum  #Look into the future to filter out short pulses (see below)
+            if ahead:
+                self.edge_3 = ahead.popleft()
+            else:
+                yield edge
+                self.edge_3 = self.samplenum
+            if ahead:
+                self.edge_4 = ahead.popleft()
+            else:
+                yield edge
+                self.edge_4 = self.samplenum  #Look into the future to filter out short pulses (see below)
             
             '''
                              ______        ____________              ______
@@ -1295,110 +2018,116 @@ class Decoder(srd.Decoder):
                             |part 1|part 2|   part 1   |   part 2   |part 1|
                             |    total    |          total          |
             '''
-            total = (self.edge_3-self.edge_1)/self.samplerate*1000000 #µs
-            part1 = (self.edge_2-self.edge_1)/self.samplerate*1000000 #µs
-            part2 = (self.edge_3-self.edge_2)/self.samplerate*1000000 #µs
+            total = self.edge_3-self.edge_1 #samples
+            part1 = self.edge_2-self.edge_1 #samples
+            part2 = self.edge_3-self.edge_2 #samples
             
-            ##[RCN-210 5]
-            if (     52-accuracy <= part1 <= 64+accuracy              #'1' part1 = 52us - 64us
-                 and 52-accuracy <= part2 <= 64+accuracy              #'1' part2 = 52us - 64us
-                 and abs(part1-part2) <= max(6, 2*accuracy)           #difference part1/part2 = +/- 6us or 2*accuracy
+            ##[RCN-210 5] (comments: windows of the 'RCN-210 decoder' profile)
+            if (     oneMin <= part1 <= oneMax                        #'1' part1 = 52us - 64us
+                 and oneMin <= part2 <= oneMax                        #'1' part2 = 52us - 64us
+                 and abs(part1-part2) <= oneDiff                      #difference part1/part2 = +/- 6us or 2*accuracy
                 ): 
                 value = '1'
             
-            elif (   (    90-accuracy <= part1 <= 10000+accuracy      #'0' part1 = 90us - 10000us
-                      and 90-accuracy <= part2 <= 119  +accuracy)     #'0' part2 = 90us - 116us
-                  or (    90-accuracy <= part2 <= 10000+accuracy      #'0' part2 = 90us - 10000us
-                      and 90-accuracy <= part1 <= 119  +accuracy)     #'0' part1 = 90us - 116us
+            elif (   (    zeroMin <= part1 <= zeroLongMax             #'0' part1 = 90us - 10000us
+                      and zeroMin <= part2 <= zeroMax)                #'0' part2 = 90us - 119us
+                  or (    zeroMin <= part2 <= zeroLongMax             #'0' part2 = 90us - 10000us
+                      and zeroMin <= part1 <= zeroMax)                #'0' part1 = 90us - 119us
                  ):
                 value = '0'
-                if (2*119)+accuracy <= total <= 12000+accuracy:       #min. 2*half'0'
-                    output_1 = 'stretched zero?'
+                if stretchedMin <= total <= stretchedMax:             #min. 2*half'0'
                     strechedZero = True
             
-            elif 90+52-accuracy <= total <= 64+119+accuracy:          #half '0' + half '1' -> adjust edge detection
-                if self.cond1 == 'r':
-                    self.cond1 = 'f'  #falling-edge
-                    self.cond2 = 'r'  #raising-edge
-                else:
-                    self.cond1 = 'r'  #falling-edge
-                    self.cond2 = 'f'  #raising-edge
-                if firstChangeCond == True:                           #first sync is no error
-                    firstChangeCond = False
-                else:    
-                    self.put_signal([Ann.ERROR,       ['Edge-Detection changed to falling edge - should not occur - dirty signal?']])
-                    self.put_signal([Ann.FRAME_OTHER, ['Resynchronize (Wait for preamble)', 'Resynchronize','Resync.','R']])
-                self.syncSignal   = True                              #resynchronize
-                self.decodedBytes = []
-                self.setNextStatus('WAITINGFORPREAMBLE')              #wait for new preamble
-                self.wait({0: 'e'})                                   #skip one edge
+            elif phaseMin <= total <= phaseMax:                       #half '0' + half '1' -> adjust edge detection
+                if (    lookahead == True and self.dccStatus == 'PREAMBLE'
+                    and bitValue(self.edge_2, self.edge_3, self.edge_4) == '0'):
+                    #Preamble '1' bits read in the wrong phase (they look the same), edge_2 starts the packet start bit:
+                    #keep the preamble and continue in the right phase with edge_2
+                    self.cond1, self.cond2 = self.cond2, self.cond1
+                    if self.firstChangeCond == True:                  #first sync is no error
+                        self.firstChangeCond = False
+                    else:
+                        self.put_signal([Ann.ERROR, ['Edge-Detection changed (lookahead resync, preamble kept)', 'Edge-Detection changed']])
+                    self.repairs        += 1
+                    self.repairedPacket  = True
+                    ahead.appendleft(self.edge_4)
+                    self.edge_1 = self.edge_2
+                    self.edge_2 = self.edge_3
+                    continue
+                self.changePhase()
                 self.edge_1 = self.edge_4
-                self.edge_2 = self.samplenum
+                if ahead:
+                    self.edge_2 = ahead.popleft()
+                else:
+                    yield edge                                   #skip one edge
+                    self.edge_2 = self.samplenum
                 continue
             
             else:
-                output_1      = 'unknown timing'
+                if (    lookahead == True and self.dccStatus in ('PREAMBLE', 'ADDRESSDATABYTE')
+                    and not cutoutMin <= total <= cutoutMax):
+                    #Look for a glitch (pair of edges) whose removal gives this and the next bit a valid timing
+                    while len(ahead) < self.lookaheadEdges - 4:
+                        yield edge
+                        ahead.append(self.samplenum)
+                    seq      = [self.edge_1, self.edge_2, self.edge_3, self.edge_4] + list(ahead)
+                    repaired = False
+                    for i in (1, 2, 3):
+                        if seq[i+1] - seq[i] > glitchMax:
+                            continue
+                        rest = seq[:i] + seq[i+2:]
+                        if bitValue(rest[0], rest[1], rest[2]) is not None and bitValue(rest[2], rest[3], rest[4]) is not None:
+                            self.putx(seq[i], seq[i+1], [Ann.ERROR, ['Glitch removed (lookahead resync)', 'Glitch removed']])
+                            self.repairs        += 1
+                            self.repairedPacket  = True
+                            ahead.clear()
+                            ahead.extend(rest[2:])
+                            self.edge_2 = rest[1]
+                            repaired    = True
+                            break
+                    if repaired == True:
+                        continue
                 unknownTiming = True
 
             #filter out short pulses
             if self.ignoreInterferingPulse == 'yes':
                 output_2 = 'Short pulse ignored'
-                if      (self.edge_4 - self.edge_3)/self.samplerate*1000000 <= self.maxInterferingPulseWidth\
-                    and (self.edge_3 - self.edge_2)/self.samplerate*1000000 <= self.maxInterferingPulseWidth:
+                if      self.edge_4 - self.edge_3 <= shortPulse\
+                    and self.edge_3 - self.edge_2 <= shortPulse:
                     self.edge_2 = int((self.edge_2 + self.edge_4) / 2) #not quite accurate but sufficient enough
                     self.putx(self.edge_2, self.edge_4, [Ann.ERROR, [output_2]])
                     continue
-                elif (self.edge_4 - self.edge_3)/self.samplerate*1000000 <= self.maxInterferingPulseWidth\
+                elif self.edge_4 - self.edge_3 <= shortPulse\
                     and value not in ['0', '1']:
                     self.putx(self.edge_3, self.edge_4, [Ann.ERROR, [output_2]])
                     continue
-                elif (self.edge_3 - self.edge_2)/self.samplerate*1000000 <= self.maxInterferingPulseWidth: 
+                elif self.edge_3 - self.edge_2 <= shortPulse: 
                     self.putx(self.edge_2, self.edge_3, [Ann.ERROR, [output_2]])
                     self.edge_2 = self.edge_4
                     continue
 
-            if unknownTiming == True or strechedZero == True:
-                if strechedZero == True:
-                    value_2   = '0 - ({:.0f}'.format(total) + 'µs=' + '{:.0f}'.format(part1) + 'µs+' + '{:.0f}'.format(part2) + 'µs)'
-                else:
-                    value     = '{:.0f}'.format(total) + 'µs=' + '{:.0f}'.format(part1) + 'µs+' + '{:.0f}'.format(part2) + 'µs'
-                value_long    = '{:.0f}'.format(total) + 'µs=' + '{:.0f}'.format(part1) + 'µs+' + '{:.0f}'.format(part2) + 'µs'
-                value_short   = '{:.0f}'.format(total) + 'µs'
-
-            ##[RCN-217 2.4]
-            if 454-accuracy <= total <= 488+119+6+accuracy:           #454us - 488us (+119+6=next 1-bit)
-                if output_1 == '':
-                    output_1 = 'Railcom cutout?'
-                else:
-                    output_1 = 'Railcom cutout or ' + output_1
-                railcomCutout = True
-            
-            if unknownTiming == True and railcomCutout == False:      #resynchronize
-                self.syncSignal   = True
-                self.decodedBytes = []
-                self.setNextStatus('WAITINGFORPREAMBLE')              #wait for new preamble
-                self.put_signal([Ann.FRAME_OTHER, ['Resynchronize (Wait for preamble)', 'Resynchronize','Resync.','R']])
-                self.put_signal([Ann.ERROR,       [output_1 + ' - should not occur - dirty signal?']])
-            elif output_1 != '':
-                self.put_signal([Ann.FRAME_OTHER, [output_1]])
-                    
-            if self.syncSignal == True:
-                if value in ['0', '1']:
-                    if strechedZero == True:
-                        self.put_signal([Ann.BITS_OTHER, [value_2 + ' (sync in progress)', value_2 + ' (sync)', value_2]])
-                    else:
-                        self.put_signal([Ann.BITS,       [value + ' (sync in progress)', value + ' (sync)', value]])
-                else:
-                    self.put_signal(    [Ann.BITS_OTHER, [value + ' (sync in progress)', value_long + ' (sync)', value_short]])
-            else:
-                if value in ['0', '1']:
-                    if strechedZero == True:
-                        self.put_signal([Ann.BITS_OTHER, [value_2, '0 - (' + value_long + ')', '0']])
-                    else:
-                        self.put_signal([Ann.BITS,       [value]])
-                else:
-                    self.put_signal(    [Ann.BITS_OTHER, [value, value_long, value_short]])
-            
-            self.collectDataBytes(self.edge_1, self.edge_3, value)
+            self.putBit(None if unknownTiming == True else value, strechedZero)
+            if unknownTiming == True:
+                value = None  #not a bit value for the short pulse filter
             self.edge_1 = self.edge_3
             self.edge_2 = self.edge_4
+
+class ChannelDecoder(Decoder):
+    #Decoder of the data line D<line> (annotation level 'packets'), its output goes to the main decoder
+    def __init__(self, parent, line):
+        super().__init__()
+        self.parent      = parent
+        self.line        = line
+        self.dataChannel = line + 1
+        self.samplerate  = parent.samplerate
+        self.options     = dict(parent.options, Annotation_level='packets', Live_mode='no')
+        self.skew        = parent.skew
+
+    def register(self, output_type, proto_id=None, meta=None):
+        return output_type
+
+    def put(self, startsample, endsample, output_id, data):
+        self.parent.putChannel(self.line, startsample, endsample, output_id, data)
+
+    def has_channel(self, index):
+        return False
@@ -0,0 +1,127 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Opt-in profiling of the decoder stages (option 'Profile' or environment
+variable DCC_PROFILE=yes/memory).
+
+Profiler.wrap() replaces a method by a wrapper that counts the calls and
+adds up their time. The time of a stage does not include the stages called
+from it (e.g. the put() calls of collectDataBytes()), so the times of all
+stages add up to the time spent in the decoder. With memory=True the peak
+of the memory allocated during a call is tracked with tracemalloc (slow).
+'''
+
+import json
+import tracemalloc
+from time import perf_counter
+
+class StageStatistics:
+    __slots__ = ('calls', 'time', 'peak')
+
+    def __init__(self):
+        self.calls = 0
+        self.time  = 0.0  #s, without the stages called from this stage
+        self.peak  = 0    #bytes allocated during a call (maximum), memory only
+
+class Profiler:
+    def __init__(self, memory=False):
+        self.stages = {}
+        self.memory = memory
+        self.stack  = [[0.0, 0]]  #per running stage: time of the stages called, memory peak seen before a reset
+        self.start  = perf_counter()
+        self.end    = None
+        self.startedTracing = memory == True and not tracemalloc.is_tracing()  #else the caller traces, finish() keeps it running
+        if self.startedTracing == True:
+            tracemalloc.start()
+
+    def stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageStatistics()
+        return stage
+
+    def wrap(self, name, func, key=None):
+        #func timed as stage name, key(*args) gives the name of the stage per call instead
+        stack  = self.stack
+        memory = self.memory
+        fixed  = self.stage(name) if key is None else None
+
+        def timed(*args):
+            stage = fixed if key is None else self.stage(key(*args))
+            if memory == True:
+                current, peak = tracemalloc.get_traced_memory()
+                stack[-1][1]  = max(stack[-1][1], peak)  #the reset below drops the peak of the caller
+                tracemalloc.reset_peak()
+            else:
+                current = 0
+            frame = [0.0, 0]
+            stack.append(frame)
+            start = perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                stack[-1][0] += elapsed
+                stage.calls  += 1
+                stage.time   += elapsed - frame[0]
+                if memory == True:
+                    peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+                    stage.peak = max(stage.peak, peak - current)
+        return timed
+
+    def finish(self):
+        self.end = perf_counter()
+        if self.memory == True:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            if self.startedTracing == True:
+                tracemalloc.stop()
+
+    def report(self):
+        #Machine readable report (times in s, memory in bytes)
+        total  = (self.end or perf_counter()) - self.start
+        stages = {}
+        for name, stage in sorted(self.stages.items(), key=lambda item: -item[1].time):
+            stages[name] = {'calls': stage.calls, 'time': stage.time,
+                            'share': stage.time / total if total > 0 else 0.0,
+                            'us_per_call': stage.time / stage.calls * 1000000 if stage.calls else 0.0}
+            if self.memory == True:
+                stages[name]['peak_bytes'] = stage.peak
+        result = {'total_time': total, 'stages': stages,
+                  'other_time': total - sum(s.time for s in self.stages.values())}  #driver, unwrapped code
+        if self.memory == True and self.end is not None:
+            result['peak_bytes'] = self.peak
+        return result
+
+    def summary(self, count=5):
+        #Texts of the summary annotation (long, short): the stages with the most time
+        r     = self.report()
+        texts = [name + ' ' + '{:.0f}'.format(s['share']*100) + '% (' + str(s['calls']) + 'x, '
+                 + '{:.1f}'.format(s['us_per_call']) + ' µs)' for name, s in list(r['stages'].items())[:count]]
+        output_short = 'Profile: ' + '{:.2f}'.format(r['total_time']) + ' s'
+        if 'peak_bytes' in r:
+            output_short += ', peak ' + str(r['peak_bytes'] // 1024) + ' KiB'
+        return output_short + ': ' + ', '.join(texts), output_short
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
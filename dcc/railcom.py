@@ -0,0 +1,142 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+RailCom answers of the decoders in the cutout [RCN-217].
+
+The detector output is a UART signal (250 kbaud, 8N1, idle high). Every
+byte carries 6 bits in a 4-of-8 code (4 bits set), decoded with the
+256-entry table DECODE. The symbols of a channel are joined to datagrams
+of a 4 bit ID and 8 to 32 bits of data.
+Times of the channel windows are µs after the end of the packet end bit.
+'''
+
+from bisect import bisect_right
+
+BAUDRATE   = 250000
+CH1_START  = 75    #µs [RCN-217 2.4] channel 1: 80 µs - 177 µs
+CH2_START  = 185   #µs               channel 2: 193 µs - 454 µs
+
+ACK, NACK, BUSY = 64, 65, 66  #symbols besides the 6 bit values
+SYMBOL_NAMES    = {ACK: 'ACK', NACK: 'NACK', BUSY: 'BUSY'}
+
+##[RCN-217 2.6] 4-of-8 code of the values 0 - 63
+ENCODE = (0xac, 0xaa, 0xa9, 0xa5, 0xa3, 0xa6, 0x9c, 0x9a, 0x99, 0x95, 0x93, 0x96, 0x8e, 0x8d, 0x8b, 0xb1,
+          0xb2, 0xb4, 0xb8, 0x74, 0x72, 0x6c, 0x6a, 0x69, 0x65, 0x63, 0x66, 0x5c, 0x5a, 0x59, 0x55, 0x53,
+          0x56, 0x4e, 0x4d, 0x4b, 0x47, 0x71, 0xe8, 0xe4, 0xe2, 0xd1, 0xc9, 0xc5, 0xd8, 0xd4, 0xd2, 0xca,
+          0xc6, 0xcc, 0x78, 0x17, 0x1b, 0x1d, 0x1e, 0x2e, 0x36, 0x3a, 0x27, 0x2b, 0x2d, 0x35, 0x39, 0x33)
+
+def build_decode_table():
+    #byte -> value 0-63, ACK, NACK, BUSY or None (no valid code)
+    table = [None] * 256
+    for value, code in enumerate(ENCODE):
+        table[code] = value
+    table[0x0f] = ACK
+    table[0xf0] = ACK
+    table[0x3c] = NACK
+    table[0xe1] = BUSY
+    return tuple(table)
+
+DECODE = build_decode_table()
+
+##[RCN-217 5] datagrams of multi function decoders: ID -> (name, bits incl. ID)
+DATAGRAMS = {0:  ('POM', 12),
+             1:  ('ADR_HIGH', 12),
+             2:  ('ADR_LOW', 12),
+             3:  ('EXT', 18),
+             7:  ('DYN', 18),
+             8:  ('XPOM', 36),
+             9:  ('XPOM', 36),
+             10: ('XPOM', 36),
+             11: ('XPOM', 36)}
+
+def uart_bytes(edges, level, start, end, bit):
+    '''
+    Bytes of the UART signal between the samples start and end.
+    edges: (samplenum, level) of the transitions in sample order,
+    level: level in front of the first edge, bit: samples per bit.
+    Returns (startsample, endsample, byte, stop bit ok) per byte.
+    '''
+    samples = [e[0] for e in edges]
+
+    def levelAt(samplenum):
+        i = bisect_right(samples, samplenum)
+        return edges[i-1][1] if i > 0 else level
+
+    result = []
+    i = bisect_right(samples, start - 1)
+    while i < len(edges) and edges[i][0] < end:
+        t, value = edges[i]
+        if value != 0 or levelAt(t - 1) != 1:  #start bit: falling edge
+            i += 1
+            continue
+        byte = 0
+        for n in range(8):  #LSB first, sampled in the middle of the bit
+            if levelAt(int(t + (n + 1.5) * bit)):
+                byte |= 1 << n
+        stop = int(t + 9.5 * bit)
+        result.append((t, int(t + 10 * bit), byte, levelAt(stop) == 1))
+        i = bisect_right(samples, stop)
+    return result
+
+def datagrams(symbols):
+    '''
+    Datagrams of the symbols (values of DECODE) of one channel as list of
+    (name, ID, data): ACK/NACK/BUSY with ID and data None, a datagram with
+    an unknown ID or missing symbols ends the list with data None.
+    '''
+    result = []
+    i = 0
+    while i < len(symbols):
+        symbol = symbols[i]
+        if symbol is None:
+            result.append(('invalid', None, None))
+            i += 1
+            continue
+        if symbol in SYMBOL_NAMES:
+            result.append((SYMBOL_NAMES[symbol], None, None))
+            i += 1
+            continue
+        ident = symbol >> 2
+        if ident not in DATAGRAMS:
+            result.append(('ID' + str(ident), ident, None))
+            break
+        name, bits = DATAGRAMS[ident]
+        count      = bits // 6
+        part       = symbols[i:i+count]
+        if len(part) < count or any(s is None or s > 63 for s in part):
+            result.append((name, ident, None))
+            break
+        data = 0
+        for s in part:
+            data = (data << 6) | s
+        result.append((name, ident, data & ((1 << (bits - 4)) - 1)))
+        i += count
+    return result
+
+def datagram_text(name, ident, data):
+    if data is None:
+        return name if ident is None else name + ' ?'
+    if name == 'XPOM':
+        return 'XPOM' + str(ident - 8) + ' ' + ' '.join(str((data >> s) & 0xff) for s in (24, 16, 8, 0))
+    if name in ('ADR_HIGH', 'ADR_LOW', 'POM'):
+        return name + ' ' + str(data)
+    return name + ' ' + hex(data)
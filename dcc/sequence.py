@@ -0,0 +1,238 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Programming operations reconstructed from the decoded packet stream.
+
+A command station repeats every programming packet several times
+([RCN-216 3]: reset packets, 5 or more identical write/verify packets,
+recovery with reset or write packets; POM packets are repeated until the
+RailCom answer is received). The repetitions of one packet are combined to
+one operation:
+
+- write followed by a verify of the same CV and value: 'CV29 := 6, verified'
+- service mode bit verifies of one CV (reading bit by bit), usually
+  followed by the verify of the byte read: 'CV29 read: 6'
+- register mode (page preset, write/verify of a register)
+- POM/XPOM write, read and bit operations of one decoder
+
+The state is the running operation and a completed write that may still be
+verified.
+'''
+
+SERVICE = ('service_write', 'service_verify', 'service_bit', 'register_mode')
+POM     = ('pom_write', 'pom_verify', 'pom_bit', 'xpom_write', 'xpom_read', 'xpom_bit')
+WRITE   = ('service_write', 'pom_write', 'xpom_write')
+VERIFY  = ('service_verify', 'pom_verify', 'xpom_read')
+ACC_TYPES = ('accessory', 'extended accessory')
+
+def bitOperation(instruction, value):
+    #'read', 'bit_write' or None (unknown or reserved form of the bit instruction)
+    if value is None:
+        return None
+    if instruction == 'xpom_bit':
+        ##[RCN-217 6.7] 1111DBBB
+        return 'bit_write' if value >> 4 == 0b1111 else None
+    ##[RCN-214 2] 111KDBBB: K = 1 write, K = 0 verify (reading bit by bit)
+    if value >> 5 != 0b111:
+        return None
+    return 'bit_write' if value & 0b00010000 else 'read'
+
+class Operation:
+    __slots__ = ('mode', 'addrType', 'address', 'kind', 'cv', 'value', 'register', 'bits',
+                 'start', 'end', 'count', 'verifyCount', 'resets', 'verified', 'keys')
+
+    def __init__(self, start, end, key, info, raw, resets):
+        instruction, self.addrType, self.address, self.cv, value = key
+        self.mode        = 'service' if instruction in SERVICE else 'pom'
+        self.value       = value
+        self.register    = None
+        self.bits        = None   #bit verifies: position -> value
+        self.start       = start
+        self.end         = end
+        self.count       = 1      #packets of the operation (without verifies of a write)
+        self.verifyCount = 0
+        self.resets      = resets if self.mode == 'service' else 0  #reset packets in front of the operation
+        self.verified    = False
+        self.keys        = {key}  #packets belonging to the operation
+        if instruction in WRITE:
+            self.kind = 'write'
+        elif instruction in VERIFY:
+            self.kind = 'verify'
+            if self.mode == 'pom':  #the decoder answers with RailCom
+                self.value = None
+        elif instruction == 'register_mode':
+            ##[RCN-214 5] 0111CRRR: C = write, RRR = register - 1
+            self.register = (raw[0] & 0b111) + 1
+            if raw[0] == 0b01111101 and value == 1:
+                self.kind = 'page_preset'
+            else:
+                self.kind = 'register_write' if raw[0] & 0b1000 else 'register_verify'
+        else:
+            self.kind = bitOperation(instruction, value) or 'bit_unknown'
+            if self.kind == 'read':
+                self.value = None
+                self.bits  = {value & 0b111: (value >> 3) & 1}
+
+    def record(self):
+        #OUTPUT_PYTHON record
+        return {'mode': self.mode, 'operation': self.kind, 'addr_type': self.addrType, 'address': self.address,
+                'cv': self.cv, 'register': self.register, 'value': self.value, 'verified': self.verified,
+                'packets': self.count, 'verify_packets': self.verifyCount, 'resets': self.resets}
+
+    def texts(self):
+        #Texts of the annotation (long, short)
+        if self.kind == 'write':
+            short = 'CV' + str(self.cv) + ' := ' + str(self.value)
+            if self.verified == True:
+                short += ', verified'
+        elif self.kind == 'verify':
+            if self.mode == 'service':
+                short = 'CV' + str(self.cv) + ' = ' + str(self.value) + '?'
+            else:
+                short = 'CV' + str(self.cv) + ' read'
+        elif self.kind == 'read':
+            if self.value is not None:
+                short = 'CV' + str(self.cv) + ' read: ' + str(self.value)
+            else:
+                short = 'CV' + str(self.cv) + ' read bits ' + ','.join(str(b) for b in sorted(self.bits))
+        elif self.kind == 'bit_write' and self.value is not None:
+            short = 'CV' + str(self.cv) + ' bit ' + str(self.value & 0b111) + ' := ' + str((self.value >> 3) & 1)
+        elif self.kind in ('bit_write', 'bit_unknown'):
+            short = 'CV' + str(self.cv) + ' bit instruction ' + (str(self.value) if self.value is not None else '?')
+        elif self.kind == 'page_preset':
+            short = 'Page preset'
+        elif self.kind == 'register_write':
+            short = 'Register ' + str(self.register) + ' := ' + str(self.value)
+        else:
+            short = 'Register ' + str(self.register) + ' = ' + str(self.value) + '?'
+
+        if self.mode == 'service':
+            prefix = 'Service mode: '
+        elif self.addrType in ACC_TYPES:
+            prefix = 'POM accessory ' + str(self.address) + ': '
+        else:
+            prefix = 'POM decoder ' + str(self.address) + ': '
+        repeats = str(self.count) + 'x'
+        if self.verifyCount > 0:
+            repeats += ' + ' + str(self.verifyCount) + 'x verify'
+        if self.resets > 0:
+            repeats += ', ' + str(self.resets) + ' resets'
+        return prefix + short + ' (' + repeats + ')', short
+
+class SequenceDecoder:
+    maxGap = 32  #other packets after which the running operation is complete
+
+    def __init__(self):
+        self.current = None   #Operation whose packets are received
+        self.pending = None   #completed write, the next operation may verify it
+        self.gap     = 0      #packets since the last packet of the running operation
+        self.resets  = 0      #reset packets since the last programming packet
+
+    def packet(self, start, end, info, raw, checksumOk):
+        #Returns the operations completed by this packet
+        done = []
+        if checksumOk == False or (info.instruction not in SERVICE and info.instruction not in POM):
+            if checksumOk == True and info.instruction == 'reset' and info.dec_addr == 0:
+                self.resets += 1
+            if self.current is not None or self.pending is not None:
+                self.gap += 1
+                if self.gap > self.maxGap:
+                    self.complete(done)
+                    self.complete(done)
+            return done
+
+        self.gap    = 0
+        resets      = self.resets
+        self.resets = 0
+        if info.dec_addr >= 0:
+            address = info.dec_addr
+        elif info.acc_addr >= 0:
+            address = info.acc_addr
+        else:
+            address = None
+        key = (info.instruction, info.addrType, address, info.cv_addr if info.cv_addr >= 0 else None, info.value)
+        op  = self.current
+        if op is not None and key in op.keys:
+            self.repeat(op, key, end)
+            return done
+        if op is not None and op.kind == 'read' and self.continuesRead(op, key):
+            op.keys.add(key)
+            self.repeat(op, key, end)
+            return done
+
+        self.complete(done)
+        if self.pending is not None and self.verifies(self.pending, key):
+            op = self.current = self.pending
+            self.pending = None
+            op.keys.add(key)
+            self.repeat(op, key, end)
+        else:
+            self.complete(done)
+            self.current = Operation(start, end, key, info, raw, resets)
+        return done
+
+    def repeat(self, op, key, end):
+        op.end = end
+        if op.kind in ('write', 'read') and key[0] in VERIFY:
+            op.verified     = True
+            op.verifyCount += 1
+            if op.kind == 'read':
+                op.value = key[4]
+        else:
+            op.count += 1
+
+    def continuesRead(self, op, key):
+        #another bit verify or the verify of the byte read, same decoder and CV
+        instruction, addrType, address, cv, value = key
+        if (addrType, address, cv) != (op.addrType, op.address, op.cv) or op.verified == True:
+            return False
+        if instruction in ('service_bit', 'pom_bit') and bitOperation(instruction, value) == 'read':
+            op.bits[value & 0b111] = (value >> 3) & 1
+            return True
+        return instruction in ('service_verify', 'pom_verify')
+
+    def verifies(self, op, key):
+        instruction, addrType, address, cv, value = key
+        return (instruction in VERIFY and (addrType, address, cv) == (op.addrType, op.address, op.cv)
+                and (value == op.value or instruction != 'service_verify'))
+
+    def complete(self, done):
+        #Running operation complete: a write waits for its verify, everything else is done.
+        #Called a second time the waiting write is done as well.
+        op = self.current
+        self.current = None
+        if op is None:
+            op = self.pending
+            self.pending = None
+        elif op.kind == 'write' and op.verified == False:
+            self.complete(done)
+            self.pending = op
+            return
+        if op is not None:
+            done.append(op)
+
+    def finish(self):
+        #End of the capture: remaining operations
+        done = []
+        self.complete(done)
+        self.complete(done)
+        return done
@@ -0,0 +1,333 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Streaming reader for sigrok session files (*.sr).
+
+A .sr file is a zip archive with a 'metadata' ini file and the logic data in
+chunks 'logic-1-1', 'logic-1-2', ... (older files: a single 'logic-1').
+The chunks are read one after the other and reduced to transitions
+(samplenum, value) of the selected channels, so memory does not grow with
+the length of the capture.
+
+Analog channels ('analog-1-<channel>-1', ... float32, e.g. the track
+voltage through a differential probe) are turned into a logic level with
+the hysteresis thresholds (low, high) chunk by chunk: a sample >= high sets
+the level to 1, a sample <= low to 0, samples in between keep the level.
+An analog probe has the bit 8*unitsize + channel number in the transition
+values, so it can be selected like a logic probe ('-C data=A0').
+'''
+
+import configparser
+import heapq
+import re
+import sys
+import zipfile
+from array import array
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class SrFileError(Exception):
+    pass
+
+_units = {'hz': 1, 'khz': 1000, 'mhz': 1000000, 'ghz': 1000000000}
+_runs  = re.compile(rb'(.)\1*', re.S)  #runs of identical bytes
+
+DEFAULT_THRESHOLDS = (-1.0, 1.0)  #V, hysteresis of analog channels
+EDGE_BATCH         = 1 << 16      #edges per list of iter_edges() without NumPy
+
+def parse_samplerate(text):
+    #'50 kHz', '1 MHz', '100000' -> samples per second
+    m = re.match(r'\s*([0-9.]+)\s*([a-zA-Z]*)\s*$', text)
+    if m is None or m.group(2).lower() not in _units and m.group(2) != '':
+        raise SrFileError('Invalid samplerate: ' + text)
+    return int(float(m.group(1)) * _units.get(m.group(2).lower(), 1))
+
+def parse_thresholds(text):
+    #'-1,1' or '0.8,2.0' -> (low, high) in V
+    try:
+        low, high = (float(t) for t in text.split(','))
+    except ValueError:
+        raise SrFileError('Invalid thresholds (expected low,high): ' + text)
+    if low >= high:
+        raise SrFileError('Invalid thresholds (low must be below high): ' + text)
+    return low, high
+
+def hysteresis(values, low, high, level):
+    '''
+    Logic levels of the analog samples values (array of floats) with the
+    thresholds low < high. level: level in front of the first sample, None
+    if unknown (then the first sample decides against the middle of the
+    thresholds). Returns the changes as list of (position, level) and the
+    level after the last sample.
+    '''
+    if len(values) == 0:
+        return [], level
+    if level is None:
+        level = 1 if values[0] >= (low + high) / 2 else 0
+        changes = [(0, level)]
+    else:
+        changes = []
+    if np is not None:
+        v = np.asarray(values)
+        decided = np.flatnonzero((v >= high) | (v <= low))  #samples outside the hysteresis band
+        if len(decided) == 0:
+            return changes, level
+        levels = (v[decided] >= high).astype(np.int8)
+        idx    = np.flatnonzero(levels != np.concatenate(([level], levels[:-1])))
+        changes.extend(zip(decided[idx].tolist(), levels[idx].tolist()))
+        return changes, int(levels[-1])
+    for pos, value in enumerate(values):
+        if value >= high:
+            if level == 0:
+                changes.append((pos, 1))
+                level = 1
+        elif value <= low:
+            if level == 1:
+                changes.append((pos, 0))
+                level = 0
+    return changes, level
+
+class SrFile:
+    def __init__(self, path, thresholds=DEFAULT_THRESHOLDS):
+        self.path = path
+        self.thresholds = thresholds
+        self.zip  = zipfile.ZipFile(path)
+        try:
+            metadata = self.zip.read('metadata').decode('utf-8')
+        except KeyError:
+            raise SrFileError(path + ': no metadata, not a sigrok session file')
+        config = configparser.ConfigParser(interpolation=None)
+        config.read_string(metadata)
+        if not config.has_section('device 1'):
+            raise SrFileError(path + ': no device in metadata')
+        device = config['device 1']
+
+        self.samplerate  = parse_samplerate(device.get('samplerate', '0'))
+        self.unitsize    = int(device.get('unitsize', '1'))
+        self.capturefile = device.get('capturefile', 'logic-1')
+        #probe names, index = bit position within a sample
+        self.probes = {}
+        self.analog = {}  #analog probe names -> channel number
+        for key, value in device.items():
+            if key.startswith('probe') and key[5:].isdigit():
+                self.probes[value] = int(key[5:]) - 1
+            elif key.startswith('analog') and key[6:].isdigit():
+                self.analog[value] = int(key[6:])
+
+        names = self.zip.namelist()
+        prefix = self.capturefile + '-'
+        self.chunks = sorted((n for n in names if n.startswith(prefix) and n[len(prefix):].isdigit()),
+                             key=lambda n: int(n[len(prefix):]))
+        if not self.chunks and self.capturefile in names:
+            self.chunks = [self.capturefile]
+        #analog chunks per channel number
+        self.analogChunks = {}
+        for number in self.analog.values():
+            prefix = 'analog' + self.capturefile[len('logic'):] + '-' + str(number) + '-'
+            self.analogChunks[number] = sorted((n for n in names if n.startswith(prefix) and n[len(prefix):].isdigit()),
+                                               key=lambda n: int(n[len(prefix):]))
+        if self.chunks:
+            self.total = sum(self.zip.getinfo(n).file_size for n in self.chunks) // self.unitsize
+        elif any(self.analogChunks.values()):
+            self.total = max(sum(self.zip.getinfo(n).file_size for n in c) for c in self.analogChunks.values()) // 4
+        else:
+            raise SrFileError(path + ': no logic data')
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def probe_index(self, name):
+        #Bit position of a probe given by name ('D0', analog 'A0') or number
+        if name in self.probes:
+            return self.probes[name]
+        if name in self.analog:
+            return 8*self.unitsize + self.analog[name]
+        try:
+            return int(name)
+        except ValueError:
+            raise SrFileError('Unknown channel: ' + str(name))
+
+    def iter_chunks(self):
+        for name in self.chunks:
+            yield self.zip.read(name)
+
+    def iter_transitions(self, mask, start=0):
+        '''
+        Yield (samplenum, value) with value = sample & mask, first the initial
+        value at sample start, then every sample where the masked value changes.
+        Chunks before start are not read.
+        '''
+        analog = [(1 << (8*self.unitsize + n), n) for n in sorted(self.analog.values()) if mask >> (8*self.unitsize + n) & 1]
+        if not analog:
+            yield from self.iter_logic(mask, start)
+            return
+
+        #merge the transitions of the logic channels and every analog channel
+        streams = [self.iter_analog(n, bit, start) for bit, n in analog]
+        if mask & ((1 << 8*self.unitsize) - 1) and self.chunks:
+            streams.append(self.iter_logic(mask & ((1 << 8*self.unitsize) - 1), start))
+        def tagged(i, stream):
+            for pos, value in stream:
+                yield pos, i, value
+        parts = [0] * len(streams)
+        last  = None
+        samplenum = None
+        for pos, i, value in heapq.merge(*(tagged(i, stream) for i, stream in enumerate(streams))):
+            if pos != samplenum and samplenum is not None and sum(parts) != last:
+                last = sum(parts)
+                yield samplenum, last
+            samplenum = pos
+            parts[i]  = value
+        if samplenum is not None and sum(parts) != last:
+            yield samplenum, sum(parts)
+
+    def iter_analog(self, number, bit, start=0):
+        #Transitions (samplenum, 0 or bit) of analog channel number, see iter_transitions()
+        low, high = self.thresholds
+        level  = None
+        offset = 0
+        for name in self.analogChunks.get(number, ()):
+            count = self.zip.getinfo(name).file_size // 4
+            if offset + count <= start:
+                offset += count
+                continue
+            data = self.zip.read(name)[max(0, start - offset)*4:count*4]
+            offset = max(offset, start)
+            if np is not None:
+                values = np.frombuffer(data, dtype='<f4')
+            else:
+                values = array('f', data)
+                if sys.byteorder == 'big':
+                    values.byteswap()
+            changes, level = hysteresis(values, low, high, level)
+            for pos, value in changes:
+                yield offset + pos, bit if value else 0
+            offset += len(values)
+
+    def iter_logic(self, mask, start=0):
+        #Transitions of the logic channels, see iter_transitions()
+        lane = self._lane(mask)
+        last = None
+        for offset, data in self._logic_data(start):
+            if lane is not None:
+                if self.unitsize > 1:
+                    data = data[lane::self.unitsize]
+                changes = self._changes_bytes(data, (mask >> (8*lane)) & 0xff, 8*lane, last)
+            else:
+                changes = self._changes_wide(data, mask, last)
+            for pos, value in changes:
+                yield offset + pos, value
+                last = value
+
+    def iter_edges(self, mask, start=0):
+        '''
+        Yield (level, edges) for one channel (mask with a single bit): edges
+        holds the sample numbers where the channel changes, after the initial
+        value at sample start (see iter_transitions()), level is the level in
+        front of them. With NumPy a logic channel is read without transition
+        tuples, one array per chunk of the capture.
+        '''
+        lane = self._lane(mask)
+        if np is not None and lane is not None and mask < 1 << 8*self.unitsize:
+            byteMask = (mask >> (8*lane)) & 0xff
+            last     = None
+            for offset, data in self._logic_data(start):
+                high = (np.frombuffer(data, dtype=np.uint8)[lane::self.unitsize] & byteMask) != 0
+                if len(high) == 0:
+                    continue
+                if last is None:
+                    last = bool(high[0])
+                idx = np.flatnonzero(high != np.concatenate(([last], high[:-1])))
+                yield (1 if last else 0), idx + offset
+                last = bool(high[-1])
+            return
+        transitions = self.iter_transitions(mask, start)
+        first = next(transitions, None)
+        if first is None:
+            return
+        level = 1 if first[1] else 0
+        while True:
+            batch = list(islice(transitions, EDGE_BATCH))
+            if not batch:
+                return
+            yield level, [samplenum for samplenum, _ in batch]
+            level = 1 if batch[-1][1] else 0
+
+    def _lane(self, mask):
+        #Byte of the samples that holds all channels of mask, None if they span several bytes
+        lane = None
+        for i in range(self.unitsize):
+            if mask and mask & ~(0xff << (8*i)) == 0:
+                lane = i
+        return lane
+
+    def _logic_data(self, start):
+        #(offset, data) of the logic chunks from sample start on
+        offset = 0
+        for name in self.chunks:
+            count = self.zip.getinfo(name).file_size // self.unitsize
+            if offset + count <= start:
+                offset += count
+                continue
+            data = self.zip.read(name)
+            data = data[max(0, start - offset)*self.unitsize:count*self.unitsize]
+            offset = max(offset, start)
+            yield offset, data
+            offset += len(data) // self.unitsize
+
+    def _changes_bytes(self, data, mask, shift, last):
+        if np is not None:
+            v = np.frombuffer(data, dtype=np.uint8) & mask
+            if len(v) == 0:
+                return []
+            idx = np.flatnonzero(v[1:] != v[:-1]) + 1
+            if last is None or int(v[0]) << shift != last:
+                idx = np.concatenate(([0], idx))
+            return zip(idx.tolist(), (v[idx].astype(np.int64) << shift).tolist())
+        table = bytes(b & mask for b in range(256))
+        changes = []
+        for m in _runs.finditer(data.translate(table)):
+            value = data[m.start()] & mask
+            if value << shift != last:
+                changes.append((m.start(), value << shift))
+                last = value << shift
+        return changes
+
+    def _changes_wide(self, data, mask, last):
+        changes = []
+        size = self.unitsize
+        for pos in range(0, len(data) // size):
+            value = int.from_bytes(data[pos*size:(pos+1)*size], 'little') & mask
+            if value != last:
+                changes.append((pos, value))
+                last = value
+        return changes
@@ -0,0 +1,256 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Minimal runtime for running the decoder without libsigrokdecode.
+
+When 'sigrokdecode' cannot be imported (headless use, 'python -m dcc'),
+this module is registered in its place. It provides the parts of the
+protocol decoder API the DCC decoder uses: register(), put(), wait() with
+pin conditions ('r', 'f', 'e', 'h', 'l') and 'skip', has_channel() and
+the metadata() call for the samplerate.
+The input is a stream of transitions (samplenum, value), where value holds
+the state of all capture channels as bits, as produced by SrFile.
+wait() parses its conditions once per conds object, so the decoder should
+pass the same object while it waits for the same conditions. Edge-only
+conditions ('r', 'f', 'e') take a fast path that skips the transitions of
+other channels in a tight loop.
+edge_batches() is an extension of this runtime (not part of the
+libsigrokdecode API): it hands the decoder all remaining edges of one
+channel in lists, the decoder uses it when it needs no other channel.
+'''
+
+from itertools import chain, islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OUTPUT_ANN, OUTPUT_PYTHON, OUTPUT_BINARY, OUTPUT_META = range(4)
+SRD_CONF_SAMPLERATE = 10000
+MATCHED_FIRST       = (True,)  #matched of a wait() with one condition
+EDGE_BATCH          = 1 << 16  #transitions per edge_batches() list
+
+class Decoder:
+    samplenum = 0
+    matched   = None
+    _conds    = False  #conditions of the last wait() call (compiled in _compile())
+
+    def register(self, output_type, proto_id=None, meta=None):
+        self._outputs.append(output_type)
+        return len(self._outputs) - 1
+
+    def put(self, startsample, endsample, output_id, data):
+        self._sink(startsample, endsample, self._outputs[output_id], data)
+
+    def has_channel(self, index):
+        return index < len(self._masks) and self._masks[index] is not None
+
+    def _pins(self):
+        #Pin tuple of the current state, the tuples are cached per state value
+        pins = self._pinCache.get(self._state)
+        if pins is None:
+            pins = self._pinCache[self._state] = tuple((1 if self._state & m else 0) if m is not None else 0xff
+                                                       for m in self._masks)
+        return pins
+
+    def _compile(self, conds):
+        #Parse the conditions once, wait() reuses the result as long as it gets the same conds object
+        self._conds = conds
+        if conds is None:
+            conds = [{}]
+        elif isinstance(conds, dict):
+            conds = [conds]
+        self._skips    = [cond.get('skip') for cond in conds]
+        self._pinConds = [[(self._masks[ch], c) for ch, c in cond.items() if ch != 'skip'] for cond in conds]
+        #Only edge conditions on one channel each: fast path of wait(), (mask, 'r'/'f'/'e') per condition
+        self._edges = None
+        if all(skip is None and len(pc) == 1 and pc[0][1] in 'rfe' for skip, pc in zip(self._skips, self._pinConds)):
+            self._edges = [pc[0] for pc in self._pinConds]
+            self._edgeMask = 0
+            for m, c in self._edges:
+                self._edgeMask |= m
+
+    def wait(self, conds=None):
+        if conds is not self._conds:
+            self._compile(conds)
+        if self._edges is not None:
+            return self._waitEdges()
+        skips    = self._skips
+        pinConds = self._pinConds
+
+        #'skip' conditions become a target samplenum
+        startSample = self.samplenum
+        skipAt = None
+        for skip in skips:
+            if skip is not None and (skipAt is None or startSample + skip < skipAt):
+                skipAt = startSample + skip
+
+        #level conditions already true match at the next sample
+        matched = [bool(pc) and all(c in 'hl' and (c == 'h') == bool(self._state & m) for m, c in pc) for pc in pinConds]
+        if any(matched) and (skipAt is None or skipAt > self.samplenum + 1) and self.samplenum + 1 < self._total:
+            self.samplenum += 1
+            self.matched = tuple(matched)
+            return self._pins()
+
+        while True:
+            nxt = self._next
+            if skipAt is not None and (nxt is None or skipAt < nxt[0]):
+                if skipAt >= self._total:
+                    raise EOFError()
+                self.samplenum = skipAt
+                self.matched = tuple(skip is not None and startSample + skip == skipAt for skip in skips)
+                return self._pins()
+            if nxt is None:
+                raise EOFError()
+            self._next = next(self._transitions, None)
+            old = self._state
+            self.samplenum, self._state = nxt
+            new = self._state
+            matched = []
+            for skip, pc in zip(skips, pinConds):
+                if skip is not None:
+                    matched.append(startSample + skip == self.samplenum)
+                    continue
+                ok = True
+                for m, c in pc:
+                    o = old & m
+                    n = new & m
+                    if   c == 'r': ok = not o and n
+                    elif c == 'f': ok = o and not n
+                    elif c == 'e': ok = o != n
+                    elif c == 'h': ok = n
+                    elif c == 'l': ok = not n
+                    else:          ok = False
+                    if not ok:
+                        break
+                matched.append(bool(ok))
+            if any(matched):
+                self.matched = tuple(matched)
+                return self._pins()
+
+    def _waitEdges(self):
+        #wait() for edge conditions only: transitions that change none of their channels are skipped in a tight loop
+        edges       = self._edges
+        mask        = self._edgeMask
+        transitions = self._transitions
+        nxt   = self._next
+        state = self._state
+        while True:
+            if nxt is None:
+                self._next  = None
+                self._state = state
+                raise EOFError()
+            samplenum, new = nxt
+            nxt = next(transitions, None)
+            changed = (state ^ new) & mask
+            state   = new
+            if not changed:
+                continue
+            if len(edges) == 1:
+                m, c = edges[0]
+                if c == 'e' or (c == 'r') == bool(new & m):
+                    self.matched = MATCHED_FIRST
+                    break
+                continue
+            matched = tuple(bool(changed & m) and (c == 'e' or (c == 'r') == bool(new & m)) for m, c in edges)
+            if True in matched:
+                self.matched = matched
+                break
+        self._next     = nxt
+        self._state    = state
+        self.samplenum = samplenum
+        return self._pins()
+
+    def edge_batches(self, channel, size=EDGE_BATCH):
+        #Generator: consumes the remaining transitions, yields (level, edges) per up to size transitions, edges is the
+        #list of the sample numbers of the edges of channel, level the state of the channel in front of them.
+        #samplenum follows the last edge, wait() raises EOFError afterwards
+        mask        = self._masks[channel]
+        transitions = self._transitions
+        while self._next is not None:
+            chunk = [self._next]
+            chunk.extend(islice(transitions, size - 1))
+            state      = self._state
+            level      = 1 if state & mask else 0
+            self._next = next(transitions, None)
+            if np is not None:
+                flat  = np.fromiter(chain.from_iterable(chunk), dtype=np.int64, count=2*len(chunk))
+                high  = (flat[1::2] & mask) != 0
+                edges = flat[0::2][high != np.concatenate(([level == 1], high[:-1]))].tolist()
+            else:
+                edges = []
+                for samplenum, new in chunk:
+                    if (state ^ new) & mask:
+                        edges.append(samplenum)
+                    state = new
+            self._state = chunk[-1][1]
+            if edges:
+                self.samplenum = edges[-1]
+            yield level, edges
+
+def channel_list(decoderClass):
+    return list(getattr(decoderClass, 'channels', ())) + list(getattr(decoderClass, 'optional_channels', ()))
+
+def option_values(decoderClass, options=None):
+    #Defaults of the decoder, overridden by options (converted to the type of the default)
+    values = {}
+    for option in getattr(decoderClass, 'options', ()):
+        values[option['id']] = option['default']
+    for key, value in (options or {}).items():
+        if key not in values:
+            raise KeyError('Unknown option: ' + key)
+        default = values[key]
+        if isinstance(default, int) and not isinstance(value, int):
+            value = int(value)
+        elif isinstance(default, float) and not isinstance(value, float):
+            value = float(value)
+        values[key] = value
+    return values
+
+def run(decoder, transitions, samplerate, masks, total, sink, options=None):
+    '''
+    Run decoder (a fresh instance) over transitions. masks holds the bit mask
+    of every decoder channel within the transition values (None if not
+    connected), sink(startsample, endsample, output_type, data) receives
+    everything the decoder puts. Returns the decoder.
+    '''
+    decoder.options      = option_values(type(decoder), options)
+    decoder._outputs     = []
+    decoder._sink        = sink
+    decoder._masks       = list(masks)
+    decoder._total       = total
+    decoder._transitions = iter(transitions)
+    first = next(decoder._transitions, None)
+    decoder._state = first[1] if first is not None else 0
+    decoder._next  = next(decoder._transitions, None)
+    decoder._pinCache = {}
+    decoder._conds    = False
+    decoder.samplenum = 0
+
+    decoder.metadata(SRD_CONF_SAMPLERATE, samplerate)
+    decoder.start()
+    try:
+        decoder.decode()
+    except EOFError:
+        pass
+    return decoder
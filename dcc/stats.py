@@ -0,0 +1,185 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Traffic statistics of the decoded packet stream.
+
+The counters do not grow with the length of the capture: besides a few
+totals there is one entry per decoder/accessory address seen (at most
+10240 + 2048).
+'''
+
+from collections import deque
+
+DEC_TYPES = ('broadcast', 'short', 'long')
+ACC_TYPES = ('accessory', 'extended accessory')
+
+class AddressStatistics:
+    __slots__ = ('packets', 'last', 'intervals', 'intervalSum', 'intervalMax')
+
+    def __init__(self):
+        self.packets     = 0
+        self.last        = None  #start sample of the last packet
+        self.intervals   = 0
+        self.intervalSum = 0
+        self.intervalMax = 0
+
+class TrafficStatistics:
+    def __init__(self, samplerate):
+        self.samplerate    = samplerate
+        self.first         = None  #start sample of the first packet
+        self.last          = 0     #end sample of the last packet
+        self.packets       = 0
+        self.idle          = 0
+        self.checksumError = 0
+        self.payloadBits   = 0     #address, instruction and data bytes (no checksum)
+        self.packetSamples = 0     #length of all packets (without preamble)
+        self.decoders      = {}    #address -> AddressStatistics
+        self.accessories   = {}
+
+    def packet(self, start, end, info, raw, checksumOk):
+        if self.first is None:
+            self.first = start
+        self.last           = end
+        self.packets       += 1
+        self.packetSamples += end - start
+        if len(raw) > 1:
+            self.payloadBits += (len(raw) - 1) * 8
+        if checksumOk == False:
+            self.checksumError += 1
+        if info.addrType == 'idle' and info.instruction == 'idle':
+            self.idle += 1
+        elif info.addrType in DEC_TYPES and info.dec_addr >= 0:
+            self.count(self.decoders, info.dec_addr, start)
+        elif info.addrType in ACC_TYPES and info.acc_addr >= 0:
+            self.count(self.accessories, info.acc_addr, start)
+
+    def count(self, addresses, address, start):
+        entry = addresses.get(address)
+        if entry is None:
+            entry = addresses[address] = AddressStatistics()
+        entry.packets += 1
+        if entry.last is not None:
+            interval = start - entry.last
+            entry.intervals   += 1
+            entry.intervalSum += interval
+            if interval > entry.intervalMax:
+                entry.intervalMax = interval
+        entry.last = start
+
+    def seconds(self, samples):
+        return samples / self.samplerate
+
+    def report(self, resyncs=0, end=None):
+        #Machine readable report (dict of numbers, times in s)
+        if end is None:
+            end = self.last
+        duration = self.seconds(end - (self.first or 0))
+        locos = {}
+        for address, entry in sorted(self.decoders.items()):
+            if address == 0:  #broadcast
+                continue
+            locos[address] = {'packets': entry.packets,
+                              'refresh_mean': self.seconds(entry.intervalSum / entry.intervals) if entry.intervals else None,
+                              'refresh_max': self.seconds(entry.intervalMax) if entry.intervals else None}
+        return {'duration': duration,
+                'packets': self.packets,
+                'idle_packets': self.idle,
+                'idle_ratio': self.idle / self.packets if self.packets else 0.0,
+                'checksum_errors': self.checksumError,
+                'checksum_error_rate': self.checksumError / self.packets if self.packets else 0.0,
+                'resyncs': resyncs,
+                'payload_bits_per_second': self.payloadBits / duration if duration > 0 else 0.0,
+                'bus_utilization': self.seconds(self.packetSamples) / duration if duration > 0 else 0.0,
+                'locos': locos,
+                'accessories': {address: entry.packets for address, entry in sorted(self.accessories.items())},
+                'broadcast_packets': self.decoders[0].packets if 0 in self.decoders else 0}
+
+    def summary(self, resyncs=0):
+        #Texts of the summary annotation (long, short)
+        r = self.report(resyncs)
+        refresh = [l['refresh_max'] for l in r['locos'].values() if l['refresh_max'] is not None]
+        output_long = ('Packets: ' + str(r['packets'])
+                       + ', idle: ' + '{:.0f}'.format(r['idle_ratio']*100) + '%'
+                       + ', checksum errors: ' + '{:.2f}'.format(r['checksum_error_rate']*100) + '%'
+                       + ', resyncs: ' + str(resyncs)
+                       + ', payload: ' + '{:.0f}'.format(r['payload_bits_per_second']) + ' bit/s'
+                       + ', utilization: ' + '{:.0f}'.format(r['bus_utilization']*100) + '%'
+                       + ', locos: ' + str(len(r['locos'])))
+        if refresh:
+            output_long += ', max refresh: ' + '{:.3f}'.format(max(refresh)) + ' s'
+        output_short = str(r['packets']) + ' packets, ' + str(len(r['locos'])) + ' locos'
+        return output_long, output_short
+
+class ChannelSkew:
+    #Time skew of the packets of the data lines D1..D7 against D0: start of the same packet within window samples
+    def __init__(self, samplerate, lines, window, recent=8):
+        self.samplerate = samplerate
+        self.window     = window
+        self.recent     = {line: deque(maxlen=recent) for line in [0] + list(lines)}  #[start, bytes, matched lines]
+        self.count      = {line: 0 for line in lines}
+        self.sum        = {line: 0 for line in lines}
+        self.min        = {line: None for line in lines}
+        self.max        = {line: None for line in lines}
+
+    def packet(self, line, start, raw):
+        entry = [start, raw, set()]
+        if line == 0:
+            for other, recent in self.recent.items():
+                for e in recent:
+                    if other != 0 and 0 not in e[2] and e[1] == raw and abs(e[0] - start) <= self.window:
+                        e[2].add(0)
+                        self.add(other, e[0] - start)
+                        break
+        else:
+            for e in self.recent[0]:
+                if line not in e[2] and e[1] == raw and abs(start - e[0]) <= self.window:
+                    e[2].add(line)
+                    entry[2].add(0)
+                    self.add(line, start - e[0])
+                    break
+        self.recent[line].append(entry)
+
+    def add(self, line, skew):
+        self.count[line] += 1
+        self.sum[line]   += skew
+        if self.min[line] is None or skew < self.min[line]:
+            self.min[line] = skew
+        if self.max[line] is None or skew > self.max[line]:
+            self.max[line] = skew
+
+    def report(self, line):
+        #Machine readable report (times in s, positive: after D0)
+        n = self.count[line]
+        return {'packets': n,
+                'mean': self.sum[line] / n / self.samplerate if n else None,
+                'min': self.min[line] / self.samplerate if n else None,
+                'max': self.max[line] / self.samplerate if n else None}
+
+    def summary(self, line):
+        #Texts of the summary annotation (long, short)
+        r = self.report(line)
+        if r['packets'] == 0:
+            return 'Skew to D0: no matching packets', 'Skew: -'
+        mean = '{:+.1f}'.format(r['mean']*1000000)
+        return ('Skew to D0: ' + mean + ' µs (min ' + '{:+.1f}'.format(r['min']*1000000)
+                + ', max ' + '{:+.1f}'.format(r['max']*1000000) + ' µs, ' + str(r['packets']) + ' packets)',
+                'Skew: ' + mean + ' µs')
@@ -0,0 +1,183 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Synthetic DCC signals.
+
+synthesize() turns a list of packets (bytes without checksum) into the
+transitions (samplenum, value) of a logic channel at bit 0, the input
+format of standalone.run(). The edge times are computed in µs and rounded
+to samples, so the same signal can be generated for any samplerate.
+traffic() returns a reproducible mix of typical command station packets,
+write_session() stores a signal as sigrok session file.
+'''
+
+import random
+import zipfile
+
+from . import railcom as rc
+
+HALF_ONE  = 58   #µs [RCN-210 5]
+HALF_ZERO = 100  #µs
+
+def checksum(data):
+    value = 0
+    for byte in data:
+        value ^= byte
+    return value
+
+def packet_bits(data, preamble=17, addChecksum=True):
+    #'1' preamble, then per byte a '0' start bit and the bits MSB first, checksum and '1' end bit
+    bits = [1] * preamble
+    for byte in list(data) + ([checksum(data)] if addChecksum else []):
+        bits.append(0)
+        bits.extend((byte >> i) & 1 for i in range(7, -1, -1))
+    bits.append(1)
+    return bits
+
+def uart_levels(data, t):
+    #(time in µs, level) of the RailCom UART bytes sent one after the other from t on
+    levels = []
+    bit    = 1000000 / rc.BAUDRATE
+    for byte in data:
+        for n, level in enumerate([0] + [(byte >> i) & 1 for i in range(8)] + [1]):
+            levels.append((t + n*bit, level))
+        t += 10*bit
+    return levels
+
+def synthesize(packets, samplerate, preamble=17, stretch=0.0, stretch_us=1000, cutout=False,
+               glitches=0.0, glitch_us=2, seed=0, railcom=None, addChecksum=True):
+    '''
+    Returns (transitions, total) of the packets sent one after the other.
+    stretch:  share of '0' bits whose first half is stretch_us long
+    cutout:   RailCom cutout after every packet (cutout starts 29 µs after
+              the end bit, next edge 470 µs after the end bit)
+    glitches: share of half bits with a pulse of glitch_us in the middle
+              (not inserted if shorter than one sample)
+    railcom:  per packet None or (channel 1 bytes, channel 2 bytes) sent in
+              the cutout on bit 1 (UART, idle high), needs cutout
+    addChecksum: False if the packets already end with a (maybe wrong) checksum
+    '''
+    rng     = random.Random(seed)
+    scale   = samplerate / 1000000
+    t       = HALF_ONE  #µs, some idle time in front of the first edge
+    edges   = []
+    answers = []  #(time in µs, level) of the RailCom channel
+
+    def edge(time):
+        samplenum = int(round(time * scale))
+        if edges and samplenum <= edges[-1]:
+            samplenum = edges[-1] + 1
+        edges.append(samplenum)
+
+    def half(length):
+        nonlocal t
+        edge(t)
+        if glitches and rng.random() < glitches and round(glitch_us * scale) >= 1:
+            middle = t + length / 2
+            edge(middle)
+            edge(middle + glitch_us)
+        t += length
+
+    for number, data in enumerate(packets):
+        for bit in packet_bits(data, preamble, addChecksum):
+            if bit == 1:
+                half(HALF_ONE)
+                half(HALF_ONE)
+            elif stretch and rng.random() < stretch:
+                half(stretch_us)
+                half(HALF_ZERO)
+            else:
+                half(HALF_ZERO)
+                half(HALF_ZERO)
+        if cutout:
+            if railcom and railcom[number] is not None:
+                ch1, ch2 = railcom[number]
+                answers.extend(uart_levels(ch1, t + 80))
+                answers.extend(uart_levels(ch2, t + 193))
+            half(29)
+            half(470 - 29)
+    for _ in range(preamble):  #the decoder puts a packet when the next preamble starts
+        half(HALF_ONE)
+        half(HALF_ONE)
+    edge(t)
+    total = edges[-1] + int(round(HALF_ONE * scale)) + 1
+
+    #first half bit starts with a rising edge, the RailCom channel is idle high
+    changes = [(samplenum, 0, None) for samplenum in edges]
+    changes.extend((int(round(time * scale)), 1, level) for time, level in answers)
+    changes.sort(key=lambda c: c[0])
+    state = 0b10 if answers else 0
+    transitions = [(0, state)]
+    for samplenum, channel, level in changes:
+        if channel == 0:
+            state ^= 1
+        else:
+            state = (state & 1) | (level << 1)
+        if transitions[-1][0] == samplenum:
+            transitions[-1] = (samplenum, state)
+        elif transitions[-1][1] != state:
+            transitions.append((samplenum, state))
+    return transitions, total
+
+def traffic(count, seed=0, locos=20, accessories=50):
+    '''
+    count packets of a command station: speed, function and accessory
+    commands for a small set of addresses, idle packets and some POM writes.
+    '''
+    rng = random.Random(seed)
+    loco = [rng.choice([rng.randint(1, 127), rng.randint(128, 10239)]) for _ in range(locos)]
+    acc  = [rng.randint(1, 510) for _ in range(accessories)]
+
+    def address(a):
+        return [a] if a < 128 else [0xc0 | (a >> 8), a & 0xff]
+
+    packets = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.25:
+            packets.append([0xff, 0x00])
+        elif kind < 0.55:
+            packets.append(address(rng.choice(loco)) + [0x3f, rng.randint(0, 255)])
+        elif kind < 0.75:
+            packets.append(address(rng.choice(loco)) + [rng.choice([0x80, 0xa0, 0xb0]) | rng.randint(0, 15)])
+        elif kind < 0.9:
+            a = rng.choice(acc)
+            packets.append([0x80 | (a & 0x3f), 0x80 | ((~(a >> 6) & 0x07) << 4) | rng.randint(0, 15)])
+        elif kind < 0.97:
+            cv = rng.randint(0, 1023)
+            packets.append(address(rng.choice(loco)) + [0xec | (cv >> 8), cv & 0xff, rng.randint(0, 255)])
+        else:
+            packets.append([0x00, 0x00])
+    return packets
+
+def write_session(path, transitions, total, samplerate, chunk=4*1024*1024):
+    #Session file (*.sr) of the transitions: bit 0 -> D0, bit 1 -> D1 (RailCom)
+    data = bytearray(total)
+    for (samplenum, value), (following, _) in zip(transitions, transitions[1:] + [(total, None)]):
+        data[samplenum:following] = bytes((value,)) * (following - samplenum)
+    metadata = ('[global]\nsigrok version=0.6.0\n\n[device 1]\ncapturefile=logic-1\ntotal probes=2\n'
+                'samplerate=%d Hz\ntotal analog=0\nprobe1=D0\nprobe2=D1\nunitsize=1\n' % samplerate)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as f:
+        f.writestr('version', '2')
+        f.writestr('metadata', metadata)
+        for n, start in enumerate(range(0, total, chunk)):
+            f.writestr('logic-1-' + str(n + 1), bytes(data[start:start+chunk]))
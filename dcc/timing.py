@@ -0,0 +1,308 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+'''
+Batch bit classification of DCC edge timings (RCN-210, RCN-217 2.4).
+
+Timing profiles hold the windows of the bit timings in µs. When the
+samplerate is known they are converted once to whole sample counts
+(SampleWindows), including the accuracy of one sample, so the bits can be
+classified with integer comparisons.
+classify_edges() takes the sample numbers of all edges of the data line and
+classifies every bit of the capture in one pass, using the same windows as
+Decoder.decode(). NumPy is used when available, otherwise a plain Python
+loop produces identical results. In the headless runtime the decoder gets
+the edges of the data line in batches (standalone.Decoder.edge_batches())
+and classifies each batch with it; under libsigrokdecode it receives the
+edges one by one from wait() and classifies each bit inline with the same
+SampleWindows. parallel.py uses it for the seam search.
+deglitch_edges() is the pre-filter of the option 'Min_pulse_width' for
+edge arrays, the decoder applies it to the edge batches of the headless
+runtime (under libsigrokdecode it applies the same rule edge by edge).
+'''
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VALUE_UNKNOWN = -1  #unknown timing or phase change (half '0' + half '1')
+CUTOUT        = (454, 488+119+6)  #µs [RCN-217 2.4] (+119+6=next 1-bit)
+
+class TimingProfile:
+    '''
+    Bit timing windows in µs [RCN-210 5]:
+    one        min/max length of a '1' half bit
+    oneDiff    max difference of the two halves of a '1'
+    zero       min/max length of a '0' half bit (the shorter half of a stretched '0')
+    zeroMax    max length of the longer half of a stretched '0'
+    totalMax   max length of a stretched '0'
+    '''
+    def __init__(self, one=(52, 64), oneDiff=6, zero=(90, 119), zeroMax=10000, totalMax=12000):
+        self.one      = one
+        self.oneDiff  = oneDiff
+        self.zero     = zero
+        self.zeroMax  = zeroMax
+        self.totalMax = totalMax
+
+    def text(self):
+        return '%d-%d,%d,%d-%d,%d,%d' % (self.one + (self.oneDiff,) + self.zero + (self.zeroMax, self.totalMax))
+
+    def windows(self, samplerate):
+        return SampleWindows(self, samplerate)
+
+PROFILES = {
+    'RCN-210 decoder':         TimingProfile(),                                        #tolerance of a decoder
+    'RCN-210 command station': TimingProfile((55, 61), 3, (95, 116), 9900, 12000),   #what a command station sends
+}
+
+def parse_profile(text):
+    #'52-64,6,90-119,10000,12000' (see TimingProfile) -> TimingProfile
+    try:
+        one, oneDiff, zero, zeroMax, totalMax = [p.strip() for p in text.split(',')]
+        one  = tuple(int(v) for v in one.split('-'))
+        zero = tuple(int(v) for v in zero.split('-'))
+        if len(one) != 2 or len(zero) != 2:
+            raise ValueError()
+        return TimingProfile(one, int(oneDiff), zero, int(zeroMax), int(totalMax))
+    except ValueError:
+        raise ValueError('Invalid timing (expected e.g. 52-64,6,90-119,10000,12000): ' + text)
+
+def pulse_width(text, samplerate):
+    #Option 'Min_pulse_width': '' or '0' (off), '4us'/'4µs' (µs) or '10' (samples) -> samples
+    text = str(text).strip().lower()
+    try:
+        if text.endswith('us') or text.endswith('µs'):
+            return int(round(float(text[:-2])*samplerate/1000000))
+        return int(text or 0)
+    except ValueError:
+        raise ValueError('Invalid pulse width (expected e.g. 4us or 10): ' + text)
+
+def get_profile(name, user=''):
+    if name == 'user':
+        return parse_profile(user)
+    return PROFILES[name]
+
+def _low(us, samplerate):
+    #smallest sample count d with us - accuracy <= d/samplerate*1000000 (accuracy = 1 sample)
+    return -(-us*samplerate // 1000000) - 1
+
+def _high(us, samplerate):
+    #largest sample count d with d/samplerate*1000000 <= us + accuracy
+    return us*samplerate // 1000000 + 1
+
+class SampleWindows:
+    #The windows of a profile in sample counts for one samplerate (bounds inclusive)
+    def __init__(self, profile, samplerate):
+        self.samplerate   = samplerate
+        self.oneMin       = _low(profile.one[0], samplerate)
+        self.oneMax       = _high(profile.one[1], samplerate)
+        self.oneDiff      = max(profile.oneDiff*samplerate // 1000000, 2)                  #or 2*accuracy
+        self.zeroMin      = _low(profile.zero[0], samplerate)
+        self.zeroMax      = _high(profile.zero[1], samplerate)
+        self.zeroLongMax  = _high(profile.zeroMax, samplerate)
+        self.stretchedMin = -(-2*profile.zero[1]*samplerate // 1000000) + 1                #min. 2*half'0' + accuracy
+        self.stretchedMax = _high(profile.totalMax, samplerate)
+        self.phaseMin     = _low(profile.zero[0]+profile.one[0], samplerate)              #half '0' + half '1'
+        self.phaseMax     = _high(profile.one[1]+profile.zero[1], samplerate)
+        self.cutoutMin    = _low(CUTOUT[0], samplerate)
+        self.cutoutMax    = _high(CUTOUT[1], samplerate)
+
+    def samples(self, us):
+        #largest sample count d with d/samplerate*1000000 <= us
+        return us*self.samplerate // 1000000
+
+    def classify(self, part1, part2):
+        #Classify one bit, times in samples. Returns (value, stretched, cutout, unknown, phase).
+        total = part1 + part2
+        if (    self.oneMin <= part1 <= self.oneMax
+            and self.oneMin <= part2 <= self.oneMax
+            and abs(part1-part2) <= self.oneDiff):
+            return 1, False, self.cutoutMin <= total <= self.cutoutMax, False, False
+        if (   (self.zeroMin <= part1 <= self.zeroLongMax and self.zeroMin <= part2 <= self.zeroMax)
+            or (self.zeroMin <= part2 <= self.zeroLongMax and self.zeroMin <= part1 <= self.zeroMax)):
+            return (0, self.stretchedMin <= total <= self.stretchedMax,
+                    self.cutoutMin <= total <= self.cutoutMax, False, False)
+        if self.phaseMin <= total <= self.phaseMax:
+            return VALUE_UNKNOWN, False, False, False, True
+        return VALUE_UNKNOWN, False, self.cutoutMin <= total <= self.cutoutMax, True, False
+
+class BitArray:
+    '''
+    Result of classify_edges(), one entry per bit in decode order:
+    start/middle/end   sample numbers of edge 1, 2 and 3 of the bit
+    value              1, 0 or VALUE_UNKNOWN
+    stretched          '0' with stretched length
+    cutout             total length matches a RailCom cutout
+    unknown            timing matches neither '0', '1' nor a phase change
+    phase              half '0' + half '1': edge detection has to be swapped
+    '''
+    def __init__(self, start, middle, end, value, stretched, cutout, unknown, phase):
+        self.start     = start
+        self.middle    = middle
+        self.end       = end
+        self.value     = value
+        self.stretched = stretched
+        self.cutout    = cutout
+        self.unknown   = unknown
+        self.phase     = phase
+
+    def __len__(self):
+        return len(self.value)
+
+    def rows(self):
+        #(start, middle, end, value, stretched, phase) of every bit as Python values, for per-bit loops
+        columns = (self.start, self.middle, self.end, self.value, self.stretched, self.phase)
+        return zip(*[c.tolist() if hasattr(c, 'tolist') else c for c in columns])
+
+def classify_edges(edges, samplerate, first_rising=True, profile=None):
+    '''
+    Classify all bits of a sequence of edges (sample numbers, alternating
+    polarity). Like Decoder.decode() the first bit starts at the first rising
+    edge; pass first_rising=False if edges[0] is a falling edge.
+    A bit is only reported if the edge after it exists (decode() looks one
+    edge ahead), after a phase change the walk skips one edge.
+    profile is a TimingProfile, default 'RCN-210 decoder'.
+    '''
+    first   = 0 if first_rising else 1
+    windows = (profile or PROFILES['RCN-210 decoder']).windows(samplerate)
+    if np is not None:
+        return _classify_numpy(edges, windows, first)
+    return _classify_python(edges, windows, first)
+
+def _classify_python(edges, windows, first):
+    start, middle, end = [], [], []
+    value, stretched, cutout, unknown, phase = [], [], [], [], []
+    n = len(edges)
+    i = first
+    while i+3 < n:
+        e1, e2, e3 = edges[i], edges[i+1], edges[i+2]
+        bit = windows.classify(e2-e1, e3-e2)
+        start.append(e1)
+        middle.append(e2)
+        end.append(e3)
+        value.append(bit[0])
+        stretched.append(bit[1])
+        cutout.append(bit[2])
+        unknown.append(bit[3])
+        phase.append(bit[4])
+        i += 3 if bit[4] else 2
+    return BitArray(start, middle, end, value, stretched, cutout, unknown, phase)
+
+def _classify_numpy(edges, windows, first):
+    e = np.asarray(edges, dtype=np.int64)
+    m = len(e) - 3  #number of candidate bit starts (edge 4 must exist)
+    if m <= first:
+        empty = np.zeros(0, dtype=np.int64)
+        flags = np.zeros(0, dtype=bool)
+        return BitArray(empty, empty, empty, np.zeros(0, dtype=np.int8), flags, flags, flags, flags)
+
+    #Timing of a bit starting at every edge (both phases at once), in samples
+    w  = windows
+    e1 = e[0:m]
+    e2 = e[1:m+1]
+    e3 = e[2:m+2]
+    total = e3-e1
+    part1 = e2-e1
+    part2 = e3-e2
+
+    ##[RCN-210 5]
+    one = (  (w.oneMin <= part1) & (part1 <= w.oneMax)
+           & (w.oneMin <= part2) & (part2 <= w.oneMax)
+           & (np.abs(part1-part2) <= w.oneDiff))
+    zero = ~one & (  ((w.zeroMin <= part1) & (part1 <= w.zeroLongMax) & (w.zeroMin <= part2) & (part2 <= w.zeroMax))
+                   | ((w.zeroMin <= part2) & (part2 <= w.zeroLongMax) & (w.zeroMin <= part1) & (part1 <= w.zeroMax)))
+    phase = ~one & ~zero & (w.phaseMin <= total) & (total <= w.phaseMax)
+    unknown = ~one & ~zero & ~phase
+    stretched = zero & (w.stretchedMin <= total) & (total <= w.stretchedMax)
+    ##[RCN-217 2.4]
+    cutout = ~phase & (w.cutoutMin <= total) & (total <= w.cutoutMax)
+    value = np.full(m, VALUE_UNKNOWN, dtype=np.int8)
+    value[one]  = 1
+    value[zero] = 0
+
+    #Walk: step 2 edges per bit, 3 edges after a phase change
+    phaseIdx = (np.flatnonzero(phase[0::2])*2, np.flatnonzero(phase[1::2])*2+1)
+    chunks = []
+    i = first
+    while i < m:
+        candidates = phaseIdx[i & 1]
+        k = np.searchsorted(candidates, i)
+        if k < len(candidates):
+            j = int(candidates[k])
+            chunks.append(np.arange(i, j+1, 2))
+            i = j+3
+        else:
+            chunks.append(np.arange(i, m, 2))
+            break
+    idx = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+    return BitArray(e1[idx], e2[idx], e3[idx], value[idx], stretched[idx], cutout[idx], unknown[idx], phase[idx])
+
+def deglitch_edges(edges, min_width, pulses=False):
+    '''
+    Pre-filter: remove the pulses shorter than min_width samples from a
+    sequence of edges (sample numbers). In a run of short pulses the edges
+    are removed in pairs from the start of the run, so the polarity of the
+    remaining edges still alternates (an odd run keeps its last edge).
+    Returns (edges, number of removed pulses), with pulses=True (edges,
+    list of the removed pulses as (start, end)).
+    '''
+    if min_width <= 0 or len(edges) < 2:
+        return edges, [] if pulses else 0
+    if np is not None:
+        result, removed = _deglitch_numpy(edges, min_width)
+    else:
+        result, removed = _deglitch_python(edges, min_width)
+    if pulses:
+        return result, list(zip(removed[0::2], removed[1::2]))
+    return result, len(removed)//2
+
+def _deglitch_python(edges, min_width):
+    #(kept edges, removed edges)
+    result  = []
+    removed = []
+    pending = None
+    for samplenum in edges:
+        if pending is not None and samplenum - pending < min_width:
+            removed += (pending, samplenum)
+            pending  = None
+            continue
+        if pending is not None:
+            result.append(pending)
+        pending = samplenum
+    if pending is not None:
+        result.append(pending)
+    return result, removed
+
+def _deglitch_numpy(edges, min_width):
+    e     = np.asarray(edges, dtype=np.int64)
+    n     = len(e)
+    idx   = np.arange(n)
+    short = np.diff(e) < min_width              #pulse from edge j to edge j+1 too short
+    prevShort = np.concatenate(([False], short))
+    nextShort = np.concatenate((short, [False]))
+    inRun = prevShort | nextShort
+
+    #first/last edge of the run of every edge, position in the run
+    runStart = np.maximum.accumulate(np.where(inRun & ~prevShort, idx, 0))
+    runEnd   = np.minimum.accumulate(np.where(inRun & ~nextShort, idx, n)[::-1])[::-1]
+    remove   = inRun & (idx - runStart < (runEnd - runStart + 1)//2*2)
+    return e[~remove], e[remove].tolist()
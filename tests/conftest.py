@@ -0,0 +1,76 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from dcc import Decoder, standalone, synth
+
+SAMPLERATE = 50000
+IDLE       = [0xff, 0]
+
+class Output:
+    #Everything the decoder puts: annotations (start, end, class, texts) and OUTPUT_PYTHON records (start, end, data)
+    def __init__(self, forward=None):
+        self.annotations = []
+        self.python      = []
+        self.forward     = forward  #another sink that receives everything
+
+    def __call__(self, startsample, endsample, outputType, data):
+        if outputType == standalone.OUTPUT_ANN:
+            self.annotations.append((startsample, endsample, data[0], data[1]))
+        elif outputType == standalone.OUTPUT_PYTHON:
+            self.python.append((startsample, endsample, data))
+        if self.forward is not None:
+            self.forward(startsample, endsample, outputType, data)
+
+    @property
+    def records(self):
+        return [data for _, _, data in self.python]
+
+    def records_of(self, kind):
+        return [data[1] for data in self.records if data[0] == kind]
+
+    def texts(self, annClass):
+        return [texts for _, _, cls, texts in self.annotations if cls == annClass]
+
+    def packets(self):
+        #(bytes incl. checksum, checksum ok) of the packets
+        return [(bytes(p['bytes']), p['checksum']) for p in self.records_of('PACKET')]
+
+@pytest.fixture
+def decode():
+    def run(transitions, total, options=None, masks=(1,), samplerate=SAMPLERATE, forward=None):
+        output = Output(forward)
+        standalone.run(Decoder(), transitions, samplerate, masks, total, output, options)
+        return output
+    return run
+
+@pytest.fixture
+def decode_packets(decode):
+    def run(packets, options=None, forward=None, **kwargs):
+        transitions, total = synth.synthesize(packets, SAMPLERATE, **kwargs)
+        return decode(transitions, total, options, forward=forward)
+    return run
@@ -0,0 +1,137 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import random
+import sys
+import zipfile
+from array import array
+
+import pytest
+
+import dcc.srfile
+from dcc import railcom as rc
+from dcc import standalone, synth
+from dcc.__main__ import decode_capture
+from dcc.srfile import SrFile, hysteresis
+
+SAMPLERATE = 1000000
+PACKETS    = synth.traffic(40, seed=5)
+ANSWER     = ((rc.ENCODE[0], rc.ENCODE[15]), (rc.ENCODE[12], rc.ENCODE[34], rc.ENCODE[7]))  #4-of-8 coded
+ANSWERS    = [ANSWER if i % 3 == 0 else None for i in range(len(PACKETS))]
+
+def track_voltage(transitions, total, level=15.0, slew=3.0, noise=4.0, seed=1):
+    #Analog samples of bit 0 (data): +-level V, at most slew V per sample, uniform noise of +-noise V
+    rng    = random.Random(seed)
+    values = array('f', bytes(4*total))
+    value  = -level
+    for (samplenum, bits), (following, _) in zip(transitions, transitions[1:] + [(total, None)]):
+        target = level if bits & 1 else -level
+        for i in range(samplenum, following):
+            value = min(value + slew, target) if target > value else max(value - slew, target)
+            values[i] = value + rng.uniform(-noise, noise)
+    return values
+
+@pytest.fixture(scope='module')
+def captures(tmp_path_factory):
+    #the same signal as logic session (D0 data, D1 RailCom) and with the data as analog channel A0
+    tmp = tmp_path_factory.mktemp('analog')
+    transitions, total = synth.synthesize(PACKETS, SAMPLERATE, cutout=True, railcom=ANSWERS)
+    logic = str(tmp / 'logic.sr')
+    synth.write_session(logic, transitions, total, SAMPLERATE, chunk=1 << 16)
+    analog = str(tmp / 'analog.sr')
+    values = track_voltage(transitions, total)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    with zipfile.ZipFile(logic) as source, zipfile.ZipFile(analog, 'w', zipfile.ZIP_DEFLATED) as f:
+        for name in source.namelist():
+            data = source.read(name)
+            if name == 'metadata':
+                data = data.replace(b'total analog=0\n', b'total analog=1\nanalog3=A0\n')
+            f.writestr(name, data)
+        chunk = 40000  #other chunk borders than the logic data
+        for n, start in enumerate(range(0, total, chunk)):
+            f.writestr('analog-1-3-%d' % (n + 1), values[start:start+chunk].tobytes())
+    return logic, analog
+
+def decode(path, assignment, options=None, thresholds=(-5.0, 5.0)):
+    records = []
+    def sink(start, end, outputType, data):
+        if outputType == standalone.OUTPUT_PYTHON:
+            records.append(data)
+    decode_capture(path, options or {}, assignment, sink, thresholds=thresholds)
+    return ([(bytes(d[1]['bytes']), d[1]['checksum']) for d in records if d[0] == 'PACKET'],
+            [(d[1]['channel'], d[1]['bytes'], d[1]['address']) for d in records if d[0] == 'RAILCOM'])
+
+def edge_count(path, probe, thresholds):
+    with SrFile(path, thresholds) as f:
+        return sum(1 for _ in f.iter_transitions(1 << f.probe_index(probe))) - 1
+
+@pytest.mark.parametrize('thresholds', [(-5.0, 5.0), (-8.0, 8.0)])
+def test_same_as_logic(captures, thresholds):
+    #hysteresis wider than the noise: the packets and answers of the logic capture
+    logic, analog = captures
+    expected = decode(logic, {'railcom': 'D1'})
+    assert len(expected[0]) == len(PACKETS) and all(ok for _, ok in expected[0])
+    assert len(expected[1]) == 2 * sum(a is not None for a in ANSWERS)
+    assert edge_count(analog, 'A0', thresholds) == edge_count(logic, 'D0', thresholds)
+    assert decode(analog, {'data': 'A0', 'railcom': 'D1'}, thresholds=thresholds) == expected
+
+def test_same_as_logic_without_numpy(captures, monkeypatch):
+    #the Python fallback of the analog chunks and the merge with the logic channel
+    logic, analog = captures
+    expected = decode(logic, {'railcom': 'D1'})
+    monkeypatch.setattr(dcc.srfile, 'np', None)
+    assert decode(analog, {'data': 'A0', 'railcom': 'D1'}) == expected
+
+def test_thresholds_in_noise_band(captures):
+    #hysteresis narrower than the noise: the level chatters while the voltage passes the thresholds,
+    #the pre-filter removes these pulses
+    logic, analog = captures
+    thresholds = (-0.5, 0.5)
+    assert edge_count(analog, 'A0', thresholds) > edge_count(logic, 'D0', thresholds)
+    expected = decode(logic, {'railcom': 'D1'})
+    assert decode(analog, {'data': 'A0', 'railcom': 'D1'}, thresholds=thresholds) != expected
+    assert decode(analog, {'data': 'A0', 'railcom': 'D1'}, {'Min_pulse_width': '4us'}, thresholds) == expected
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_hysteresis(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(dcc.srfile, 'np', None)
+    values = [0.0, 2.0, 0.5, -0.5, 0.9, -1.5, -0.2, 1.0, 1.0]
+    #first sample decides against the middle (0.0 -> 1), samples inside (-1, 1) keep the level
+    assert hysteresis(values, -1.0, 1.0, None) == ([(0, 1), (5, 0), (7, 1)], 1)
+    assert hysteresis(values, -1.0, 1.0, 0) == ([(1, 1), (5, 0), (7, 1)], 1)
+    assert hysteresis(values[2:5], -1.0, 1.0, 1) == ([], 1)
+    assert hysteresis([], -1.0, 1.0, None) == ([], None)
+
+def test_hysteresis_in_chunks(monkeypatch):
+    #the level carries over from chunk to chunk, NumPy and Python give the same changes
+    transitions, total = synth.synthesize(PACKETS[:3], SAMPLERATE)
+    values  = track_voltage(transitions, total)
+    whole   = hysteresis(values, -0.5, 0.5, None)
+    changes, level = [], None
+    for start in range(0, total, 777):
+        part, level = hysteresis(values[start:start+777], -0.5, 0.5, level)
+        changes += [(start + pos, value) for pos, value in part]
+    assert (changes, level) == whole
+    monkeypatch.setattr(dcc.srfile, 'np', None)
+    assert hysteresis(values, -0.5, 0.5, None) == whole
@@ -0,0 +1,98 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import synth
+from dcc.archive import PacketLog, PacketLogError, PacketLogWriter
+
+from conftest import IDLE, SAMPLERATE
+
+def write_log(path, decode_packets, packets, blockPackets=8, **kwargs):
+    #Decode packets into a packet log, returns the decoder output
+    with PacketLogWriter(str(path), SAMPLERATE, blockPackets=blockPackets) as writer:
+        return decode_packets(packets, forward=writer.sink, **kwargs)
+
+def expected(output, start=None, end=None, select=lambda p: True):
+    return [(s, e, bytes(p['bytes']), p['checksum'], p['addr_type'], p['address'])
+            for s, e, (kind, p) in output.python
+            if kind == 'PACKET' and (start is None or s >= start) and (end is None or s < end) and select(p)]
+
+@pytest.fixture
+def traffic_log(tmp_path, decode_packets):
+    path   = tmp_path / 'traffic.dcclog'
+    output = write_log(path, decode_packets, synth.traffic(200, seed=1))
+    return path, output
+
+def test_round_trip(traffic_log):
+    path, output = traffic_log
+    with PacketLog(str(path)) as log:
+        assert log.samplerate == SAMPLERATE
+        assert len(log.blocks) > 1
+        assert [(s, e, bytes(raw), ok, t, a) for s, e, raw, ok, t, a in log.packets()] == expected(output)
+
+def test_time_and_address_queries(traffic_log):
+    path, output = traffic_log
+    packets = expected(output)
+    start, end = packets[50][0], packets[150][0]
+    address = next(a for _, _, _, _, t, a in packets if t == 'short')
+    with PacketLog(str(path)) as log:
+        assert list(log.packets(start, end)) == expected(output, start, end)
+        assert list(log.packets(dec_addr=address)) == \
+               expected(output, select=lambda p: p['addr_type'] in ('broadcast', 'short', 'long') and p['address'] == address)
+        assert list(log.packets(start, end, dec_addr={address})) == \
+               [p for p in expected(output, start, end) if p[4] in ('broadcast', 'short', 'long') and p[5] == address]
+
+def test_long_packet(tmp_path, decode_packets):
+    #more than 255 bytes: the number of bytes is a varint
+    path   = tmp_path / 'long.dcclog'
+    long   = [3] + [0x55]*300
+    output = write_log(path, decode_packets, [IDLE, long, IDLE])
+    assert 302 in [len(raw) for raw, _ in output.packets()]
+    with PacketLog(str(path)) as log:
+        assert [(s, e, bytes(raw), ok, t, a) for s, e, raw, ok, t, a in log.packets()] == expected(output)
+
+def test_aborted_recording(tmp_path, decode_packets):
+    #without trailer the block headers are scanned
+    path = tmp_path / 'aborted.dcclog'
+    writer = PacketLogWriter(str(path), SAMPLERATE, blockPackets=8)
+    output = decode_packets(synth.traffic(40, seed=2), forward=writer.sink)
+    writer.flush()
+    writer.file.close()
+    with PacketLog(str(path)) as log:
+        assert all(block.decoders is None for block in log.blocks)
+        assert [(s, e, bytes(raw), ok, t, a) for s, e, raw, ok, t, a in log.packets()] == expected(output)
+
+def test_version_1_log(traffic_log):
+    #version 1 stored the number of bytes in one byte: same encoding below 128 bytes
+    path, output = traffic_log
+    data = bytearray(path.read_bytes())
+    data[7] = 1
+    path.write_bytes(bytes(data))
+    with PacketLog(str(path)) as log:
+        assert list(log.packets()) == expected(output)
+
+def test_not_a_packet_log(tmp_path):
+    path = tmp_path / 'other.dcclog'
+    path.write_bytes(b'DCCLOG\x00\x09' + bytes(16))
+    with pytest.raises(PacketLogError):
+        PacketLog(str(path))
@@ -0,0 +1,76 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import synth
+from dcc.__main__ import main
+from dcc.pd import Ann
+
+from conftest import IDLE
+
+SAMPLERATE = 1000000  #1 sample per µs
+PACKETS    = [IDLE, [3, 0x3f, 0x10], IDLE]
+
+@pytest.fixture
+def bit_timing(decode):
+    def run(**kwargs):
+        transitions, total = synth.synthesize(PACKETS, SAMPLERATE, **kwargs)
+        output = decode(transitions, total, {'Bit_timing': 'yes'}, samplerate=SAMPLERATE)
+        reports = output.records_of('BIT_TIMING')
+        assert len(reports) == 1
+        return output, reports[0]
+    return run
+
+def bit_counts():
+    #'1' and '0' bits incl. the preamble synthesize() puts at the end, the first bit has no edge in front
+    bits = [bit for packet in PACKETS for bit in synth.packet_bits(packet)] + [1] * 17
+    return bits.count(1) - 1, bits.count(0)
+
+def test_nominal(bit_timing):
+    output, report = bit_timing()
+    ones, zeros = bit_counts()
+    for name, half, count in (('one', synth.HALF_ONE, ones), ('zero', synth.HALF_ZERO, zeros)):
+        for part in ('part1', 'part2'):
+            assert report[name][part]['histogram'] == {half: count}
+            assert report[name][part + '_long'] == 0
+        assert report[name]['asymmetry']['histogram'] == {0: count}
+    assert report['preamble']['histogram'] == {17: len(PACKETS)}
+    assert report['dc_offset'] == 0.0
+    assert output.texts(Ann.BIT_TIMING)[-1][1] == 'DC offset: 0.00%'
+
+def test_stretched_zeros(bit_timing):
+    #first half of every '0' 1000 µs long: counted as long, asymmetry clipped, positive DC offset
+    output, report = bit_timing(stretch=1.0)
+    ones, zeros = bit_counts()
+    assert report['zero']['part1']['count'] == 0
+    assert report['zero']['part1_long'] == zeros
+    assert report['zero']['part2']['histogram'] == {synth.HALF_ZERO: zeros}
+    assert report['zero']['asymmetry']['histogram'] == {32: zeros}
+    assert report['one']['part1']['histogram'] == {synth.HALF_ONE: ones}
+    stretched = zeros * 1000
+    total     = stretched + zeros * synth.HALF_ZERO + ones * 2 * synth.HALF_ONE
+    assert report['dc_offset'] == pytest.approx((stretched - zeros * synth.HALF_ZERO) / total)
+
+def test_no_parallel_decode():
+    with pytest.raises(SystemExit, match='Bit_timing=yes needs a decode in one process'):
+        main(['-j', '2', '-O', 'Bit_timing=yes', 'capture.sr'])
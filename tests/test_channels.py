@@ -0,0 +1,111 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+
+import pytest
+
+from dcc import synth
+from dcc.pd import Ann
+
+SAMPLERATE = 1000000
+PACKETS    = [[3, 0x3f, n] for n in range(10)]  #all different: each packet of D1/D2 matches one packet of D0
+EXPECTED   = [bytes(p + [synth.checksum(p)]) for p in PACKETS]
+MASKS      = (1, None, 2, 4)  #data, railcom, data1, data2
+
+def delayed(transitions, delay):
+    return [transitions[0]] + [(samplenum + delay, value) for samplenum, value in transitions[1:]]
+
+def merge(*lines):
+    #bit 0 of the transitions of every line on bit n of the result (D0, D1, ...)
+    changes = sorted((samplenum, n, value & 1) for n, line in enumerate(lines) for samplenum, value in line[1:])
+    state   = sum((line[0][1] & 1) << n for n, line in enumerate(lines))
+    result  = [(0, state)]
+    for samplenum, bit, level in changes:
+        state = (state & ~(1 << bit)) | (level << bit)
+        if result[-1][0] == samplenum:
+            result[-1] = (samplenum, state)
+        else:
+            result.append((samplenum, state))
+    return result
+
+def line_packets(output, line):
+    return [(start, bytes(data[1]['bytes']), data[1]['checksum']) for start, _, data in output.python
+            if data[0] == 'PACKET' and data[1].get('line') == line]
+
+@pytest.fixture(scope='module')
+def signal():
+    return synth.synthesize(PACKETS, SAMPLERATE)
+
+def test_line_annotations(decode, signal):
+    #D1 and D2 later than D0: packets, rows and skew of every line
+    transitions, total = signal
+    output = decode(merge(transitions, delayed(transitions, 40), delayed(transitions, 100)), total + 100, masks=MASKS, samplerate=SAMPLERATE)
+    reference = decode(transitions, total, {'Annotation_level': 'packets'}, samplerate=SAMPLERATE)
+    starts = [start for start, _, _ in line_packets(output, None)]
+    assert [(data, ok) for _, data, ok in line_packets(output, None)] == [(data, True) for data in EXPECTED]
+    for line, delay in ((1, 40), (2, 100)):
+        assert line_packets(output, line) == [(start + delay, data, True) for start, data in zip(starts, EXPECTED)]
+        #packet summaries as at annotation level 'packets' on D0, errors, skew
+        summaries = [(start, end, texts) for start, end, cls, texts in output.annotations if cls == Ann.CHANNELS + 3*line - 3]
+        assert len(summaries) == 10
+        assert summaries == [(start + delay, end + delay, texts) for start, end, cls, texts in reference.annotations if cls == Ann.COMMAND]
+        assert output.texts(Ann.CHANNELS + 3*line - 2) == []
+        assert output.texts(Ann.CHANNELS + 3*line - 1) == [
+            ['Skew to D0: +%.1f µs (min +%.1f, max +%.1f µs, 10 packets)' % (delay, delay, delay), 'Skew: +%.1f µs' % delay]]
+    assert output.records_of('CHANNEL_SKEW') == [{
+        1: {'packets': 10, 'mean': pytest.approx(40e-6), 'min': pytest.approx(40e-6), 'max': pytest.approx(40e-6)},
+        2: {'packets': 10, 'mean': pytest.approx(100e-6), 'min': pytest.approx(100e-6), 'max': pytest.approx(100e-6)}}]
+    #the annotations of D0 are those of the single line decode
+    single = decode(transitions, total, samplerate=SAMPLERATE)
+    assert [a for a in output.annotations if a[2] < Ann.CHANNELS] == single.annotations
+
+def test_line_earlier_than_d0(decode, signal):
+    transitions, total = signal
+    output = decode(merge(delayed(transitions, 25), transitions), total + 25, masks=MASKS[:3], samplerate=SAMPLERATE)
+    assert output.records_of('CHANNEL_SKEW') == [
+        {1: {'packets': 10, 'mean': pytest.approx(-25e-6), 'min': pytest.approx(-25e-6), 'max': pytest.approx(-25e-6)}}]
+    assert output.texts(Ann.CHANNELS + 2) == [['Skew to D0: -25.0 µs (min -25.0, max -25.0 µs, 10 packets)', 'Skew: -25.0 µs']]
+
+def test_line_missing_packets(decode, signal):
+    #D1 drops out during the fourth packet: the packets of D1 without it, errors in row D1, the skew of the rest
+    transitions, total = signal
+    first   = decode(transitions, total, samplerate=SAMPLERATE).python
+    packets = [(start, end) for start, end, data in first if data[0] == 'PACKET']
+    gap     = (packets[3][0], packets[3][1])
+    d1      = [t for t in transitions if not gap[0] <= t[0] < gap[1]]
+    output  = decode(merge(transitions, d1), total, masks=MASKS[:3], samplerate=SAMPLERATE)
+    assert [(data, ok) for _, data, ok in line_packets(output, None)] == [(data, True) for data in EXPECTED]
+    received = [data for _, data, ok in line_packets(output, 1) if ok]
+    assert received == EXPECTED[:3] + EXPECTED[4:]
+    assert output.texts(Ann.CHANNELS + 1) != []
+    assert output.texts(Ann.ERROR) == []
+    assert output.records_of('CHANNEL_SKEW') == [{1: {'packets': 9, 'mean': 0.0, 'min': 0.0, 'max': 0.0}}]
+
+def test_line_without_packets(decode, signal):
+    #D1 idle or beyond maxChannelSkew: no matching packets
+    transitions, total = signal
+    output = decode(merge(transitions, [(0, 0)], delayed(transitions, 3000)), total + 3000, masks=MASKS, samplerate=SAMPLERATE)
+    assert line_packets(output, 1) == []
+    assert len(line_packets(output, 2)) == 10
+    report = {'packets': 0, 'mean': None, 'min': None, 'max': None}
+    assert output.records_of('CHANNEL_SKEW') == [{1: report, 2: report}]
+    assert output.texts(Ann.CHANNELS + 2) == output.texts(Ann.CHANNELS + 5) == [['Skew to D0: no matching packets', 'Skew: -']]
@@ -0,0 +1,58 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import time
+
+import pytest
+
+from dcc import equivalence
+
+ARGS = ['-n', '20', '--seeds', '1', '-r', '1M', '--paths', 'direct,edges,table']
+
+def test_paths_match(capsys):
+    assert equivalence.main(ARGS + ['--min-speedup', '0']) == 0
+    out = capsys.readouterr().out
+    assert 'MISMATCH' not in out
+    assert 'two lines' in out and 'pre-filter' in out
+
+def test_mismatch(monkeypatch, capsys):
+    decode = equivalence.decode_edges
+    monkeypatch.setattr(equivalence, 'decode_edges', lambda *args: decode(*args)[1:])
+    assert equivalence.main(ARGS + ['--paths', 'edges']) == 1
+    assert 'edges MISMATCH at record 0' in capsys.readouterr().out
+
+def test_throughput_regression(monkeypatch, capsys):
+    decode = equivalence.decode_direct
+
+    def slow(*args):
+        t = time.perf_counter()
+        records = decode(*args)
+        time.sleep(2*(time.perf_counter() - t) + 0.01)
+        return records
+
+    monkeypatch.setattr(equivalence, 'decode_direct', slow)
+    assert equivalence.main(ARGS + ['--paths', 'direct']) == 1
+    assert 'THROUGHPUT REGRESSION: direct' in capsys.readouterr().out
+
+def test_missing_reference(tmp_path):
+    with pytest.raises(SystemExit, match='Reference decoder not found'):
+        equivalence.main(ARGS + ['--reference', str(tmp_path / 'pd.py')])
@@ -0,0 +1,95 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import Decoder, standalone, synth
+from dcc.index import DEC_TYPES, FIELDS, PacketIndex, index_capture, parse_values
+from dcc.srfile import SrFileError
+
+from conftest import SAMPLERATE, Output
+
+def traffic():
+    #traffic mix with a wrong checksum in every 25th packet
+    packets = [p + [synth.checksum(p)] for p in synth.traffic(300, seed=3)]
+    for n in range(0, len(packets), 25):
+        packets[n][-1] ^= 0x55
+    return packets
+
+@pytest.fixture(scope='module')
+def indexed():
+    #index and the packet records put by the decoder
+    transitions, total = synth.synthesize(traffic(), SAMPLERATE, addChecksum=False)
+    index  = PacketIndex()
+    output = Output(index.sink)
+    standalone.run(Decoder(), transitions, SAMPLERATE, (1,), total, output)
+    records = [(s, e, data[1]) for s, e, data in output.python if data[0] == 'PACKET']
+    return index, records
+
+def brute_force(records, select):
+    return [(s, e, {f: p[f] for f in FIELDS}) for s, e, p in records if select(p)]
+
+def test_all_packets(indexed):
+    index, records = indexed
+    assert len(index) == len(records)
+    assert list(index.query()) == brute_force(records, lambda p: True)
+
+@pytest.mark.parametrize('criteria, select', [
+    ({'dec_addr': 3}, lambda p: p['addr_type'] in DEC_TYPES and p['address'] == 3),
+    ({'acc_addr': range(1, 200)}, lambda p: p['addr_type'] in ('accessory', 'extended accessory') and 1 <= p['address'] < 200),
+    ({'instruction': {'pom_write'}, 'cv': range(1, 513)}, lambda p: p['instruction'] == 'pom_write' and 1 <= p['cv'] <= 512),
+    ({'checksum': False}, lambda p: p['checksum'] == False),
+    ({'byte': 0x3f, 'checksum': True}, lambda p: 0x3f in p['bytes'] and p['checksum'] == True),
+])
+def test_query(indexed, criteria, select):
+    index, records = indexed
+    expected = brute_force(records, select)
+    assert list(index.query(**criteria)) == expected
+    assert index.count(**criteria) == len(expected)
+
+def test_damaged_packets_found(indexed):
+    index, records = indexed
+    assert index.count(checksum=False) == 12
+
+def test_save_load(indexed, tmp_path):
+    index, records = indexed
+    path = str(tmp_path / 'test.dccidx')
+    index.save(path)
+    loaded = PacketIndex.load(path)
+    assert list(loaded.query(dec_addr=range(1, 128))) == list(index.query(dec_addr=range(1, 128)))
+
+def test_load_other_file(tmp_path):
+    path = tmp_path / 'other.dccidx'
+    path.write_bytes(b'\x80\x04N.')  #pickled None
+    with pytest.raises(SrFileError):
+        PacketIndex.load(str(path))
+
+def test_index_capture(indexed, tmp_path):
+    #index built from a session file by the headless decode
+    index, records = indexed
+    path = str(tmp_path / 'traffic.sr')
+    synth.write_session(path, *synth.synthesize(traffic(), SAMPLERATE, addChecksum=False), SAMPLERATE)
+    assert list(index_capture(path).query()) == list(index.query())
+
+def test_parse_values():
+    assert parse_values('3,17,100-102') == {3, 17, 100, 101, 102}
+    assert parse_values('0x3f,0b11') == {0x3f, 3}
@@ -0,0 +1,108 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+
+import pytest
+
+from dcc import Decoder, standalone, synth
+from dcc.pd import Ann
+
+from conftest import IDLE, Output
+
+SAMPLERATE = 1000000  #RailCom needs >= 1 MHz
+LIVE       = {'Live_mode': 'yes'}
+
+class Recording(Decoder):
+    #longest railcomEdges seen
+    maxRailcomEdges = 64
+    recentPacketCount = 5
+    longest = 0
+
+    def addRailcomEdge(self, samplenum, level):
+        Decoder.addRailcomEdge(self, samplenum, level)
+        self.longest = max(self.longest, len(self.railcomEdges))
+
+def run(transitions, total, options, decoder=None):
+    decoder = decoder or Recording()
+    output  = Output()
+    meta    = []
+    def sink(start, end, outputType, data):
+        output(start, end, outputType, data)
+        if outputType == standalone.OUTPUT_META:
+            meta.append((start, end, data))
+    standalone.run(decoder, transitions, SAMPLERATE, (1, 2), total, sink, options)
+    return decoder, output, meta
+
+def railcom_noise(edges, spacing=20):
+    #data line idle (low), the RailCom channel toggles: (transitions, total)
+    return [(i * spacing, 2 if i % 2 == 0 else 0) for i in range(edges)], edges * spacing
+
+def test_railcom_edges_bounded():
+    #without data bits nothing drops the RailCom edges, live mode keeps the newest maxRailcomEdges
+    transitions, total = railcom_noise(1001)  #initial levels and 1000 edges
+    decoder, _, _ = run(transitions, total, LIVE)
+    assert decoder.longest == len(decoder.railcomEdges) == Recording.maxRailcomEdges
+    assert decoder.railcomEdges[-1] == (transitions[-1][0], 1)
+    assert decoder.railcomLevel == 1 - decoder.railcomEdges[0][1]  #level of the last dropped edge
+    decoder, _, _ = run(transitions, total, {})
+    assert decoder.longest == len(decoder.railcomEdges) == 1000
+
+def test_railcom_after_idle_data_line():
+    #the answers behind a long idle stretch are decoded as without live mode
+    packets = [IDLE, [3, 0x3f, 0x10], [3, 0x3f, 0x10]]
+    answer  = ((0x8e, 0xa5), (0x99,))
+    noise, start = railcom_noise(500)
+    signal, total = synth.synthesize(packets, SAMPLERATE, cutout=True, railcom=[None, answer, answer])
+    transitions = noise + [(start + 1000 + samplenum, bits) for samplenum, bits in signal]
+    decoder, live, _ = run(transitions, start + 1000 + total, LIVE)
+    _, expected, _ = run(transitions, start + 1000 + total, {})
+    assert decoder.longest == Recording.maxRailcomEdges
+    assert len(live.records_of('RAILCOM')) == 4
+    assert live.records == expected.records
+
+def test_packet_ring_and_latency():
+    packets = [[3, 0x3f, n] for n in range(12)]
+    transitions, total = synth.synthesize(packets, SAMPLERATE)
+    decoder, output, meta = run(transitions, total, LIVE)
+    records = [(start, bytes(data[1]['bytes'])) for start, _, data in output.python if data[0] == 'PACKET']
+    assert len(records) == 12
+    #(start, end of the packet end bit, bytes) of the last packets
+    recent = list(decoder.recentPackets)
+    assert [(start, data) for start, _, data in recent] == records[-Recording.recentPacketCount:]
+    #one latency per packet, relative to the fastest packet
+    assert [start for start, _, _ in meta] == [start for start, _ in records]
+    assert [(start, end) for start, end, _ in meta[-Recording.recentPacketCount:]] == [(start, end) for start, end, _ in recent]
+    assert min(latency for _, _, latency in meta) == 0.0
+    assert all(isinstance(latency, float) and latency >= 0.0 for _, _, latency in meta)
+    assert decoder.latencyMax == max(latency for _, _, latency in meta)
+    _, _, meta = run(transitions, total, {})
+    assert meta == []
+
+def test_packet_too_long():
+    packets = [IDLE, [3] + [0x55] * (Decoder.maxPacketBytes + 4), [3, 0x3f, 0x10]]
+    transitions, total = synth.synthesize(packets, SAMPLERATE)
+    _, output, meta = run(transitions, total, LIVE)
+    assert [p for p, ok in output.packets()] == [bytes(p + [synth.checksum(p)]) for p in (packets[0], packets[2])]
+    assert len(meta) == 2
+    assert ['Packet too long (> %d bytes), dropped' % Decoder.maxPacketBytes, 'Too long'] in output.texts(Ann.ERROR)
+    _, output, _ = run(transitions, total, {})
+    assert len(output.packets()) == 3
@@ -0,0 +1,55 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import struct
+
+from dcc import standalone
+
+from conftest import IDLE
+
+def binary_records(decode_packets, packets):
+    records = []
+    def sink(start, end, outputType, data):
+        if outputType == standalone.OUTPUT_BINARY:
+            records.append((start, end, data))
+    output = decode_packets(packets, forward=sink)
+    return output, records
+
+def parse(data):
+    start, end, size = struct.unpack_from('<QQB', data)
+    pos = struct.calcsize('<QQB')
+    if size == 255:
+        size = struct.unpack_from('<I', data, pos)[0]
+        pos += 4
+    assert len(data) == pos + size
+    return start, end, data[pos:]
+
+def test_binary_records(decode_packets):
+    output, records = binary_records(decode_packets, [IDLE, [3, 0x3f, 0x85], [0, 0]])
+    assert [cls for _, _, (cls, _) in records] == [0]*3
+    assert [parse(data) for _, _, (_, data) in records] == \
+           [(s, e, bytes(p['bytes'])) for s, e, (kind, p) in output.python if kind == 'PACKET']
+
+def test_binary_record_of_long_packet(decode_packets):
+    output, records = binary_records(decode_packets, [IDLE, [3] + [0x55]*300, IDLE])
+    assert [len(parse(data)[2]) for _, _, (_, data) in records] == [3, 302, 3]
+    assert records[1][2][1][16] == 255
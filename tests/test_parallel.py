@@ -0,0 +1,102 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+import dcc.__main__
+import dcc.srfile
+from dcc import parallel, synth
+from dcc.__main__ import decode_capture
+from dcc.parallel import decode_parallel, find_seams, preambles, segment_count
+from dcc.srfile import SrFile
+
+from conftest import SAMPLERATE
+
+@pytest.fixture(scope='module')
+def capture(tmp_path_factory):
+    #session file with stretched zeros and 20 µs glitches (1 sample)
+    path = str(tmp_path_factory.mktemp('parallel') / 'traffic.sr')
+    transitions, total = synth.synthesize(synth.traffic(600, seed=2), SAMPLERATE, stretch=0.01,
+                                          glitches=0.002, glitch_us=20, seed=3)
+    synth.write_session(path, transitions, total, SAMPLERATE)
+    return path
+
+@pytest.mark.parametrize('minWidth', [0, 2])
+@pytest.mark.parametrize('chunk', [500, 4096])
+def test_seams_in_chunks(capture, minWidth, chunk):
+    #the seams do not depend on the number of edges classified per pass
+    with SrFile(capture) as f:
+        seams = find_seams(f, 1, 8, minWidth=minWidth)
+        assert find_seams(f, 1, 8, minWidth=minWidth, chunk=chunk) == seams
+    assert len(seams) == 7
+    assert all(start < seam for start, _, seam, _, _ in seams)
+    assert [s[2] for s in seams] == sorted(s[2] for s in seams)
+    removed = [s[4] for s in seams]
+    assert removed == sorted(removed)
+    assert (removed[-1] > 0) == (minWidth > 0)
+
+@pytest.mark.parametrize('options', [{}, {'Min_pulse_width': '2'}])
+def test_same_as_sequential(capture, options):
+    sequential = []
+    decode_capture(capture, options, {}, lambda *record: sequential.append(record))
+    assert list(decode_parallel(capture, options, (1,), 3, minSegment=0)) == sequential
+
+@pytest.mark.parametrize('numpy', [True, False])
+@pytest.mark.parametrize('start', [0, 12345])
+def test_iter_edges(capture, monkeypatch, numpy, start):
+    #the edges of iter_transitions() as lists or arrays
+    if not numpy:
+        monkeypatch.setattr(dcc.srfile, 'np', None)
+    with SrFile(capture) as f:
+        transitions = list(f.iter_transitions(1, start))
+        batches     = list(f.iter_edges(1, start))
+    assert batches[0][0] == transitions[0][1]
+    assert [int(e) for _, edges in batches for e in edges] == [samplenum for samplenum, _ in transitions[1:]]
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_preambles(monkeypatch, numpy):
+    value = [1]*12 + [0, 1, 1, 0] + [-1, 0] + [1]*10 + [0] + [1]*3
+    phase = [False]*16 + [True] + [False]*15
+    if not numpy:
+        monkeypatch.setattr(parallel, 'np', None)
+    #start bits after 12 and 10 '1' bits, the second one after the phase change
+    assert preambles(value, phase) == ([12, 28], [0, 18], [False, True], 3, 29, True)
+    #the first run began in the previous walk
+    assert preambles(value[4:], phase[4:], ones=2) == ([8, 24], [-2, 14], [False, True], 3, 25, True)
+    assert preambles([1, 1], [False, False], ones=9, phased=True) == ([], [], [], 11, -1, True)
+    assert preambles([], [], ones=4) == ([], [], [], 4, -1, False)
+
+def test_segment_count(capture):
+    with SrFile(capture) as f:
+        seconds = f.total / f.samplerate
+        assert segment_count(f, 4) == int(seconds / parallel.MIN_SEGMENT) < 2
+        assert segment_count(f, 4, 1.0) == int(seconds)
+        assert segment_count(f, 4, 0) == 4 * parallel.SEGMENTS_PER_JOB
+
+def test_short_capture_sequential(capture, monkeypatch):
+    #too short for two segments: -j decodes sequentially
+    sequential = []
+    decode_capture(capture, {}, {}, lambda *record: sequential.append(record))
+    monkeypatch.setattr(dcc.__main__, 'decode_parallel', None)
+    records = []
+    decode_capture(capture, {}, {}, lambda *record: records.append(record), 4)
+    assert records == sequential
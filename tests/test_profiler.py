@@ -0,0 +1,90 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import json
+import tracemalloc
+from time import sleep
+
+from dcc import synth
+from dcc.pd import Ann
+from dcc.profiler import Profiler
+
+PACKETS = synth.traffic(50)
+
+def test_exclusive_time():
+    #the time of a stage does not include the stages it calls
+    profiler = Profiler()
+    inner    = profiler.wrap('inner', lambda: sleep(0.01))
+    outer    = profiler.wrap('outer', lambda: (inner(), inner()))
+    outer()
+    profiler.finish()
+    report = profiler.report()
+    assert report['stages']['outer']['calls'] == 1
+    assert report['stages']['inner']['calls'] == 2
+    assert report['stages']['inner']['time'] >= 0.02
+    assert report['stages']['outer']['time'] < 0.01
+    assert list(report['stages']) == ['inner', 'outer']  #most time first
+    assert report['other_time'] >= 0.0
+
+def test_stage_key():
+    profiler = Profiler()
+    put      = profiler.wrap('put', lambda kind: None, lambda kind: 'put ' + kind)
+    for kind in ('ann', 'python', 'ann'):
+        put(kind)
+    assert {name: s['calls'] for name, s in profiler.report()['stages'].items()} == {'put ann': 2, 'put python': 1}
+
+def without_profile(output):
+    return ([a for a in output.annotations if not (a[2] == Ann.FRAME_OTHER and a[3][-1].startswith('Profile: '))],
+            [r for r in output.python if r[2][0] != 'PROFILE'])
+
+def test_decode(decode_packets):
+    plain   = decode_packets(PACKETS)
+    output  = decode_packets(PACKETS, {'Profile': 'yes'})
+    reports = output.records_of('PROFILE')
+    assert len(reports) == 1
+    stages = reports[0]['stages']
+    assert stages['handleDecodedBytes']['calls'] == len(PACKETS)
+    assert stages['put python']['calls'] == len(output.records_of('PACKET'))
+    assert 'peak_bytes' not in reports[0]
+    assert without_profile(output) == without_profile(plain)
+
+def test_environment(decode_packets, monkeypatch, tmp_path):
+    #DCC_PROFILE=memory without the option, JSON file from DCC_PROFILE_FILE
+    path = tmp_path / 'profile.json'
+    monkeypatch.setenv('DCC_PROFILE', 'memory')
+    monkeypatch.setenv('DCC_PROFILE_FILE', str(path))
+    report = decode_packets(PACKETS[:5]).records_of('PROFILE')[0]
+    assert report['peak_bytes'] > 0
+    assert all('peak_bytes' in stage for stage in report['stages'].values())
+    assert json.loads(path.read_text())['stages'].keys() == report['stages'].keys()
+
+def test_tracing_of_the_caller(decode_packets):
+    #memory profiling stops tracemalloc only if it started it
+    Profiler(memory=True).finish()
+    assert not tracemalloc.is_tracing()
+    tracemalloc.start()
+    try:
+        report = decode_packets(PACKETS[:5], {'Profile': 'memory'}).records_of('PROFILE')[0]
+        assert report['peak_bytes'] > 0
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
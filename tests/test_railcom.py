@@ -0,0 +1,82 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import railcom as rc
+from dcc import synth
+from dcc.pd import Ann
+
+from conftest import IDLE
+
+E          = rc.ENCODE
+SAMPLERATE = 1000000  #RailCom needs >= 1 MHz
+
+def symbols(ident, data, bits):
+    #4-of-8 coded bytes of a datagram with bits incl. the 4 bit ID
+    value = (ident << (bits - 4)) | data
+    return tuple(E[(value >> shift) & 0x3f] for shift in range(bits - 6, -1, -6))
+
+def test_code_table():
+    assert len(set(E)) == 64
+    for value, code in enumerate(E):
+        assert bin(code).count('1') == 4
+        assert rc.DECODE[code] == value
+    assert rc.DECODE[0x0f] == rc.DECODE[0xf0] == rc.ACK
+    assert sum(symbol is not None for symbol in rc.DECODE) == 64 + 4
+
+def test_datagrams():
+    decoded = [rc.DECODE[byte] for byte in symbols(2, 3, 12) + symbols(0, 42, 12) + (0x0f,)]
+    assert rc.datagrams(decoded) == [('ADR_LOW', 2, 3), ('POM', 0, 42), ('ACK', None, None)]
+    decoded = [rc.DECODE[byte] for byte in symbols(8, 0x01020304, 36)[:-1]]
+    assert rc.datagrams(decoded) == [('XPOM', 8, None)]
+    assert rc.datagrams([rc.DECODE[0xff], rc.BUSY]) == [('invalid', None, None), ('BUSY', None, None)]
+
+@pytest.fixture
+def decode_railcom(decode):
+    def run(packets, answers, samplerate=SAMPLERATE):
+        transitions, total = synth.synthesize(packets, samplerate, cutout=True, railcom=answers)
+        return decode(transitions, total, masks=(1, 2), samplerate=samplerate)
+    return run
+
+def test_decode(decode_railcom):
+    packets = [IDLE, [3, 0x3f, 0x10], [3, 0xe4, 0, 0x1c, 0], IDLE]
+    answers = [None,
+               (symbols(2, 3, 12), ()),
+               (symbols(2, 3, 12), symbols(0, 42, 12)),
+               ((0x0f, 0xff), (0xf0,))]
+    output = decode_railcom(packets, answers)
+    assert [(r['channel'], r['addr_type'], r['address'], r['datagrams']) for r in output.records_of('RAILCOM')] == [
+        (1, 'short', 3, [('ADR_LOW', 2, 3)]),
+        (1, 'short', 3, [('ADR_LOW', 2, 3)]),
+        (2, 'short', 3, [('POM', 0, 42)]),
+        (1, 'idle', None, [('ACK', None, None), ('invalid', None, None)]),
+        (2, 'idle', None, [('ACK', None, None)])]
+    assert output.texts(Ann.RAILCOM_CH2)[0] == ['Channel 2 (short 3): POM 42', 'Ch2: POM 42']
+    assert [texts[0] for texts in output.texts(Ann.RAILCOM_BYTE)][-3:] == ['0x0f: ACK', '0xff: invalid 4/8 code', '0xf0: ACK']
+    assert ['RailCom: invalid 4/8 code', 'Invalid'] in output.texts(Ann.ERROR)
+    assert output.packets() == [(bytes(p + [synth.checksum(p)]), True) for p in packets]
+
+def test_samplerate_too_low(decode_railcom):
+    output = decode_railcom([IDLE, [3, 0x3f, 0x10]], [None, (symbols(2, 3, 12), ())], samplerate=500000)
+    assert output.records_of('RAILCOM') == []
+    assert any(texts[0].startswith('RailCom channel ignored') for texts in output.texts(Ann.ERROR))
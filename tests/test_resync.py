@@ -0,0 +1,60 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import synth
+
+SAMPLERATE = 1000000  #glitches of 2 µs
+SENT       = synth.traffic(400, seed=5)
+
+@pytest.fixture
+def resync(decode):
+    def run(mode, **kwargs):
+        transitions, total = synth.synthesize(SENT, SAMPLERATE, **kwargs)
+        return decode(transitions, total, {'Resync': mode}, samplerate=SAMPLERATE)
+    return run
+
+def is_subsequence(packets):
+    sent = iter(bytes(p + [synth.checksum(p)]) for p in SENT)
+    return all(packet in sent for packet in packets)
+
+@pytest.mark.parametrize('glitches', [0.002, 0.01])
+def test_no_false_packets(resync, glitches):
+    #the repaired packets are packets that were sent, in their order, and more than without lookahead
+    waiting   = resync('preamble', glitches=glitches, glitch_us=2, seed=1)
+    lookahead = resync('lookahead', glitches=glitches, glitch_us=2, seed=1)
+    packets   = lookahead.packets()
+    assert all(ok for _, ok in packets)
+    assert is_subsequence(raw for raw, _ in packets)
+    counts = lookahead.records_of('RESYNC')[0][0]
+    assert counts['recovered'] > 0
+    assert counts['repairs'] >= counts['recovered']
+    assert 0 < len(packets) - len(waiting.packets()) <= counts['recovered']
+
+def test_clean_signal(resync):
+    #without disturbances the lookahead changes nothing
+    waiting   = resync('preamble')
+    lookahead = resync('lookahead')
+    assert lookahead.packets() == waiting.packets()
+    assert len(lookahead.packets()) == len(SENT)
+    assert lookahead.records_of('RESYNC') == [{0: {'repairs': 0, 'recovered': 0}}]
@@ -0,0 +1,58 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import time
+
+import pytest
+
+from dcc import Decoder
+from dcc.pd import Ann
+
+from conftest import IDLE
+
+@pytest.mark.parametrize('text, inside, outside', [
+    ('3,17,100-120', (3, 17, 100, 110, 120), (0, 4, 99, 121)),
+    ('100-120,110-130,131', (100, 125, 130, 131), (99, 132)),       #overlapping and adjacent ranges
+    ('-5,3-,7-9-11,abc,,20', (20,), (3, 5, 7, 9, 11)),               #malformed parts are ignored
+    ('0-5,10239-20000', (1, 5, 10239), (0, 6, 10240)),               #clipped to 1..10239
+])
+def test_values(text, inside, outside):
+    values = Decoder().searchValues(text, 1, 10239)
+    assert all(v in values for v in inside)
+    assert not any(v in values for v in outside)
+
+def test_empty():
+    assert not Decoder().searchValues('', 1, 10239)
+    assert not Decoder().searchValues('-5,20000', 1, 10239)
+
+def test_large_range():
+    #a range of all CVs is stored as one interval
+    start  = time.perf_counter()
+    values = Decoder().searchValues('1-16777216', 1, 16777216)
+    assert time.perf_counter() - start < 0.1
+    assert 1 in values and 16777216 in values and 0 not in values and 16777217 not in values
+
+def test_decode(decode_packets):
+    packets = [IDLE, [3, 0x3f, 0x10], [105, 0x3f, 0x10], [7, 0x3f, 0x10], [0xc3, 0xe8, 0x3f, 0x10]]
+    output  = decode_packets(packets, {'Search_dec_addr': '3,100-1000', 'Search_byte': '0x3f'})
+    assert [texts[0] for texts in output.texts(Ann.SEARCH_DEC)] == ['DECODER:3', 'DECODER:105', 'DECODER:1000']
+    assert len(output.texts(Ann.SEARCH_BYTE)) == 3
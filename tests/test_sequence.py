@@ -0,0 +1,72 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+from conftest import IDLE
+
+RESET = [0, 0]
+
+def service_write(cv, value):
+    return [0x7c | ((cv-1) >> 8), (cv-1) & 0xff, value]
+
+def service_verify(cv, value):
+    return [0x74 | ((cv-1) >> 8), (cv-1) & 0xff, value]
+
+def service_bit(cv, position, value):
+    return [0x78 | ((cv-1) >> 8), (cv-1) & 0xff, 0xe0 | (value << 3) | position]
+
+def operations(decode_packets, packets, options=None):
+    options = dict(options or {}, Sequences='yes')
+    return decode_packets(packets, options).records_of('OPERATION')
+
+def test_service_write_verified(decode_packets):
+    packets = [RESET]*3 + [service_write(29, 6)]*5 + [RESET]*6 + [service_verify(29, 6)]*5 + [RESET]*6
+    ops = operations(decode_packets, packets, {'Mode_112_127': 'service mode'})
+    assert len(ops) == 1
+    op = ops[0]
+    assert (op['mode'], op['operation'], op['cv'], op['value']) == ('service', 'write', 29, 6)
+    assert op['verified'] == True
+    assert (op['packets'], op['verify_packets'], op['resets']) == (5, 5, 3)
+
+def test_service_read_bit_by_bit(decode_packets):
+    packets = [RESET]*3
+    for position in range(8):
+        packets += [service_bit(1, position, (3 >> position) & 1)]*5 + [RESET]*3
+    packets += [service_verify(1, 3)]*5 + [RESET]*3
+    ops = operations(decode_packets, packets, {'Mode_112_127': 'service mode'})
+    assert [(op['operation'], op['cv'], op['value'], op['verified']) for op in ops] == [('read', 1, 3, True)]
+
+def test_pom_bit_write(decode_packets):
+    ops = operations(decode_packets, [[3, 0xe8, 28, 0xf9]]*2 + [IDLE]*3)
+    assert [(op['mode'], op['operation'], op['address'], op['cv'], op['value']) for op in ops] == \
+           [('pom', 'bit_write', 3, 29, 0xf9)]
+
+def test_xpom_bit_reserved_form(decode_packets):
+    #XPOM bit write whose data byte is not 1111DBBB: the decoder leaves the value None
+    packets = [[3, 0xe8, 0, 0, 0x1c, 0x05]]*3 + [IDLE]*40
+    output  = decode_packets(packets, {'Sequences': 'yes'})
+    ops     = output.records_of('OPERATION')
+    assert [(op['operation'], op['cv'], op['value'], op['packets']) for op in ops] == [('bit_unknown', 29, None, 3)]
+    assert any(texts[-1] == 'CV29 bit instruction ?' for _, _, _, texts in output.annotations)
+
+def test_xpom_bit_write(decode_packets):
+    ops = operations(decode_packets, [[3, 0xe8, 0, 0, 0x1c, 0xf9]]*3 + [IDLE]*3)
+    assert [(op['operation'], op['cv'], op['value']) for op in ops] == [('bit_write', 29, 0xf9)]
@@ -0,0 +1,116 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import Decoder, standalone, synth
+
+#channel 0: bit 0, channel 1: bit 1
+TRANSITIONS = [(0, 0b00), (10, 0b01), (20, 0b11), (30, 0b10), (40, 0b00), (50, 0b01), (60, 0b11)]
+
+class Waiter(standalone.Decoder):
+    #runs the waits of a script, records (samplenum, pins, matched)
+    def __init__(self, script):
+        self.script = script
+        self.log    = []
+
+    def metadata(self, key, value):
+        pass
+
+    def start(self):
+        pass
+
+    def decode(self):
+        for conds in self.script:
+            pins = self.wait(conds)
+            self.log.append((self.samplenum, pins, self.matched))
+
+def run(script, masks=(1, 2), total=70):
+    decoder = Waiter(script)
+    standalone.run(decoder, TRANSITIONS, 1000000, masks, total, lambda *args: None)
+    return decoder.log
+
+def test_edges():
+    assert run([{0: 'e'}, {0: 'e'}, {0: 'r'}]) == [(10, (1, 0), (True,)), (30, (0, 1), (True,)), (50, (1, 0), (True,))]
+
+def test_edges_of_two_channels():
+    conds = [{0: 'f'}, {1: 'e'}]
+    assert run([conds] * 4) == [(20, (1, 1), (False, True)), (30, (0, 1), (True, False)),
+                                (40, (0, 0), (False, True)), (60, (1, 1), (False, True))]
+
+def test_same_conds_object():
+    #a condition object is parsed once, another object is parsed again
+    cond = {0: 'e'}
+    assert run([cond, {1: 'r'}, cond, cond]) == [(10, (1, 0), (True,)), (20, (1, 1), (True,)),
+                                                 (30, (0, 1), (True,)), (50, (1, 0), (True,))]
+
+def test_levels_and_skip():
+    assert run([{1: 'h'}, {1: 'h'}, [{0: 'r'}, {'skip': 5}], {0: 'l', 1: 'h'}]) == [
+        (20, (1, 1), (True,)), (21, (1, 1), (True,)), (26, (1, 1), (False, True)), (30, (0, 1), (True,))]
+
+def test_end_of_capture():
+    assert run([{0: 'r'}] * 5) == [(10, (1, 0), (True,)), (50, (1, 0), (True,))]
+
+def test_unconnected_channel():
+    assert run([{0: 'e'}], masks=(1, None)) == [(10, (1, 0xff), (True,))]
+
+class Batcher(Waiter):
+    #collects the edge lists of channel 0
+    def decode(self):
+        for level, edges in self.edge_batches(0, 3):
+            self.log.append((level, edges, self.samplenum))
+
+def test_edge_batches():
+    decoder = Batcher(None)
+    standalone.run(decoder, TRANSITIONS, 1000000, (1, 2), 70, lambda *args: None)
+    assert decoder.log == [(0, [10, 30], 30), (0, [50], 50)]
+    with pytest.raises(EOFError):
+        decoder.wait({0: 'e'})
+
+class EdgeDecoder(Decoder):
+    #edges one by one from wait(), as under libsigrokdecode
+    edge_batches = None
+
+class SmallBatches(Decoder):
+    #bits and phase changes across the borders of the edge lists
+    def edge_batches(self, channel):
+        return standalone.Decoder.edge_batches(self, channel, 7)
+
+@pytest.mark.parametrize('options, texts', [
+    ({},                                              ('Edge-Detection changed', 'Railcom cutout', 'stretched zero?')),
+    ({'Bit_timing': 'yes', 'Statistics': 'yes'},      ('Edge-Detection changed', 'DC offset')),
+    ({'Annotation_level': 'packets'},                 ('Edge-Detection changed', 'stretched zero?')),
+    ({'Min_pulse_width': '25us', 'Statistics': 'yes'}, ('Short pulse removed', 'Pre-filter')),
+])
+def test_batches_match_edges(options, texts):
+    transitions, total = synth.synthesize(synth.traffic(60), 1000000, stretch=0.05, glitches=0.002, glitch_us=20, cutout=True)
+    outputs = []
+    for decoderClass in (Decoder, SmallBatches, EdgeDecoder):
+        records = []
+        standalone.run(decoderClass(), transitions, 1000000, (1,), total, lambda *args: records.append(args), options)
+        outputs.append(records)
+    assert outputs[0] == outputs[2]
+    assert outputs[1] == outputs[2]
+    annotated = ' '.join(args[3][1][0] for args in outputs[0] if args[2] == standalone.OUTPUT_ANN)
+    for text in texts:
+        assert text in annotated
+    assert sum(args[2] == standalone.OUTPUT_PYTHON and args[3][0] == 'PACKET' for args in outputs[0]) > 30
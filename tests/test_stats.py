@@ -0,0 +1,79 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import synth
+from dcc.__main__ import main
+from dcc.pd import Ann
+
+from conftest import IDLE, SAMPLERATE
+
+LOCO      = [3, 0x3f, 0x10]
+ACCESSORY = [0x83, 0x41, 0x01]
+
+@pytest.fixture
+def traffic(decode_packets):
+    #idle, three packets to loco 3, one each to loco 1000, an accessory (wrong checksum) and broadcast
+    def run(options=None):
+        packets = [IDLE] * 4 + [LOCO, ACCESSORY, LOCO, [0xc3, 0xe8, 0x3f, 0x20], LOCO, [0, 0x3f, 0]]
+        packets = [p + [synth.checksum(p)] for p in packets]
+        packets[5][-1] ^= 0x55
+        return decode_packets(packets, dict(options or {}, Statistics='yes'), addChecksum=False)
+    return run
+
+def test_report(traffic):
+    output = traffic()
+    reports = output.records_of('STATISTICS')
+    assert len(reports) == 1
+    report = reports[0]
+    assert (report['packets'], report['idle_packets'], report['checksum_errors'], report['resyncs']) == (10, 4, 1, 0)
+    assert report['idle_ratio'] == 0.4
+    assert report['checksum_error_rate'] == 0.1
+    assert report['broadcast_packets'] == 1
+    assert sorted(report['locos']) == [3, 1000]
+    assert report['locos'][1000] == {'packets': 1, 'refresh_mean': None, 'refresh_max': None}
+    accessory = [p['address'] for p in output.records_of('PACKET') if p['addr_type'] == 'extended accessory']
+    assert report['accessories'] == {accessory[0]: 1}
+
+def test_refresh(traffic):
+    output = traffic()
+    starts = [s for s, e, (kind, p) in output.python if kind == 'PACKET' and list(p['bytes'][:2]) == LOCO[:2]]
+    intervals = [(b - a) / SAMPLERATE for a, b in zip(starts, starts[1:])]
+    loco = output.records_of('STATISTICS')[0]['locos'][3]
+    assert loco['packets'] == 3
+    assert loco['refresh_mean'] == pytest.approx(sum(intervals) / len(intervals))
+    assert loco['refresh_max'] == pytest.approx(max(intervals))
+
+def test_interval(decode_packets):
+    #a summary every second (2.2 s of traffic) and one at the end, without gaps
+    output = decode_packets(synth.traffic(300), {'Statistics': 'yes', 'Statistics_interval': 1})
+    summaries = [(s, e) for s, e, cls, texts in output.annotations if cls == Ann.STATISTICS]
+    assert len(summaries) == 3
+    assert summaries[0][0] == 0
+    assert all(e - s >= SAMPLERATE for s, e in summaries[:-1])
+    assert all(a[1] == b[0] for a, b in zip(summaries, summaries[1:]))
+    assert output.texts(Ann.STATISTICS)[-1][1].startswith('300 packets')
+
+def test_no_parallel_decode():
+    with pytest.raises(SystemExit, match='Statistics=yes needs a decode in one process'):
+        main(['-j', '2', '-O', 'Statistics=yes', 'capture.sr'])
@@ -0,0 +1,116 @@
+##
+## This file is part of the libsigrokdecode project.
+##
+## Copyright (C) 2013-2020 Sven Bursch-Osewold
+##               2020      Roland Noell
+##
+## This program is free software; you can redistribute it and/or modify
+## it under the terms of the GNU General Public License as published by
+## the Free Software Foundation; either version 2 of the License, or
+## (at your option) any later version.
+##
+## This program is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU General Public License for more details.
+##
+## You should have received a copy of the GNU General Public License
+## along with this program; if not, write to the Free Software
+## Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301 USA
+##
+
+
+import pytest
+
+from dcc import synth, timing
+from dcc.equivalence import second_line
+
+from conftest import IDLE, SAMPLERATE
+
+PACKETS = [IDLE, [3, 0x3f, 0x10], [0xc3, 0xe8, 0xec, 0x00, 0x07]]
+FIELDS  = ('start', 'middle', 'end', 'value', 'stretched', 'cutout', 'unknown', 'phase')
+
+numpy_only = pytest.mark.skipif(timing.np is None, reason='needs NumPy')
+
+def edges(packets=PACKETS, samplerate=SAMPLERATE, **kwargs):
+    transitions, total = synth.synthesize(packets, samplerate, **kwargs)
+    return [samplenum for samplenum, _ in transitions[1:]]
+
+def as_lists(bits):
+    return {field: [int(v) for v in getattr(bits, field)] for field in FIELDS}
+
+def test_bits():
+    #the bits of the packets and the preamble synthesize() puts at the end, its last bit has no edge after it
+    bits     = timing.classify_edges(edges(), SAMPLERATE)
+    expected = [bit for packet in PACKETS for bit in synth.packet_bits(packet)] + [1] * 16
+    assert [int(v) for v in bits.value] == expected
+    assert not any(bits.unknown) and not any(bits.phase) and not any(bits.stretched)
+
+def test_flags():
+    bits = timing.classify_edges(edges(stretch=1.0, cutout=True), SAMPLERATE)
+    zeros = [i for i, v in enumerate(bits.value) if v == 0]
+    assert all(bits.stretched[i] for i in zeros)
+    assert sum(bool(c) for c in bits.cutout) == len(PACKETS)
+
+def test_phase_change():
+    #starting at a falling edge the walk is out of phase until the packet start bit: half '1' + half '0',
+    #then it skips one edge and continues in phase after the start bit (1 MHz: no rounding of the half bits)
+    e        = edges(samplerate=1000000)
+    aligned  = as_lists(timing.classify_edges(e, 1000000))
+    shifted  = as_lists(timing.classify_edges(e[1:], 1000000))
+    k        = shifted['phase'].index(1)
+    assert k == 16 and shifted['value'][:k] == [1] * k and shifted['value'][k] == timing.VALUE_UNKNOWN
+    assert {field: values[k+1:] for field, values in shifted.items()} == {field: values[18:] for field, values in aligned.items()}
+
+@numpy_only
+@pytest.mark.parametrize('kwargs', [{}, {'stretch': 0.3, 'cutout': True},
+                                    {'glitches': 0.05, 'glitch_us': 20, 'samplerate': 1000000},
+                                    {'glitches': 0.05, 'glitch_us': 40, 'stretch': 0.1}])
+@pytest.mark.parametrize('first_rising', [True, False])
+def test_numpy_python(kwargs, first_rising):
+    samplerate = kwargs.pop('samplerate', SAMPLERATE)
+    e       = edges(synth.traffic(200), samplerate, **kwargs)[0 if first_rising else 1:]
+    windows = timing.PROFILES['RCN-210 decoder'].windows(samplerate)
+    first   = 0 if first_rising else 1
+    assert as_lists(timing._classify_numpy(e, windows, first)) == as_lists(timing._classify_python(e, windows, first))
+
+@pytest.mark.parametrize('edges, expected', [
+    ([0, 10, 11, 20], ([0, 20], [(10, 11)])),                    #one short pulse
+    ([0, 10, 11, 12, 20], ([0, 12, 20], [(10, 11)])),            #odd run keeps its last edge
+    ([0, 10, 11, 12, 13, 30], ([0, 30], [(10, 11), (12, 13)])),  #even run: removed in pairs
+    ([0, 10, 20], ([0, 10, 20], [])),
+])
+def test_deglitch(edges, expected, monkeypatch):
+    result, pulses = timing.deglitch_edges(edges, 3, pulses=True)
+    assert (list(result), pulses) == expected
+    assert timing.deglitch_edges(edges, 3)[1] == len(expected[1])
+    monkeypatch.setattr(timing, 'np', None)
+    assert timing.deglitch_edges(edges, 3, pulses=True) == expected
+
+@numpy_only
+def test_deglitch_numpy_python():
+    e = edges(synth.traffic(200), 1000000, glitches=0.05, glitch_us=2)
+    result, removed = timing._deglitch_numpy(e, 4)
+    assert (list(result), removed) == timing._deglitch_python(e, 4)
+    assert removed
+
+def test_pre_filter(decode):
+    #with Min_pulse_width the decoder removes the glitches edge by edge: all packets, the count of deglitch_edges()
+    packets = synth.traffic(200)
+    transitions, total = synth.synthesize(packets, 1000000, glitches=0.05, glitch_us=2)
+    output = decode(transitions, total, {'Min_pulse_width': '4us'}, samplerate=1000000)
+    assert output.packets() == [(bytes(p + [synth.checksum(p)]), True) for p in packets]
+    _, removed = timing.deglitch_edges([samplenum for samplenum, _ in transitions[1:]], 4)
+    assert output.records_of('DEGLITCH') == [{'min_width': 4, 'removed': {0: removed}}]
+
+def test_pre_filter_two_lines(decode):
+    #both lines filtered edge by edge, each line keeps its own edge times (here both change at the same samples)
+    packets = synth.traffic(100)
+    transitions, total = synth.synthesize(packets, 1000000, glitches=0.05, glitch_us=2)
+    output = decode(second_line(transitions, 0), total, {'Min_pulse_width': '4us'}, masks=(1, None, 2), samplerate=1000000)
+    expected = [(bytes(p + [synth.checksum(p)]), True) for p in packets]
+    records  = output.records_of('PACKET')
+    assert [(bytes(r['bytes']), r['checksum']) for r in records if 'line' not in r] == expected
+    assert [(bytes(r['bytes']), r['checksum']) for r in records if r.get('line') == 1] == expected
+    _, removed = timing.deglitch_edges([samplenum for samplenum, _ in transitions[1:]], 4)
+    assert output.records_of('DEGLITCH') == [{'min_width': 4, 'removed': {0: removed, 1: removed}}]